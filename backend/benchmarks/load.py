@@ -0,0 +1,354 @@
+"""Mixed-traffic load test of ``server.app`` with per-route latency percentiles.
+
+Seeds a database (users, courses, modules and progress from
+generate_data.py), then drives the app in-process (httpx ASGI transport, no
+sockets) with a deterministic mix of anonymous homepage reads, logins,
+progress ticks, admin user searches and admin analytics. Reports throughput
+and p50/p95/p99 per route, optionally writes the results as JSON and
+compares them with a stored baseline (exit code 1 on a regression or on
+more error responses than the baseline had).
+
+Each metric is the median of --repeat runs, re-seeded every time. Seeded
+users get a cost-4 bcrypt hash by default so a few logins don't starve the
+rest of the mix on small machines; --bcrypt-rounds 12 measures real logins.
+
+    # in-memory storage engine (storage.py): measures app overhead only
+    python benchmarks/load.py --requests 1000 --concurrency 16
+
+    # real Mongo; the database is dropped and re-seeded, so it must be a
+    # dedicated one with "bench" in its name
+    python benchmarks/load.py --mongo-url mongodb://localhost:27017 --db-name butex_bench
+
+    python benchmarks/load.py --output results.json --baseline benchmarks/load-baseline.json
+    python benchmarks/load.py --save-baseline benchmarks/load-baseline.json
+
+Baselines are only comparable on the same machine and backend; runs with
+different settings are reported but not compared.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import platform
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "benchmark")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import httpx  # noqa: E402
+
+import generate_data  # noqa: E402
+import server  # noqa: E402
+
+PASSWORD = "benchmark-password"
+
+# (route label, weight); the label is what results and baselines are keyed by
+TRAFFIC_MIX = [
+    ("GET /api/home", 30),
+    ("GET /api/events", 8),
+    ("GET /api/courses/{course_id}/detail", 10),
+    ("GET /api/progress", 10),
+    ("POST /api/progress", 25),
+    ("POST /api/auth/login", 3),
+    ("GET /api/admin/users", 10),
+    ("GET /api/admin/analytics", 2),
+]
+
+
+def connect(args):
+    if args.mongo_url:
+        if "bench" not in args.db_name:
+            raise SystemExit("--db-name must contain 'bench'; it is dropped before seeding")
+        client = server.AsyncIOMotorClient(args.mongo_url, event_listeners=[server.MongoCommandMonitor()])
+    else:
+        client = server.MemoryClient()
+    server.client = client
+    server.db = client[args.db_name]
+    return client
+
+
+def seeded_id(rng: random.Random) -> str:
+    # generate_id() is uuid4 from os.urandom; seeded ids keep runs identical
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+async def insert_batches(collection, docs):
+    for start in range(0, len(docs), server.FIXTURE_BATCH_SIZE):
+        await collection.insert_many(docs[start:start + server.FIXTURE_BATCH_SIZE], ordered=False)
+
+
+async def seed(args, rng: random.Random) -> dict:
+    """Populate the database and return the ids the traffic generator needs."""
+    db = server.db
+    await server.client.drop_database(args.db_name)
+    await server.load_fixtures(server.DEFAULT_FIXTURES_DIR, remap_ids=True)
+    await db.system_setup.insert_one({"is_setup_complete": True, "created_at": server.progress_timestamp()})
+
+    generated = await generate_data.generate(
+        db, args.users, args.courses, args.seed, courses_per_user=args.courses_per_user,
+        password=PASSWORD, batch_size=server.FIXTURE_BATCH_SIZE, bcrypt_rounds=args.bcrypt_rounds
+    )
+
+    # Fixture ids are remapped at random, so address courses by position
+    modules_by_course = {}
+    async for course in db.courses.find({"archived": False}, {"_id": 0, "id": 1}).sort([("order_number", 1), ("title", 1)]):
+        modules_by_course[course["id"]] = []
+    async for module in db.modules.find({"archived": False}, {"_id": 0, "id": 1, "course_id": 1}).sort([("order_number", 1), ("title", 1)]):
+        if module["course_id"] in modules_by_course:
+            modules_by_course[module["course_id"]].append(module["id"])
+    course_ids = [course_id for course_id, module_ids in modules_by_course.items() if module_ids]
+    admin = await db.users.find_one({"role": "admin", "archived": False}, {"_id": 0, "id": 1}, sort=[("id", 1)])
+    students = await db.users.find(
+        {"role": "student", "status": "approved", "archived": False}, {"_id": 0, "id": 1, "email": 1}
+    ).sort("id", 1).to_list(None)
+
+    events = [{
+        "id": seeded_id(rng), "name": f"Workshop {i}", "date": f"2026-{1 + i % 12:02d}-{1 + i % 28:02d}",
+        "photo_url": None, "video_link": None, "note_link": None, "details": "Details " * 200,
+        "archived": False, "created_at": server.progress_timestamp()
+    } for i in range(args.content)]
+    announcements = [{
+        "id": seeded_id(rng), "title": f"Announcement {i}", "content": "Content " * 200, "image_url": None,
+        "date": None, "archived": False, "created_at": server.progress_timestamp()
+    } for i in range(args.content)]
+    alumni = [{
+        "id": seeded_id(rng), "name": f"Alumnus {i}", "designation": "Former Member", "batch": str(30 + i % 10),
+        "current_occupation": "Merchandiser", "photo_url": None, "order_number": i, "archived": False,
+        "created_at": server.progress_timestamp()
+    } for i in range(args.content)]
+    await insert_batches(db.events, events)
+    await insert_batches(db.announcements, announcements)
+    await insert_batches(db.alumni, alumni)
+
+    # Same indexes and unique constraints as a server after startup, on both backends
+    await server.startup_indexes()
+    server.response_cache.clear()
+    server.user_cache.clear()
+
+    return {
+        "admin_token": server.create_access_token({"sub": admin["id"]}),
+        "student_tokens": [server.create_access_token({"sub": u["id"]}) for u in students],
+        "student_emails": [u["email"] for u in students],
+        "course_ids": course_ids,
+        "module_ids": [m for course_id in course_ids for m in modules_by_course[course_id]],
+        "counts": {**generated, "content": args.content * 3},
+    }
+
+
+def build_request(label: str, rng: random.Random, data: dict) -> dict:
+    student = {"Authorization": f"Bearer {rng.choice(data['student_tokens'])}"}
+    admin = {"Authorization": f"Bearer {data['admin_token']}"}
+    if label == "GET /api/home":
+        return {"method": "GET", "url": "/api/home"}
+    if label == "GET /api/events":
+        return {"method": "GET", "url": "/api/events", "params": {"view": "summary", "limit": 20}}
+    if label == "GET /api/courses/{course_id}/detail":
+        return {"method": "GET", "url": f"/api/courses/{rng.choice(data['course_ids'])}/detail", "headers": student}
+    if label == "GET /api/progress":
+        return {"method": "GET", "url": "/api/progress", "headers": student}
+    if label == "POST /api/progress":
+        body = {"module_id": rng.choice(data["module_ids"]), "completed": rng.random() < 0.7}
+        return {"method": "POST", "url": "/api/progress", "headers": student, "json": body}
+    if label == "POST /api/auth/login":
+        body = {"email": rng.choice(data["student_emails"]), "password": PASSWORD}
+        return {"method": "POST", "url": "/api/auth/login", "json": body}
+    if label == "GET /api/admin/users":
+        params = {"limit": 50, "search": rng.choice(generate_data.FIRST_NAMES)[:3], "sort_by": "last_login", "sort_order": "desc"}
+        return {"method": "GET", "url": "/api/admin/users", "headers": admin, "params": params}
+    if label == "GET /api/admin/analytics":
+        return {"method": "GET", "url": "/api/admin/analytics", "headers": admin}
+    raise ValueError(label)
+
+
+def schedule(count: int, rng: random.Random) -> list:
+    labels, weights = zip(*TRAFFIC_MIX)
+    return rng.choices(labels, weights=weights, k=count)
+
+
+async def drive(http: httpx.AsyncClient, plan: list, data: dict, seed: int, concurrency: int, samples: dict):
+    """Run ``plan`` with ``concurrency`` workers; each request's parameters
+    come from an RNG seeded by its position so reruns send the same traffic."""
+    position = 0
+
+    async def worker():
+        nonlocal position
+        while position < len(plan):
+            index = position
+            position += 1
+            label = plan[index]
+            request = build_request(label, random.Random(seed * 1_000_003 + index), data)
+            start = time.perf_counter()
+            response = await http.request(**request)
+            elapsed = (time.perf_counter() - start) * 1000
+            entry = samples.setdefault(label, {"latencies": [], "errors": 0})
+            entry["latencies"].append(elapsed)
+            if response.status_code >= 400:
+                entry["errors"] += 1
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+def percentile(values: list, p: float) -> float:
+    # Nearest-rank on the sorted sample
+    return values[max(0, min(len(values) - 1, math.ceil(p / 100 * len(values)) - 1))]
+
+
+def summarize(samples: dict, elapsed: float) -> dict:
+    routes = {}
+    for label, entry in sorted(samples.items()):
+        values = sorted(entry["latencies"])
+        routes[label] = {
+            "count": len(values),
+            "errors": entry["errors"],
+            "throughput_rps": round(len(values) / elapsed, 2),
+            "mean_ms": round(sum(values) / len(values), 3),
+            "p50_ms": round(percentile(values, 50), 3),
+            "p95_ms": round(percentile(values, 95), 3),
+            "p99_ms": round(percentile(values, 99), 3),
+            "max_ms": round(values[-1], 3),
+        }
+    total = sum(route["count"] for route in routes.values())
+    return {"requests": total, "elapsed_s": round(elapsed, 3), "throughput_rps": round(total / elapsed, 2), "routes": routes}
+
+
+def median_of(runs: list) -> dict:
+    """Per-metric median over repeated runs; error counts keep the worst run."""
+    def middle(values):
+        values = sorted(values)
+        return values[len(values) // 2]
+
+    routes = {}
+    for label in runs[0]["routes"]:
+        entries = [run["routes"][label] for run in runs if label in run["routes"]]
+        routes[label] = {key: (max if key == "errors" else middle)(entry[key] for entry in entries) for key in entries[0]}
+    merged = {key: middle(run[key] for run in runs) for key in ("requests", "elapsed_s", "throughput_rps")}
+    merged["routes"] = routes
+    return merged
+
+
+def compare(results: dict, baseline: dict, tolerance: float, floor_ms: float) -> list:
+    """Routes with more errors than the baseline or whose p95 grew, or total
+    throughput that fell, by more than ``tolerance`` (and, for latency, by
+    more than ``floor_ms``)."""
+    regressions = []
+    for label, route in results["routes"].items():
+        before = baseline["routes"].get(label)
+        if before is None:
+            if route["errors"]:
+                regressions.append(f"{label}: {route['errors']} errors (new route)")
+            continue
+        if route["errors"] > before["errors"]:
+            regressions.append(f"{label}: errors {before['errors']} -> {route['errors']} of {route['count']}")
+        limit = before["p95_ms"] * (1 + tolerance)
+        if route["p95_ms"] > limit and route["p95_ms"] - before["p95_ms"] > floor_ms:
+            regressions.append(f"{label}: p95 {before['p95_ms']:.1f} -> {route['p95_ms']:.1f} ms")
+    if results["throughput_rps"] < baseline["throughput_rps"] * (1 - tolerance):
+        regressions.append(f"throughput {baseline['throughput_rps']:.1f} -> {results['throughput_rps']:.1f} req/s")
+    return regressions
+
+
+def print_report(results: dict):
+    print(f"{results['requests']} requests in {results['elapsed_s']:.2f}s, {results['throughput_rps']:.1f} req/s")
+    print(f"{'route':38} {'count':>6} {'err':>4} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for label, route in results["routes"].items():
+        print(f"{label:38} {route['count']:6d} {route['errors']:4d} {route['throughput_rps']:8.1f} "
+              f"{route['p50_ms']:8.2f} {route['p95_ms']:8.2f} {route['p99_ms']:8.2f}")
+
+
+async def run(args) -> dict:
+    client = connect(args)
+    try:
+        data = await seed(args, random.Random(args.seed))
+        plan = schedule(args.warmup + args.requests, random.Random(args.seed))
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as http:
+            await drive(http, plan[:args.warmup], data, args.seed, args.concurrency, {})
+            samples = {}
+            start = time.perf_counter()
+            await drive(http, plan[args.warmup:], data, args.seed + 1, args.concurrency, samples)
+            elapsed = time.perf_counter() - start
+        if args.mongo_url:
+            await client.drop_database(args.db_name)
+    finally:
+        client.close()
+
+    results = summarize(samples, elapsed)
+    results["meta"] = {
+        "backend": "mongodb" if args.mongo_url else "memory",
+        "seed": args.seed,
+        "requests": args.requests,
+        "warmup": args.warmup,
+        "concurrency": args.concurrency,
+        "repeat": args.repeat,
+        "bcrypt_rounds": args.bcrypt_rounds,
+        "seeded": data["counts"],
+        "fast_responses": server.FAST_RESPONSES,
+        "python": platform.python_version(),
+        "machine": platform.node(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+    }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongo-url", default=None, help="run against this server instead of the in-process stand-in")
+    parser.add_argument("--db-name", default="butex_bench")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--courses", type=int, default=8)
+    parser.add_argument("--courses-per-user", type=float, default=2)
+    parser.add_argument("--content", type=int, default=100, help="events, announcements and alumni each")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3, help="runs to take the per-route median of")
+    parser.add_argument("--bcrypt-rounds", type=int, default=4,
+                        help="cost of the seeded password hashes; 12 measures production logins")
+    parser.add_argument("--output", type=Path, help="write results as JSON")
+    parser.add_argument("--baseline", type=Path, help="compare with results saved by --save-baseline")
+    parser.add_argument("--save-baseline", type=Path, metavar="PATH")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative p95/throughput change")
+    parser.add_argument("--floor-ms", type=float, default=2.0, help="ignore p95 increases smaller than this")
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    async def repeated():
+        # One event loop for every run: the server's pools and gates bind to it
+        return [await run(args) for _ in range(args.repeat)]
+
+    runs = asyncio.run(repeated())
+    results = median_of(runs)
+    results["meta"] = runs[-1]["meta"]
+    print_report(results)
+    for path in (args.output, args.save_baseline):
+        if path:
+            path.write_text(json.dumps(results, indent=2) + "\n")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        keys = ("machine", "backend", "seed", "requests", "concurrency", "repeat", "bcrypt_rounds", "seeded",
+                "fast_responses")
+        differing = [key for key in keys if baseline["meta"].get(key) != results["meta"].get(key)]
+        if differing:
+            print(f"\nBaseline {args.baseline} was recorded with different {', '.join(differing)}; not comparing")
+            return
+        regressions = compare(results, baseline, args.tolerance, args.floor_ms)
+        if regressions:
+            print(f"\nRegressions against {args.baseline}:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"\nNo regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
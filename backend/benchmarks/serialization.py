@@ -0,0 +1,127 @@
+"""Per-request CPU cost of the default and FAST_RESPONSES serialization paths.
+
+Runs the exact steps a request goes through after its Mongo read, without
+a database:
+
+* default: ``Model(**doc)`` per document, FastAPI's response_model
+  validation/serialization, then ``JSONResponse`` rendering; cached public
+  bodies use ``jsonable_encoder`` + ``json.dumps``.
+* fast: trusted projected documents, FastAPI's single response_model pass,
+  then ``ORJSONResponse``; cached public bodies go straight to ``orjson``.
+
+    python benchmarks/serialization.py --rows 1000 --repeat 50
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "benchmark")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.responses import JSONResponse, ORJSONResponse  # noqa: E402
+from fastapi.routing import APIRoute, serialize_response  # noqa: E402
+
+import server  # noqa: E402
+
+
+def user_docs(count):
+    return [
+        {
+            "id": f"user-{i:06d}",
+            "full_name": f"Student Number {i}",
+            "email": f"student{i}@butex.edu.bd",
+            "role": "student",
+            "status": "approved" if i % 3 else "pending",
+            "mentorship_access": i % 7 == 0,
+            "advanced_access": i % 5 == 0,
+            "batch": f"{40 + i % 10}",
+            "last_login": "2026-03-01T10:00:00.000000+00:00",
+            "created_at": "2025-09-01T10:00:00.000000+00:00",
+        }
+        for i in range(count)
+    ]
+
+
+def alumni_docs(count):
+    return [
+        {
+            "id": f"alumni-{i:06d}",
+            "name": f"Alumnus {i}",
+            "designation": "Former President",
+            "batch": f"{30 + i % 10}",
+            "current_occupation": "Merchandiser, Textile Group Ltd.",
+            "photo_url": f"/api/images/{i:064x}",
+            "order_number": i,
+            "archived": False,
+            "created_at": "2025-09-01T10:00:00.000000+00:00",
+        }
+        for i in range(count)
+    ]
+
+
+def route_field(path):
+    for route in server.app.routes:
+        if isinstance(route, APIRoute) and route.path == path and "GET" in route.methods:
+            return route.response_field
+    raise LookupError(path)
+
+
+def measure(func, repeat):
+    """CPU milliseconds per call (median of ``repeat`` runs)."""
+    samples = []
+    for _ in range(repeat):
+        start = time.process_time()
+        func()
+        samples.append((time.process_time() - start) * 1000)
+    return statistics.median(samples)
+
+
+def routed(field, model, response_class, fast, docs_factory):
+    def run():
+        server.FAST_RESPONSES = fast
+        docs = docs_factory()
+        content = asyncio.run(serialize_response(field=field, response_content=server.model_rows(docs, model)))
+        response_class(content).body
+    return run
+
+
+def cached(model, fast, docs_factory):
+    def run():
+        server.FAST_RESPONSES = fast
+        server.encode_json(server.model_rows(docs_factory(), model))
+    return run
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    users = user_docs(args.rows)
+    alumni = alumni_docs(args.rows)
+    cases = [
+        ("GET /api/admin/users", route_field("/api/admin/users"), server.UserResponse,
+         lambda: [dict(d) for d in users]),
+        ("GET /api/alumni (cache miss)", None, server.Alumni, lambda: [dict(d) for d in alumni]),
+    ]
+
+    print(f"{args.rows} rows, median CPU ms per request over {args.repeat} runs")
+    print(f"{'endpoint':32} {'default':>10} {'fast':>10} {'saving':>8}")
+    for name, field, model, docs_factory in cases:
+        if field is not None:
+            default = measure(routed(field, model, JSONResponse, False, docs_factory), args.repeat)
+            fast = measure(routed(field, model, ORJSONResponse, True, docs_factory), args.repeat)
+        else:
+            default = measure(cached(model, False, docs_factory), args.repeat)
+            fast = measure(cached(model, True, docs_factory), args.repeat)
+        print(f"{name:32} {default:10.2f} {fast:10.2f} {1 - fast / default:8.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+"""Generate a large synthetic dataset of users, courses, modules and progress.
+
+    python generate_data.py --users 100000 --courses 50 --courses-per-user 9 --seed 7 --drop
+    python generate_data.py --users 5000 --dry-run
+
+Documents match what the API writes (UserResponse, Course, Module and
+Progress plus the stored-only fields). Batches skew towards recent intakes
+with about a fifth of users pending approval. Course popularity is Zipf-like
+and each enrolment completes a prefix of the course's modules. A small share
+of every collection is archived. Output depends only on the seed and the
+size options; batches are written by --workers concurrent insert_many
+calls.
+
+--drop removes the users, courses, modules and progress collections first.
+Indexes are (re)built afterwards, which is faster than maintaining them
+during the load, and running servers are told to drop their caches. Uses
+MONGO_URL / DB_NAME from the environment or backend/.env, like server.py.
+"""
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from passlib.hash import bcrypt
+
+from server import RANK_STEP, cache_sync, client, db, ensure_indexes, progress_timestamp, response_cache, user_search_terms
+
+FIRST_NAMES = [
+    "Asraf", "Nusrat", "Tanvir", "Farhana", "Rakib", "Sadia", "Imran", "Mehjabin", "Arif", "Tasnim",
+    "Sabbir", "Anika", "Mahmud", "Raisa", "Fahim", "Lamia", "Shakil", "Nabila", "Towhid", "Sumaiya"
+]
+LAST_NAMES = [
+    "Hossain", "Rahman", "Islam", "Ahmed", "Chowdhury", "Akter", "Khan", "Uddin", "Sarker", "Begum",
+    "Karim", "Haque", "Mia", "Sultana", "Alam", "Das", "Saha", "Roy", "Talukder", "Bhuiyan"
+]
+EMAIL_DOMAINS = ["butex.edu.bd", "gmail.com", "yahoo.com", "outlook.com"]
+COURSE_TOPICS = [
+    "Parliamentary Debate", "Case Building", "Rebuttal", "Weighing", "Public Speaking", "Adjudication",
+    "Motion Analysis", "Extensions", "Speaker Roles", "Research Skills"
+]
+COURSE_TYPES = [("beginner", 5), ("advanced", 3), ("mentorship", 1)]
+BCRYPT_ALPHABET = "./ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
+
+NOW = datetime(2026, 6, 1, tzinfo=timezone.utc)
+FIRST_BATCH, LAST_BATCH = 35, 50
+
+
+def rng_for(seed: int, *parts) -> random.Random:
+    # One stream per document, so a document never depends on its neighbours
+    return random.Random(":".join(str(p) for p in (seed, *parts)))
+
+
+def seeded_id(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def shared_password_hash(password: str, seed: int, rounds: int = 12) -> str:
+    """bcrypt hash with a salt derived from the seed, shared by every user."""
+    rng = rng_for(seed, "salt")
+    salt = "".join(rng.choice(BCRYPT_ALPHABET) for _ in range(21)) + rng.choice(".Oeu")
+    return bcrypt.using(salt=salt, ident="2b", rounds=rounds).hash(password)
+
+
+def make_courses(seed: int, count: int, archived_ratio: float) -> list:
+    courses = []
+    types, weights = zip(*COURSE_TYPES)
+    for i in range(count):
+        rng = rng_for(seed, "course", i)
+        course_type = rng.choices(types, weights=weights)[0]
+        topic = COURSE_TOPICS[i % len(COURSE_TOPICS)]
+        courses.append({
+            "id": seeded_id(rng),
+            "title": f"{topic} {i // len(COURSE_TOPICS) + 1} ({course_type.title()})",
+            "description": f"{topic} for {course_type} debaters. " * rng.randint(3, 8),
+            "outline": ", ".join(rng.sample(COURSE_TOPICS, 4)),
+            "course_type": course_type,
+            "photo_url": None,
+            "archived": rng.random() < archived_ratio,
+            "order_number": (i + 1) * RANK_STEP,
+            "created_at": progress_timestamp(NOW - timedelta(days=rng.randint(30, 900))),
+        })
+    return courses
+
+
+def make_modules(seed: int, course: dict, index: int, min_modules: int, max_modules: int, archived_ratio: float) -> list:
+    rng = rng_for(seed, "modules", index)
+    modules = []
+    for j in range(rng.randint(min_modules, max_modules)):
+        modules.append({
+            "id": seeded_id(rng),
+            "course_id": course["id"],
+            "title": f"{course['title']}: Part {j + 1}",
+            "duration": f"{rng.choice([30, 45, 60, 90])} min",
+            "video_link": f"https://www.youtube.com/watch?v={seeded_id(rng)[:11]}",
+            "pdf_link": None if rng.random() < 0.6 else f"https://example.com/notes/{seeded_id(rng)}.pdf",
+            "order_number": (j + 1) * RANK_STEP,
+            "archived": rng.random() < archived_ratio,
+            "created_at": course["created_at"],
+        })
+    return modules
+
+
+def make_user(seed: int, index: int, hashed: str, archived_ratio: float) -> dict:
+    rng = rng_for(seed, "user", index)
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    full_name = f"{first} {last}"
+    email = f"{first}.{last}{index}@{rng.choice(EMAIL_DOMAINS)}".lower()
+    # Recent intakes are the largest; each batch joined about a year after the previous one
+    batch = round(rng.triangular(FIRST_BATCH, LAST_BATCH, LAST_BATCH - 2))
+    joined = NOW - timedelta(days=365 * (LAST_BATCH - batch) + rng.uniform(0, 365))
+    is_admin = index == 0 or rng.random() < 0.0005
+    approved = is_admin or rng.random() < 0.78
+    if approved:
+        last_login = max(joined, NOW - timedelta(days=rng.expovariate(1 / 21)))
+    else:
+        last_login = joined
+    return {
+        "id": seeded_id(rng),
+        "full_name": full_name,
+        "email": email,
+        "password_hash": hashed,
+        "role": "admin" if is_admin else "student",
+        "status": "approved" if approved else "pending",
+        "mentorship_access": is_admin or (approved and rng.random() < 0.15),
+        "advanced_access": is_admin or (approved and rng.random() < 0.3),
+        "batch": str(batch),
+        "reason": None if approved else "Want to join the debate club",
+        "search_terms": user_search_terms(full_name, email),
+        "last_login": progress_timestamp(last_login),
+        "archived": not is_admin and rng.random() < archived_ratio,
+        "created_at": progress_timestamp(joined),
+    }
+
+
+def make_progress(seed: int, index: int, user: dict, catalogue: list, weights: list,
+                  courses_per_user: float, completion: float) -> list:
+    """Rows for one approved student: a few popular-skewed courses, each
+    completed up to a drop-off point, sometimes with the next module started."""
+    rng = rng_for(seed, "progress", index)
+    wanted = min(len(catalogue), 1 + int(rng.expovariate(1 / max(courses_per_user - 1, 0.01))))
+    enrolled = set()
+    while len(enrolled) < wanted:
+        enrolled.add(rng.choices(range(len(catalogue)), weights=weights)[0])
+
+    rows = []
+    started = datetime.fromisoformat(user["created_at"])
+    for course_index in sorted(enrolled):
+        moment = started + timedelta(days=rng.uniform(0, 120))
+        for module_id in catalogue[course_index]:
+            moment += timedelta(hours=rng.uniform(2, 240))
+            done = rng.random() < completion
+            if done or rng.random() < 0.4:
+                rows.append({
+                    "id": seeded_id(rng),
+                    "user_id": user["id"],
+                    "module_id": module_id,
+                    "completed": done,
+                    "completed_at": progress_timestamp(min(moment, NOW)) if done else None,
+                    "updated_at": progress_timestamp(min(moment, NOW)),
+                })
+            if not done:
+                break
+    return rows
+
+
+async def generate(target_db, users: int, courses: int, seed: int, min_modules: int = 6, max_modules: int = 18,
+                   courses_per_user: float = 4, completion: float = 0.85, archived_ratio: float = 0.03,
+                   password: str = "password123", batch_size: int = 5000, workers: int = 4,
+                   dry_run: bool = False, bcrypt_rounds: int = 12) -> dict:
+    """Write the dataset to ``target_db`` and return per-collection counts."""
+    queue = asyncio.Queue(maxsize=workers * 2)
+    counts = {"courses": 0, "modules": 0, "users": 0, "progress": 0}
+
+    async def writer():
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            collection, docs = item
+            if not dry_run:
+                await target_db[collection].insert_many(docs, ordered=False)
+
+    pending = {name: [] for name in counts}
+
+    async def emit(collection, docs):
+        pending[collection].extend(docs)
+        counts[collection] += len(docs)
+        if len(pending[collection]) >= batch_size:
+            await queue.put((collection, pending[collection]))
+            pending[collection] = []
+
+    async def produce():
+        course_docs = make_courses(seed, courses, archived_ratio)
+        await emit("courses", course_docs)
+        catalogue = []
+        for index, course in enumerate(course_docs):
+            modules = make_modules(seed, course, index, min_modules, max_modules, archived_ratio)
+            await emit("modules", modules)
+            if not course["archived"]:
+                catalogue.append([m["id"] for m in modules if not m["archived"]])
+        weights = [1 / (rank + 1) ** 0.8 for rank in range(len(catalogue))]
+
+        hashed = shared_password_hash(password, seed, bcrypt_rounds)
+        for index in range(users):
+            user = make_user(seed, index, hashed, archived_ratio)
+            await emit("users", [user])
+            if catalogue and user["status"] == "approved" and user["role"] == "student":
+                await emit("progress", make_progress(seed, index, user, catalogue, weights, courses_per_user, completion))
+
+        for collection, docs in pending.items():
+            if docs:
+                await queue.put((collection, docs))
+        for _ in range(workers):
+            await queue.put(None)
+
+    # Writers run until they see None. Any task failing stops the others: a
+    # dead writer would otherwise leave the producer blocked on a full queue.
+    tasks = [asyncio.create_task(writer()) for _ in range(workers)]
+    tasks.append(asyncio.create_task(produce()))
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        for task in done:
+            task.result()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    return counts
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--courses", type=int, default=20)
+    parser.add_argument("--min-modules", type=int, default=6)
+    parser.add_argument("--max-modules", type=int, default=18)
+    parser.add_argument("--courses-per-user", type=float, default=4, help="mean enrolments per approved student")
+    parser.add_argument("--completion", type=float, default=0.85, help="chance of finishing each next module")
+    parser.add_argument("--archived-ratio", type=float, default=0.03)
+    parser.add_argument("--password", default="password123", help="password of every generated user")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=4, help="concurrent insert_many calls")
+    parser.add_argument("--drop", action="store_true", help="drop users, courses, modules and progress first")
+    parser.add_argument("--dry-run", action="store_true", help="generate and count without writing")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        if args.drop and not args.dry_run:
+            for collection in ("users", "courses", "modules", "progress"):
+                await db[collection].drop()
+        counts = await generate(
+            db, args.users, args.courses, args.seed,
+            min_modules=args.min_modules, max_modules=args.max_modules,
+            courses_per_user=args.courses_per_user, completion=args.completion,
+            archived_ratio=args.archived_ratio, password=args.password,
+            batch_size=args.batch_size, workers=args.workers, dry_run=args.dry_run
+        )
+        if not args.dry_run:
+            await ensure_indexes()
+            # Running workers drop everything they cached from the old data
+            response_cache.clear()
+            await cache_sync.flush()
+    finally:
+        client.close()
+    for collection, count in counts.items():
+        print(f"{collection}: {count}")
+    print(f"{time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,47 @@
+"""Load or export database fixtures.
+
+    python manage_fixtures.py export ./snapshot --format ndjson
+    python manage_fixtures.py load ./snapshot
+    python manage_fixtures.py load fixtures/default --remap-ids --replace homepage_content leadership
+
+Uses MONGO_URL / DB_NAME from the environment or backend/.env, like server.py.
+"""
+import argparse
+import asyncio
+from pathlib import Path
+
+from server import cache_sync, client, export_fixtures, load_fixtures
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    load = commands.add_parser("load", help="insert <collection>.json/.ndjson files from a directory")
+    load.add_argument("directory", type=Path)
+    load.add_argument("--replace", nargs="*", default=[], metavar="COLLECTION",
+                      help="empty these collections before loading")
+    load.add_argument("--remap-ids", action="store_true",
+                      help="give every document a fresh id and rewrite references")
+
+    export = commands.add_parser("export", help="write every collection to a directory")
+    export.add_argument("directory", type=Path)
+    export.add_argument("--format", choices=["json", "ndjson"], default="ndjson")
+    export.add_argument("--collections", nargs="*", default=None, metavar="COLLECTION")
+
+    args = parser.parse_args()
+    try:
+        if args.command == "load":
+            counts = await load_fixtures(args.directory, replace=args.replace, remap_ids=args.remap_ids)
+            # Tell running workers to drop their cached responses and users
+            await cache_sync.flush()
+        else:
+            counts = await export_fixtures(args.directory, args.format, args.collections)
+    finally:
+        client.close()
+    for collection, count in counts.items():
+        print(f"{collection}: {count}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,24 +1,170 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, status, UploadFile, File, Form
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, status, UploadFile, File, Form, Request, Response, Query
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
+from starlette.background import BackgroundTask
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorGridFSBucket
+from pymongo import ASCENDING, DESCENDING, IndexModel, ReturnDocument, UpdateOne, monitoring
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
 from passlib.context import CryptContext
 from jose import JWTError, jwt
+from PIL import Image, ImageOps
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
 from datetime import datetime, timezone, timedelta
-from typing import List, Optional
+from typing import AsyncIterator, Generic, List, Optional, TypeVar, Union
 from pydantic import BaseModel, Field, EmailStr, ConfigDict
 import os
 import logging
 from pathlib import Path
+from collections import OrderedDict
+from contextvars import ContextVar
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+import asyncio
+import functools
+import inspect
+import csv
+import json
+import re
 import base64
+import hashlib
+import hmac
+import io
+import math
+import mimetypes
+import tempfile
+import time
+
+from storage import MemoryClient
+
+try:
+    import orjson
+except ImportError:  # optional; only needed for FAST_RESPONSES
+    orjson = None
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+# Prometheus metrics (GET /metrics). With several uvicorn workers set
+# PROMETHEUS_MULTIPROC_DIR so the endpoint aggregates every worker.
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN")
+HTTP_REQUESTS = Counter("http_requests_total", "HTTP requests", ["method", "route", "status"])
+HTTP_REQUEST_DURATION = Histogram("http_request_duration_seconds", "HTTP request latency", ["method", "route", "status"])
+HTTP_REQUESTS_IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests being served", multiprocess_mode="livesum")
+MONGO_COMMAND_DURATION = Histogram(
+    "mongo_command_duration_seconds", "MongoDB command latency", ["collection", "command"],
+    buckets=(.0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5)
+)
+MONGO_COMMAND_FAILURES = Counter("mongo_command_failures_total", "Failed MongoDB commands", ["collection", "command"])
+ADMISSION_REJECTIONS = Counter("admission_rejected_total", "Requests shed by admission control", ["route_class"])
+
+# Request tracing: every request gets an X-Request-ID and a breakdown of
+# the Mongo commands it issued, logged when it exceeds SLOW_REQUEST_MS
+TRACE_REQUESTS = os.environ.get("TRACE_REQUESTS", "false").lower() in ("1", "true", "yes")
+SLOW_REQUEST_MS = float(os.environ.get("SLOW_REQUEST_MS", "500"))
+SLOW_QUERY_MS = float(os.environ.get("SLOW_QUERY_MS", "100"))
+TRACE_MAX_COMMANDS = 500
+
+class RequestTrace:
+    """Mongo commands issued while handling one request."""
+    def __init__(self, request_id: str):
+        self.request_id = request_id
+        self.commands = []
+        self.dropped = 0
+
+    def record(self, collection: str, command: str, duration_ms: float, docs: Optional[int], ok: bool):
+        # Appended from Motor's executor threads; list.append is atomic
+        if len(self.commands) >= TRACE_MAX_COMMANDS:
+            self.dropped += 1
+            return
+        self.commands.append({
+            "collection": collection, "command": command,
+            "duration_ms": round(duration_ms, 3), "docs": docs, "ok": ok
+        })
+
+    def summary(self) -> dict:
+        """Commands grouped by (collection, command): N+1 loops show up as one
+        group with a large count."""
+        groups = {}
+        for entry in self.commands:
+            group = groups.setdefault((entry["collection"], entry["command"]), {
+                "collection": entry["collection"], "command": entry["command"],
+                "count": 0, "duration_ms": 0.0, "docs": 0
+            })
+            group["count"] += 1
+            group["duration_ms"] = round(group["duration_ms"] + entry["duration_ms"], 3)
+            group["docs"] += entry["docs"] or 0
+        return {
+            "commands": len(self.commands) + self.dropped,
+            "duration_ms": round(sum(entry["duration_ms"] for entry in self.commands), 3),
+            "by_command": sorted(groups.values(), key=lambda g: -g["duration_ms"]),
+            "calls": self.commands,
+            "dropped": self.dropped
+        }
+
+# Set by TracingMiddleware; Motor copies the context into its executor
+# threads, so the command listener sees the trace of the calling request
+current_trace: ContextVar[Optional[RequestTrace]] = ContextVar("current_trace", default=None)
+
+def reply_doc_count(reply: dict) -> Optional[int]:
+    cursor = reply.get("cursor")
+    if isinstance(cursor, dict):
+        return len(cursor.get("firstBatch", cursor.get("nextBatch", [])))
+    return reply.get("n")
+
+class MongoCommandMonitor(monitoring.CommandListener):
+    """Times every command the driver sends, by collection and command name,
+    and adds it to the current request's trace when tracing is on.
+
+    The collection is only present on the started event, so it is held
+    until the matching succeeded/failed event arrives.
+    """
+    def __init__(self):
+        self._collections = {}
+
+    def started(self, event):
+        target = event.command.get(event.command_name)
+        if event.command_name == "getMore":
+            target = event.command.get("collection")
+        self._collections[(event.connection_id, event.request_id)] = target if isinstance(target, str) else ""
+
+    def succeeded(self, event):
+        collection = self._collections.pop((event.connection_id, event.request_id), "")
+        MONGO_COMMAND_DURATION.labels(collection, event.command_name).observe(event.duration_micros / 1e6)
+        self._trace(collection, event, reply_doc_count(event.reply), True)
+
+    def failed(self, event):
+        collection = self._collections.pop((event.connection_id, event.request_id), "")
+        MONGO_COMMAND_DURATION.labels(collection, event.command_name).observe(event.duration_micros / 1e6)
+        MONGO_COMMAND_FAILURES.labels(collection, event.command_name).inc()
+        self._trace(collection, event, None, False)
+
+    def _trace(self, collection, event, docs, ok):
+        if not TRACE_REQUESTS:
+            return
+        trace = current_trace.get()
+        duration_ms = event.duration_micros / 1000
+        if trace is not None:
+            trace.record(collection, event.command_name, duration_ms, docs, ok)
+        if duration_ms >= SLOW_QUERY_MS:
+            logger.warning("Slow query %s", json.dumps({
+                "request_id": trace.request_id if trace else None,
+                "collection": collection, "command": event.command_name,
+                "duration_ms": round(duration_ms, 3), "docs": docs, "ok": ok
+            }))
+
+# MongoDB connection. STORAGE_ENGINE=memory swaps in the indexed in-process
+# engine from storage.py (tests, profiling without a server); it implements
+# the Motor calls made here, so handlers are unchanged.
+STORAGE_ENGINE = os.environ.get("STORAGE_ENGINE", "mongo")
+if STORAGE_ENGINE == "mongo":
+    mongo_url = os.environ['MONGO_URL']
+    client = AsyncIOMotorClient(mongo_url, event_listeners=[MongoCommandMonitor()])
+elif STORAGE_ENGINE == "memory":
+    client = MemoryClient()
+else:
+    raise ValueError(f"Unknown storage engine: {STORAGE_ENGINE}")
 db = client[os.environ['DB_NAME']]
 
 # Security
@@ -28,7 +174,80 @@ SECRET_KEY = os.environ.get("JWT_SECRET_KEY", "your-secret-key-change-in-product
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 7 days
 
-app = FastAPI()
+# Authenticated-principal cache
+USER_CACHE_TTL_SECONDS = float(os.environ.get("USER_CACHE_TTL_SECONDS", "30"))
+USER_CACHE_MAX_ENTRIES = int(os.environ.get("USER_CACHE_MAX_ENTRIES", "10000"))
+
+# Public response cache
+RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get("RESPONSE_CACHE_MAX_ENTRIES", "1024"))
+
+# Cross-worker cache invalidation through the cache_versions collection;
+# other workers see a write within one interval. 0 disables it.
+CACHE_SYNC_INTERVAL_SECONDS = float(os.environ.get("CACHE_SYNC_INTERVAL_SECONDS", "1"))
+CACHE_SYNC_RECENT_KEYS = int(os.environ.get("CACHE_SYNC_RECENT_KEYS", "256"))
+
+# Cursor pagination
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Fixtures
+DEFAULT_FIXTURES_DIR = ROOT_DIR / "fixtures" / "default"
+FIXTURE_BATCH_SIZE = 1000
+
+# Sparse ordering ranks
+RANK_STEP = 1024
+
+# Progress sync
+MAX_PROGRESS_BATCH = 200
+
+# Admin CSV/NDJSON exports: Mongo cursor batch and response chunk sizes
+EXPORT_BATCH_SIZE = int(os.environ.get("EXPORT_BATCH_SIZE", "1000"))
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+# Password hashing pool ("thread" or "process")
+PASSWORD_POOL_KIND = os.environ.get("PASSWORD_POOL_KIND", "thread")
+PASSWORD_POOL_WORKERS = int(os.environ.get("PASSWORD_POOL_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+# Uploaded images ("filesystem" or "gridfs")
+IMAGE_STORE_BACKEND = os.environ.get("IMAGE_STORE_BACKEND", "filesystem")
+IMAGE_STORE_DIR = Path(os.environ.get("IMAGE_STORE_DIR", str(ROOT_DIR / "uploads")))
+IMAGE_GRIDFS_BUCKET = "image_data"
+# Origin written into stored image URLs; defaults to the uploading request's
+IMAGE_PUBLIC_BASE_URL = os.environ.get("IMAGE_PUBLIC_BASE_URL", "")
+IMAGE_MAX_BYTES = int(os.environ.get("IMAGE_MAX_BYTES", str(10 * 1024 * 1024)))
+IMAGE_CHUNK_BYTES = 256 * 1024
+IMAGE_PATH = "/api/images/"
+IMAGE_VARIANT_WIDTHS = sorted(int(w) for w in os.environ.get("IMAGE_VARIANT_WIDTHS", "160,480,1280").split(","))
+IMAGE_VARIANT_FORMAT = os.environ.get("IMAGE_VARIANT_FORMAT", "WEBP")
+IMAGE_VARIANT_QUALITY = int(os.environ.get("IMAGE_VARIANT_QUALITY", "80"))
+IMAGE_POOL_WORKERS = int(os.environ.get("IMAGE_POOL_WORKERS", str(min(2, os.cpu_count() or 1))))
+
+# Admission control for expensive route classes: (concurrent requests, queued
+# requests) each. Override with ADMISSION_LIMITS="password=8:32,analytics=1:2";
+# a limit of 0 disables the gate. Requests beyond the queue, or queued longer
+# than ADMISSION_QUEUE_TIMEOUT_SECONDS, get 503 with Retry-After.
+def admission_limits(spec: str) -> dict:
+    limits = {
+        "password": (PASSWORD_POOL_WORKERS * 2, PASSWORD_POOL_WORKERS * 8),
+        "analytics": (2, 4),
+        "export": (2, 2),
+        "image": (IMAGE_POOL_WORKERS, IMAGE_POOL_WORKERS * 4),
+    }
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, value = item.partition("=")
+        if name not in limits:
+            raise ValueError(f"Unknown admission route class: {name}")
+        limit, _, queue = value.partition(":")
+        limits[name] = (int(limit), int(queue or 0))
+    return limits
+
+ADMISSION_LIMITS = admission_limits(os.environ.get("ADMISSION_LIMITS", ""))
+ADMISSION_QUEUE_TIMEOUT_SECONDS = float(os.environ.get("ADMISSION_QUEUE_TIMEOUT_SECONDS", "5"))
+
+# Opt-in fast serialization: trusted Mongo projections encoded with orjson
+FAST_RESPONSES = os.environ.get("FAST_RESPONSES", "false").lower() in ("1", "true", "yes") and orjson is not None
+
+app = FastAPI(default_response_class=ORJSONResponse if FAST_RESPONSES else JSONResponse)
 api_router = APIRouter(prefix="/api")
 
 # =============== MODELS ===============
@@ -125,11 +344,29 @@ class Progress(BaseModel):
     module_id: str
     completed: bool
     completed_at: Optional[str] = None
+    updated_at: Optional[str] = None
+
+class CourseDetail(BaseModel):
+    course: Course
+    modules: List[Module]
+    progress: List[Progress]
+    completed_modules: int
+    total_modules: int
+    completion_percentage: float
 
 class ProgressUpdate(BaseModel):
     module_id: str
     completed: bool
 
+class ProgressBatchItem(ProgressUpdate):
+    # When the tick happened on the client; later ticks win on conflict
+    updated_at: Optional[datetime] = None
+
+class ProgressBatchResult(BaseModel):
+    module_id: str
+    status: str  # "applied", "stale" or "error"
+    progress: Optional[Progress] = None
+
 class Announcement(BaseModel):
     model_config = ConfigDict(extra="ignore")
     id: str
@@ -240,14 +477,42 @@ class MembershipContentUpdate(BaseModel):
     description: str
     form_link: str
 
+class ReorderItem(BaseModel):
+    id: str
+    order_number: int
+
+class MoveRequest(BaseModel):
+    # Place the item directly after this one; None moves it to the top
+    after_id: Optional[str] = None
+
 class SystemSetup(BaseModel):
     is_setup_complete: bool
 
+class HomeBundle(BaseModel):
+    homepage_content: List[HomepageContent]
+    coach_info: Optional[CoachInfo] = None
+    leadership: List[LeadershipMember]
+    announcements: List[Announcement]
+    success_events: List[SuccessEvent]
+    events: List[Event]
+    alumni: List[Alumni]
+    setup: SystemSetup
+
 class SetupAdmin(BaseModel):
     full_name: str
     email: EmailStr
     password: str
 
+T = TypeVar("T")
+
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+class CountedPage(Page[T], Generic[T]):
+    # Number of documents matching the query across every page
+    total: int
+
 # =============== HELPER FUNCTIONS ===============
 
 def hash_password(password: str) -> str:
@@ -256,6 +521,155 @@ def hash_password(password: str) -> str:
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
+class WorkerPool:
+    """Runs CPU-bound work on a bounded worker pool instead of the event loop.
+
+    At most ``workers`` jobs run at once; callers beyond that wait on a
+    semaphore and are reported as ``queue_depth``.
+    """
+
+    def __init__(self, kind: str, workers: int, name: str = "worker"):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown worker pool kind: {kind}")
+        self.kind = kind
+        self.name = name
+        self.workers = max(1, workers)
+        self.queue_depth = 0
+        self.in_flight = 0
+        self.completed = 0
+        self._executor: Optional[Executor] = None
+        self._slots = asyncio.Semaphore(self.workers)
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=self.name)
+        return self._executor
+
+    async def run(self, func, *args):
+        self.queue_depth += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.queue_depth -= 1
+        self.in_flight += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+            self._slots.release()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        return {
+            "kind": self.kind,
+            "workers": self.workers,
+            "queue_depth": self.queue_depth,
+            "in_flight": self.in_flight,
+            "completed": self.completed
+        }
+
+password_pool = WorkerPool(PASSWORD_POOL_KIND, PASSWORD_POOL_WORKERS, name="password")
+image_pool = WorkerPool("process", IMAGE_POOL_WORKERS, name="image")
+
+class AdmissionGate:
+    """Concurrency limit with a bounded wait queue for one class of routes.
+
+    Up to ``limit`` requests run at once and up to ``queue`` more wait in
+    arrival order. Anything beyond that, or waiting longer than
+    ``timeout_seconds``, is rejected immediately with 503 so the request
+    costs almost nothing. Retry-After is estimated from the recent service
+    time and the current backlog.
+    """
+
+    def __init__(self, name: str, limit: int, queue: int, timeout_seconds: float):
+        self.name = name
+        self.limit = limit
+        self.queue = max(0, queue)
+        self.timeout_seconds = timeout_seconds
+        self.waiting = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.avg_seconds = 1.0
+        self._slots = asyncio.Semaphore(max(1, limit))
+
+    async def acquire(self) -> float:
+        """Wait for a slot and return its start time, for ``release``."""
+        if self.limit > 0:
+            if self._slots.locked():
+                if self.waiting >= self.queue:
+                    self.reject()
+                self.waiting += 1
+                try:
+                    await asyncio.wait_for(self._slots.acquire(), self.timeout_seconds)
+                except asyncio.TimeoutError:
+                    self.reject()
+                finally:
+                    self.waiting -= 1
+            else:
+                await self._slots.acquire()
+        self.in_flight += 1
+        return time.monotonic()
+
+    def release(self, started: float):
+        self.avg_seconds = 0.8 * self.avg_seconds + 0.2 * (time.monotonic() - started)
+        self.in_flight -= 1
+        self.completed += 1
+        if self.limit > 0:
+            self._slots.release()
+
+    def reject(self):
+        self.rejected += 1
+        ADMISSION_REJECTIONS.labels(self.name).inc()
+        retry_after = max(1, math.ceil(self.avg_seconds * (self.waiting + 1) / max(1, self.limit)))
+        raise HTTPException(
+            status_code=503,
+            detail="Server is busy, please retry",
+            headers={"Retry-After": str(retry_after)}
+        )
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "queue": self.queue,
+            "waiting": self.waiting,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_seconds": round(self.avg_seconds, 4)
+        }
+
+admission_gates = {
+    name: AdmissionGate(name, limit, queue, ADMISSION_QUEUE_TIMEOUT_SECONDS)
+    for name, (limit, queue) in ADMISSION_LIMITS.items()
+}
+
+def admit(route_class: str):
+    """Route dependency holding an ``admission_gates`` slot for the request."""
+    gate = admission_gates[route_class]
+
+    async def dependency():
+        started = await gate.acquire()
+        try:
+            yield
+        finally:
+            gate.release(started)
+    return Depends(dependency)
+
+async def hash_password_async(password: str) -> str:
+    return await password_pool.run(hash_password, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await password_pool.run(verify_password, plain_password, hashed_password)
+
 def create_access_token(data: dict):
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -273,8 +687,15 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
     
-    user = await db.users.find_one({"id": user_id}, {"_id": 0})
+    user = user_cache.get(user_id)
     if user is None:
+        generation = user_cache.generation
+        user = await db.users.find_one({"id": user_id}, {"_id": 0})
+        if user is None:
+            raise HTTPException(status_code=401, detail="User not found")
+        user_cache.put(user_id, user, generation)
+    # Archiving revokes access, including for tokens issued before it
+    if user.get("archived"):
         raise HTTPException(status_code=401, detail="User not found")
     return user
 
@@ -292,9 +713,561 @@ def generate_id():
     from uuid import uuid4
     return str(uuid4())
 
+async def reorder_ranked(collection, order: List[ReorderItem]) -> int:
+    """Apply explicit ``order_number`` values with a single bulk write."""
+    if not order:
+        return 0
+    result = await collection.bulk_write(
+        [UpdateOne({"id": item.id}, {"$set": {"order_number": item.order_number}}) for item in order],
+        ordered=False
+    )
+    return result.matched_count
+
+async def move_ranked(collection, item_id: str, after_id: Optional[str], scope_fields: List[str]) -> dict:
+    """Move one item directly after ``after_id`` within its scope.
+
+    Ranks are kept sparse (multiples of ``RANK_STEP``), so a move normally
+    writes only the moved item at the midpoint between its new neighbours.
+    When there is no integer left between them the whole scope is renumbered
+    in one bulk write.
+    """
+    item = await collection.find_one({"id": item_id, "archived": False}, {"_id": 0})
+    if not item:
+        raise HTTPException(status_code=404, detail="Item not found")
+    scope = {"archived": False, "id": {"$ne": item_id}}
+    scope.update({field: item.get(field) for field in scope_fields})
+    
+    previous_rank = None
+    if after_id:
+        previous = await collection.find_one({**scope, "id": after_id}, {"_id": 0, "order_number": 1})
+        if not previous:
+            raise HTTPException(status_code=404, detail="Item to move after not found")
+        previous_rank = previous["order_number"]
+    
+    next_query = dict(scope)
+    if previous_rank is not None:
+        next_query["order_number"] = {"$gt": previous_rank}
+    following = await collection.find(next_query, {"_id": 0, "order_number": 1}).sort("order_number", 1).to_list(1)
+    
+    low = previous_rank if previous_rank is not None else 0
+    high = following[0]["order_number"] if following else low + 2 * RANK_STEP
+    if high - low >= 2:
+        rank = (low + high) // 2
+        await collection.update_one({"id": item_id}, {"$set": {"order_number": rank}})
+        return {"order_number": rank, "rebalanced": False}
+    
+    # Ranks too close together: renumber the scope with the item in its new place
+    siblings = await collection.find(scope, {"_id": 0, "id": 1}).sort("order_number", 1).to_list(None)
+    ids = [sibling["id"] for sibling in siblings]
+    ids.insert(ids.index(after_id) + 1 if after_id else 0, item_id)
+    await collection.bulk_write(
+        [UpdateOne({"id": sibling_id}, {"$set": {"order_number": (index + 1) * RANK_STEP}})
+         for index, sibling_id in enumerate(ids)],
+        ordered=False
+    )
+    return {"order_number": (ids.index(item_id) + 1) * RANK_STEP, "rebalanced": True}
+
+def progress_timestamp(moment: Optional[datetime] = None) -> str:
+    """UTC ISO timestamp with a fixed width, so stored values compare as strings."""
+    moment = moment or datetime.now(timezone.utc)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc).isoformat(timespec="microseconds")
+
+def user_search_terms(full_name: str, email: str) -> List[str]:
+    """Lowercased name words plus the email, matched by anchored prefix
+    regexes against the multikey ``active_search_terms`` index."""
+    return sorted(set(full_name.lower().split()) | {email.lower()})
+
+CACHE_SYNC_ALL = "*"
+
+class CacheSync:
+    """Keeps the in-process caches of every worker coherent.
+
+    Each cache publishes the names it invalidates (a collection, ``users``
+    with the affected user ids, or ``*`` for everything). Publishing only
+    queues the name and wakes the sync task, which ``$inc``s one document
+    per name in ``cache_versions``. The same task polls that collection every
+    ``interval_seconds`` and hands each name whose version moved to the
+    subscribed caches, so other workers drop stale entries within one
+    interval without reading any content. ``users`` also keeps the last
+    ``recent_keys`` ids; a worker that fell further behind clears every user.
+    """
+
+    def __init__(self, interval_seconds: float, recent_keys: int):
+        self.interval_seconds = interval_seconds
+        self.recent_keys = recent_keys
+        self.versions = {}
+        self.published = 0
+        self.received = 0
+        self.errors = 0
+        self._pending = {}
+        self._subscribers = []
+        self._wake = None
+        self._stopping = False
+        self._task = None
+
+    def subscribe(self, handler):
+        """``handler(name, keys)`` applies a remote change; ``keys`` is None for all."""
+        self._subscribers.append(handler)
+
+    def publish(self, name: str, *keys: str):
+        """Queue an invalidation. Worker processes send it from the sync task;
+        CLIs that write through server.py call ``flush`` before exiting."""
+        if self.interval_seconds <= 0:
+            return
+        self._queue(name, max(len(keys), 1), list(keys))
+        if self._task is not None:
+            self._wake.set()
+
+    def _queue(self, name: str, count: int, keys: List[str]):
+        # Only the last recent_keys ids are useful; a larger count makes
+        # other workers clear everything under the name
+        queued_count, queued_keys = self._pending.get(name, (0, []))
+        self._pending[name] = (queued_count + count, (queued_keys + keys)[-self.recent_keys:])
+
+    async def start(self):
+        if self.interval_seconds <= 0 or self._task is not None:
+            return
+        async for doc in db.cache_versions.find({}, {"recent": 0}):
+            self.versions[doc["_id"]] = doc["version"]
+        self._wake = asyncio.Event()
+        self._stopping = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        # Stopped through a flag rather than cancel(): on 3.11 wait_for can
+        # swallow a cancel that races with the wake event, and the loop spins on
+        self._stopping = True
+        self._wake.set()
+        await self._task
+        self._task = None
+        await self.flush()
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                async with asyncio.timeout(self.interval_seconds):
+                    await self._wake.wait()
+            except TimeoutError:
+                pass
+            self._wake.clear()
+            if self._stopping:
+                break
+            try:
+                await self.flush()
+                await self.poll()
+            except Exception:
+                self.errors += 1
+                logger.exception("Cache sync failed")
+
+    async def flush(self):
+        pending, self._pending = list(self._pending.items()), {}
+        for position, (name, (count, keys)) in enumerate(pending):
+            update = {"$inc": {"version": count}}
+            if keys:
+                update["$push"] = {"recent": {"$each": keys, "$slice": -self.recent_keys}}
+            try:
+                doc = await db.cache_versions.find_one_and_update(
+                    {"_id": name}, update, projection={"version": 1}, upsert=True,
+                    return_document=ReturnDocument.AFTER
+                )
+            except Exception:
+                for unsent, (unsent_count, unsent_keys) in pending[position:]:
+                    self._queue(unsent, unsent_count, unsent_keys)
+                raise
+            self.published += 1
+            # Already applied locally; only skip ahead if nobody else bumped meanwhile
+            if self.versions.get(name, 0) == doc["version"] - count:
+                self.versions[name] = doc["version"]
+
+    async def poll(self):
+        async for doc in db.cache_versions.find({}, {"recent": 0}):
+            name, version = doc["_id"], doc["version"]
+            seen = self.versions.get(name, 0)
+            if version == seen:
+                continue
+            keys = None
+            if 0 < version - seen <= self.recent_keys:
+                doc = await db.cache_versions.find_one({"_id": name}) or doc
+                recent = doc.get("recent", [])
+                version = doc["version"]
+                if version - seen <= len(recent):
+                    keys = recent[len(recent) - (version - seen):]
+            self.versions[name] = version
+            self.received += 1
+            for handler in self._subscribers:
+                handler(name, keys)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self._task is not None,
+            "interval_seconds": self.interval_seconds,
+            "published": self.published,
+            "received": self.received,
+            "errors": self.errors,
+            "pending": len(self._pending)
+        }
+
+cache_sync = CacheSync(CACHE_SYNC_INTERVAL_SECONDS, CACHE_SYNC_RECENT_KEYS)
+
+class UserCache:
+    """In-process TTL/LRU cache of user documents keyed by the token ``sub``.
+
+    Writers call ``invalidate`` after changing a user. Every invalidation bumps
+    ``generation`` and records it against the user, and ``put`` refuses a doc
+    read before that user's last invalidation, so a lookup racing with an
+    admin write can never re-populate a stale doc. Invalidations of other
+    users (every login is one) don't affect it. Invalidations are published
+    through ``sync`` to the other workers.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int, sync: CacheSync):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.sync = sync
+        sync.subscribe(self.apply_remote)
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        # user id -> generation of its last invalidation, for the newest
+        # max_entries of them; older ones count as invalidated at _horizon
+        self._evicted = OrderedDict()
+        self._horizon = 0
+
+    def get(self, user_id: str) -> Optional[dict]:
+        entry = self._entries.get(user_id)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[user_id]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(user_id)
+        self.hits += 1
+        return dict(entry[1])
+
+    def put(self, user_id: str, user: dict, generation: int):
+        if self.ttl_seconds <= 0 or self._evicted.get(user_id, self._horizon) > generation:
+            return
+        self._entries[user_id] = (time.monotonic() + self.ttl_seconds, dict(user))
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: str):
+        self.evict(user_id)
+        self.sync.publish("users", user_id)
+
+    def evict(self, *user_ids: str):
+        self.generation += 1
+        for user_id in user_ids:
+            self._entries.pop(user_id, None)
+            self._evicted[user_id] = self.generation
+            self._evicted.move_to_end(user_id)
+        while len(self._evicted) > self.max_entries:
+            self._horizon = self._evicted.popitem(last=False)[1]
+
+    def clear(self):
+        self.generation += 1
+        self._entries.clear()
+        self._evicted.clear()
+        self._horizon = self.generation
+
+    def apply_remote(self, name: str, keys: Optional[List[str]]):
+        if name == CACHE_SYNC_ALL or (name == "users" and keys is None):
+            self.clear()
+        elif name == "users":
+            self.evict(*keys)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0
+        }
+
+user_cache = UserCache(USER_CACHE_TTL_SECONDS, USER_CACHE_MAX_ENTRIES, cache_sync)
+
+class ResponseCache:
+    """Serialized public GET bodies, validated against per-collection versions.
+
+    Each entry remembers the version of every collection it was built from.
+    Admin writes call ``bump`` for the collections they touch, which makes
+    every dependent entry stale without having to track keys. Versions are
+    snapshotted before the body is built, so a write that lands mid-build
+    also leaves the entry stale. Bumps are published through ``sync`` and
+    bumps from other workers are applied locally.
+    """
+
+    def __init__(self, max_entries: int, sync: CacheSync):
+        self.max_entries = max_entries
+        self.sync = sync
+        sync.subscribe(self.apply_remote)
+        self.versions = {}
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self._entries = OrderedDict()
+
+    def snapshot(self, collections) -> tuple:
+        return tuple(self.versions.get(name, 0) for name in collections)
+
+    def bump(self, *collections):
+        self.expire(*collections)
+        for name in collections:
+            self.sync.publish(name)
+
+    def expire(self, *collections):
+        for name in collections:
+            self.versions[name] = self.versions.get(name, 0) + 1
+
+    def clear(self):
+        self.expire(*self.versions)
+        self._entries.clear()
+        self.sync.publish(CACHE_SYNC_ALL)
+
+    def apply_remote(self, name: str, keys: Optional[List[str]]):
+        if name == CACHE_SYNC_ALL:
+            self.expire(*self.versions)
+            self._entries.clear()
+        elif name != "users":
+            self.expire(name)
+
+    def get(self, key: str, collections) -> Optional[tuple]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != self.snapshot(collections):
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1], entry[2]
+
+    def put(self, key: str, versions: tuple, body: bytes) -> tuple:
+        etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        self._entries[key] = (versions, body, etag)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return body, etag
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "versions": dict(self.versions),
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified
+        }
+
+response_cache = ResponseCache(RESPONSE_CACHE_MAX_ENTRIES, cache_sync)
+
+CURSOR_VALUE_TYPES = (str, int, float, bool, type(None))
+
+def cursor_signature(payload: str) -> str:
+    digest = hmac.new(SECRET_KEY.encode("utf-8"), payload.encode("utf-8"), hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest[:12]).decode("ascii")
+
+def encode_cursor(doc: dict, sort_key: str) -> str:
+    raw = json.dumps([doc.get(sort_key), doc["id"]], separators=(",", ":")).encode("utf-8")
+    payload = base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+    return f"{payload}.{cursor_signature(payload)}"
+
+def decode_cursor(cursor: str):
+    """Inverse of ``encode_cursor``. The values end up in Mongo filters, so
+    only signed cursors holding a scalar and a string id are accepted."""
+    payload, _, signature = cursor.partition(".")
+    if not hmac.compare_digest(signature, cursor_signature(payload)):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    try:
+        raw = base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4))
+        value, last_id = json.loads(raw)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(value, CURSOR_VALUE_TYPES) or not isinstance(last_id, str):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return value, last_id
+
+async def paginate(collection, query: dict, projection: dict, sort_key: str, direction: int,
+                   limit: Optional[int], cursor: Optional[str]):
+    """Keyset pagination on ``(sort_key, id)``.
+
+    Returns one page of documents and the opaque cursor for the next page,
+    or None when this is the last one. Cost per page is independent of how
+    deep into the collection the cursor points.
+    """
+    limit = limit or DEFAULT_PAGE_SIZE
+    if cursor:
+        value, last_id = decode_cursor(cursor)
+        op = "$gt" if direction == 1 else "$lt"
+        # Nulls sort first ascending and last descending, and never match $gt/$lt
+        if value is None:
+            after = [{sort_key: None, "id": {op: last_id}}]
+            if direction == 1:
+                after.append({sort_key: {"$ne": None}})
+        else:
+            after = [{sort_key: {op: value}}, {sort_key: value, "id": {op: last_id}}]
+            if direction == -1:
+                after.append({sort_key: None})
+        query = {"$and": [query, {"$or": after}]}
+    docs = await collection.find(query, projection).sort([(sort_key, direction), ("id", direction)]).to_list(limit + 1)
+    next_cursor = encode_cursor(docs[limit - 1], sort_key) if len(docs) > limit else None
+    return docs[:limit], next_cursor
+
+def _orjson_default(value):
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+def encode_json(content) -> bytes:
+    if FAST_RESPONSES:
+        return orjson.dumps(content, default=_orjson_default)
+    return json.dumps(jsonable_encoder(content), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+@functools.lru_cache(maxsize=None)
+def _trusted_fields(model):
+    required = [name for name, field in model.model_fields.items() if field.is_required()]
+    defaults = {name: field.default for name, field in model.model_fields.items() if not field.is_required()}
+    return required, defaults
+
+def trusted_projection(model) -> dict:
+    """Mongo projection returning exactly the fields ``model`` serializes."""
+    return {"_id": 0, **{name: 1 for name in model.model_fields}}
+
+def model_rows(docs: List[dict], model) -> list:
+    """Handler results for ``docs`` read with ``trusted_projection(model)``.
+
+    Normally each document becomes a model instance. With FAST_RESPONSES the
+    projected documents are trusted as-is, with only missing defaults filled
+    in, so the only validation left is FastAPI's single pass over the
+    response_model (or none at all for cached public bodies). A document
+    missing a required field still goes through the model and fails loudly.
+    """
+    if not FAST_RESPONSES:
+        return [model(**doc) for doc in docs]
+    required, defaults = _trusted_fields(model)
+    rows = []
+    for doc in docs:
+        if any(name not in doc for name in required):
+            rows.append(model(**doc).model_dump())
+            continue
+        for name, default in defaults.items():
+            if name not in doc:
+                doc[name] = default
+        rows.append(doc)
+    return rows
+
+# Named compact views for public list endpoints; "full" (the default) is every field
+LIST_VIEWS = {
+    "announcements": {"summary": ["id", "title", "date", "image_url", "created_at"]},
+    "success_events": {"summary": ["id", "title", "date", "image_url"]},
+    "events": {"summary": ["id", "name", "date", "photo_url"]},
+    "alumni": {"summary": ["id", "name", "designation", "batch", "photo_url", "order_number"]},
+}
+
+def select_fields(model, collection: str, view: Optional[str], fields: Optional[str]) -> Optional[List[str]]:
+    """Fields requested through ``?fields=a,b`` or ``?view=summary``.
+
+    Returns None for the full document. ``fields`` wins over ``view``, is
+    checked against ``model`` and always includes ``id``.
+    """
+    if fields:
+        names = [name.strip() for name in fields.split(",") if name.strip()]
+        unknown = [name for name in names if name not in model.model_fields]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    elif view and view != "full":
+        names = LIST_VIEWS.get(collection, {}).get(view)
+        if names is None:
+            raise HTTPException(status_code=400, detail=f"Unknown view: {view}")
+    else:
+        return None
+    return ["id"] + [name for name in dict.fromkeys(names) if name != "id"]
+
+def view_projection(model, selected: Optional[List[str]], sort_key: str) -> dict:
+    # The sort key is always read so paginate() can build the next cursor
+    if selected is None:
+        return trusted_projection(model)
+    return {"_id": 0, sort_key: 1, **{name: 1 for name in selected}}
+
+def thumbnail_url(url: Optional[str]) -> Optional[str]:
+    if url and IMAGE_PATH in url and "?" not in url:
+        return f"{url}?w={IMAGE_VARIANT_WIDTHS[0]}"
+    return url
+
+def view_rows(docs: List[dict], model, selected: Optional[List[str]], thumbnails: bool = False) -> list:
+    """Handler results for ``docs`` read with ``view_projection``.
+
+    Partial views are returned as plain dicts holding only ``selected``;
+    with ``thumbnails`` image URLs point at the smallest stored variant.
+    """
+    if selected is None:
+        return model_rows(docs, model)
+    rows = []
+    for doc in docs:
+        row = {name: doc.get(name) for name in selected}
+        if thumbnails:
+            for name in ("photo_url", "image_url"):
+                if name in row:
+                    row[name] = thumbnail_url(row[name])
+        rows.append(row)
+    return rows
+
+def page_of(rows: list, model, next_cursor: Optional[str]):
+    # Partial views are plain dicts that the full model would reject
+    if FAST_RESPONSES or (rows and isinstance(rows[0], dict)):
+        return {"items": rows, "next_cursor": next_cursor}
+    return Page[model](items=rows, next_cursor=next_cursor)
+
+def etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    # If-None-Match uses the weak comparison, so W/"x" matches "x"
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return if_none_match.strip() == "*" or etag.removeprefix("W/") in tags
+
+def cached_public(*collections):
+    """Serve a public GET handler from ``response_cache`` with ETag/304 support.
+
+    The wrapped handler only runs on a miss; its result is serialized once
+    and reused until one of ``collections`` is bumped.
+    """
+    def decorator(handler):
+        signature = inspect.signature(handler)
+
+        @functools.wraps(handler)
+        async def wrapper(request: Request, **kwargs):
+            key = request.url.path + "?" + "&".join(sorted(f"{k}={v}" for k, v in request.query_params.multi_items()))
+            cached = response_cache.get(key, collections)
+            if cached is None:
+                versions = response_cache.snapshot(collections)
+                result = await handler(**kwargs)
+                cached = response_cache.put(key, versions, encode_json(result))
+            body, etag = cached
+
+            headers = {"ETag": etag, "Cache-Control": "no-cache"}
+            if etag_matches(request, etag):
+                response_cache.not_modified += 1
+                return Response(status_code=304, headers=headers)
+            return Response(content=body, media_type="application/json", headers=headers)
+
+        parameters = [inspect.Parameter("request", inspect.Parameter.KEYWORD_ONLY, annotation=Request)]
+        parameters += [p.replace(kind=inspect.Parameter.KEYWORD_ONLY) for p in signature.parameters.values()]
+        wrapper.__signature__ = signature.replace(parameters=parameters)
+        return wrapper
+    return decorator
+
 # =============== AUTH ROUTES ===============
 
-@api_router.post("/auth/signup", response_model=TokenResponse)
+@api_router.post("/auth/signup", response_model=TokenResponse, dependencies=[admit("password")])
 async def signup(user_data: UserSignup):
     # Check if email exists
     existing = await db.users.find_one({"email": user_data.email}, {"_id": 0})
@@ -302,23 +1275,28 @@ async def signup(user_data: UserSignup):
         raise HTTPException(status_code=400, detail="Email already registered")
     
     # Create user
+    password_hash = await hash_password_async(user_data.password)
     user_doc = {
         "id": generate_id(),
         "full_name": user_data.full_name,
         "email": user_data.email,
-        "password_hash": hash_password(user_data.password),
+        "password_hash": password_hash,
         "role": "student",
         "status": "pending",
         "mentorship_access": False,
         "advanced_access": False,
         "batch": user_data.batch,
         "reason": user_data.reason,
-        "last_login": datetime.now(timezone.utc).isoformat(),
+        "search_terms": user_search_terms(user_data.full_name, user_data.email),
+        "last_login": progress_timestamp(),
         "archived": False,
         "created_at": datetime.now(timezone.utc).isoformat()
     }
     
-    await db.users.insert_one(user_doc)
+    try:
+        await db.users.insert_one(user_doc)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Email already registered")
     
     # Create token
     access_token = create_access_token({"sub": user_doc["id"]})
@@ -339,18 +1317,19 @@ async def signup(user_data: UserSignup):
     
     return TokenResponse(access_token=access_token, token_type="bearer", user=user_response)
 
-@api_router.post("/auth/login", response_model=TokenResponse)
+@api_router.post("/auth/login", response_model=TokenResponse, dependencies=[admit("password")])
 async def login(login_data: UserLogin):
-    user = await db.users.find_one({"email": login_data.email}, {"_id": 0})
-    if not user or not verify_password(login_data.password, user["password_hash"]):
+    user = await db.users.find_one({"email": login_data.email, "archived": {"$ne": True}}, {"_id": 0})
+    if not user or not await verify_password_async(login_data.password, user["password_hash"]):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
     # Update last login
+    user["last_login"] = progress_timestamp()
     await db.users.update_one(
         {"id": user["id"]},
-        {"$set": {"last_login": datetime.now(timezone.utc).isoformat()}}
+        {"$set": {"last_login": user["last_login"]}}
     )
-    user["last_login"] = datetime.now(timezone.utc).isoformat()
+    user_cache.invalidate(user["id"])
     
     # Create token
     access_token = create_access_token({"sub": user["id"]})
@@ -382,7 +1361,7 @@ async def check_setup_status():
         return {"is_setup_complete": True}
     return {"is_setup_complete": False}
 
-@api_router.post("/setup/initialize")
+@api_router.post("/setup/initialize", dependencies=[admit("password")])
 async def initialize_system(admin_data: SetupAdmin):
     # Check if already setup
     setup = await db.system_setup.find_one({})
@@ -395,28 +1374,35 @@ async def initialize_system(admin_data: SetupAdmin):
         raise HTTPException(status_code=400, detail="Email already registered")
     
     # Create admin user
+    password_hash = await hash_password_async(admin_data.password)
     admin_doc = {
         "id": generate_id(),
         "full_name": admin_data.full_name,
         "email": admin_data.email,
-        "password_hash": hash_password(admin_data.password),
+        "password_hash": password_hash,
         "role": "admin",
         "status": "approved",
         "mentorship_access": True,
         "batch": None,
         "reason": None,
-        "last_login": datetime.now(timezone.utc).isoformat(),
+        "search_terms": user_search_terms(admin_data.full_name, admin_data.email),
+        "last_login": progress_timestamp(),
         "archived": False,
         "created_at": datetime.now(timezone.utc).isoformat()
     }
-    await db.users.insert_one(admin_doc)
+    try:
+        await db.users.insert_one(admin_doc)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Email already registered")
     
     # Initialize default content
     await initialize_default_content()
+    response_cache.clear()
     
     # Mark system as setup
     await db.system_setup.delete_many({})
     await db.system_setup.insert_one({"is_setup_complete": True, "created_at": datetime.now(timezone.utc).isoformat()})
+    response_cache.bump("system_setup")
     
     # Create token
     access_token = create_access_token({"sub": admin_doc["id"]})
@@ -436,145 +1422,169 @@ async def initialize_system(admin_data: SetupAdmin):
     return TokenResponse(access_token=access_token, token_type="bearer", user=user_response)
 
 async def initialize_default_content():
-    # Homepage content
-    homepage_sections = [
-        {"section": "hero_title", "content": "Welcome to BUTEX Debating Club", "updated_at": datetime.now(timezone.utc).isoformat()},
-        {"section": "hero_subtitle", "content": "Empowering voices, shaping leaders", "updated_at": datetime.now(timezone.utc).isoformat()},
-        {"section": "about_university", "content": "Bangladesh University of Textiles (BUTEX) is a premier institution dedicated to textile education and research in Bangladesh.", "updated_at": datetime.now(timezone.utc).isoformat()},
-        {"section": "about_club", "content": "BUTEX Debating Club is a platform for students to develop critical thinking, public speaking, and leadership skills through debate.", "updated_at": datetime.now(timezone.utc).isoformat()},
-        {"section": "mission", "content": "To foster intellectual discourse and develop confident, articulate leaders.", "updated_at": datetime.now(timezone.utc).isoformat()},
-        {"section": "vision", "content": "To be the leading debating platform in Bangladesh, nurturing world-class debaters.", "updated_at": datetime.now(timezone.utc).isoformat()},
-    ]
-    await db.homepage_content.delete_many({})
-    await db.homepage_content.insert_many(homepage_sections)
-    
-    # Leadership (sample data)
-    leadership_members = [
-        {"id": generate_id(), "name": "President Name", "position": "President", "photo_url": None, "order_number": 1, "archived": False, "created_at": datetime.now(timezone.utc).isoformat()},
-        {"id": generate_id(), "name": "General Secretary Name", "position": "General Secretary", "photo_url": None, "order_number": 2, "archived": False, "created_at": datetime.now(timezone.utc).isoformat()},
-        {"id": generate_id(), "name": "Chief of English Wing Name", "position": "Chief of English Wing", "photo_url": None, "order_number": 3, "archived": False, "created_at": datetime.now(timezone.utc).isoformat()},
-    ]
-    await db.leadership.delete_many({})
-    await db.leadership.insert_many(leadership_members)
-    
-    # Coach info
-    coach_doc = {
-        "name": "Abrar Fahad Zaman",
-        "bio": "Expert debate coach with extensive experience in training national and international champions.",
-        "achievements": "1. Coached the Pre-worlds Champions of 2019 - Scholastica\n2. Grand Final Chair and Cap of BDC Digital Discourse 2020 - Bangladesh's first real time international debate tournament in English\n3. Worked as the Content Curator of Bitorko Matter Training after the former chair of BDC Fardeen Ameen passed the torch\n4. World Bank IFC TOT (online) acquired under Master Trainer Quazi M. Ahmed\n5. Trained under Don Sumdany, Coach Kamrul and Mashahed Hassan Simanta in their training programs\n6. Completed NLD which was a pioneering coaching program by Sajid Khandaker and Adi Mehedi Adi\n7. Coach of ULAB, Trainer of Scholastica Debate Team, Mentor at BRAC.",
-        "image_url": None,
-        "updated_at": datetime.now(timezone.utc).isoformat()
-    }
-    await db.coach_info.delete_many({})
-    await db.coach_info.insert_one(coach_doc)
-    
-    # Create courses with modules
-    await create_beginner_course()
-    await create_advanced_course()
-    await create_mentorship_course()
-
-async def create_beginner_course():
-    course_doc = {
-        "id": generate_id(),
-        "title": "Beginner Course",
-        "description": "This course is designed to introduce participants to the fundamentals of parliamentary debate formats, focusing on the Asian Parliamentary (AP) and British Parliamentary (BP) styles. It covers the roles of speakers, types of motions, and essential argumentation techniques.",
-        "outline": "Master the fundamentals of debate including AP & BP formats, speaker roles, motion analysis, framing, impact analysis, principled and utility arguments, and rebuttal techniques.",
-        "course_type": "beginner",
-        "archived": False,
-        "order_number": 1,
-        "created_at": datetime.now(timezone.utc).isoformat()
-    }
-    await db.courses.insert_one(course_doc)
-    
-    modules = [
-        {"title": "Introduction to AP & BP Debate Formats", "duration": "45 min", "video_link": "https://www.youtube.com/watch?v=example1", "order": 1},
-        {"title": "Roles of Speakers", "duration": "60 min", "video_link": "https://www.youtube.com/watch?v=example2", "order": 2},
-        {"title": "Types of Motion and Their Demand", "duration": "50 min", "video_link": "https://www.youtube.com/watch?v=example3", "order": 3},
-        {"title": "Debates to Watch (AP)", "duration": "90 min", "video_link": "https://www.youtube.com/playlist?list=PLJKCyUsDFuAX5wRnTm3ipGQ9WPvXYD6Cn", "order": 4},
-        {"title": "Framing", "duration": "55 min", "video_link": "https://www.youtube.com/watch?v=example5", "order": 5},
-        {"title": "Impact Analysis & Comparative", "duration": "50 min", "video_link": "https://www.youtube.com/watch?v=example6", "order": 6},
-        {"title": "Principal Argument", "duration": "60 min", "video_link": "https://www.youtube.com/watch?v=example7", "order": 7},
-        {"title": "Utility Argument", "duration": "55 min", "video_link": "https://www.youtube.com/watch?v=example8", "order": 8},
-        {"title": "Rebuttal", "duration": "65 min", "video_link": "https://www.youtube.com/watch?v=example9", "order": 9},
-    ]
-    
-    for mod in modules:
-        module_doc = {
-            "id": generate_id(),
-            "course_id": course_doc["id"],
-            "title": mod["title"],
-            "duration": mod["duration"],
-            "video_link": mod["video_link"],
-            "pdf_link": None,
-            "order_number": mod["order"],
-            "archived": False,
-            "created_at": datetime.now(timezone.utc).isoformat()
-        }
-        await db.modules.insert_one(module_doc)
-
-async def create_advanced_course():
-    course_doc = {
-        "id": generate_id(),
-        "title": "Advanced Course",
-        "description": "This course delves into more sophisticated debate strategies, focusing on advanced weighing techniques, effective use of evidence and illustrations, constructing extensions, and top-tier strategic thinking.",
-        "outline": "Develop advanced skills including sophisticated weighing, strategic illustration usage, lower house extensions, and top house strategies for competitive debate.",
-        "course_type": "advanced",
-        "archived": False,
-        "order_number": 2,
-        "created_at": datetime.now(timezone.utc).isoformat()
-    }
-    await db.courses.insert_one(course_doc)
-    
-    modules = [
-        {"title": "Weighing", "duration": "70 min", "video_link": "https://www.youtube.com/watch?v=example10", "order": 1},
-        {"title": "Illustration and How to Use Matter in Debate", "duration": "80 min", "video_link": "https://www.youtube.com/watch?v=example11", "order": 2},
-        {"title": "Extensions for Lower House and Connecting It", "duration": "75 min", "video_link": "https://www.youtube.com/watch?v=example12", "order": 3},
-        {"title": "Top House Strategies", "duration": "85 min", "video_link": "https://www.youtube.com/watch?v=example13", "order": 4},
-    ]
-    
-    for mod in modules:
-        module_doc = {
-            "id": generate_id(),
-            "course_id": course_doc["id"],
-            "title": mod["title"],
-            "duration": mod["duration"],
-            "video_link": mod["video_link"],
-            "pdf_link": None,
-            "order_number": mod["order"],
-            "archived": False,
-            "created_at": datetime.now(timezone.utc).isoformat()
-        }
-        await db.modules.insert_one(module_doc)
+    # Homepage, leadership, coach info, courses and modules ship as fixtures
+    await load_fixtures(
+        DEFAULT_FIXTURES_DIR,
+        replace=["homepage_content", "leadership", "coach_info"],
+        remap_ids=True
+    )
 
-async def create_mentorship_course():
-    course_doc = {
-        "id": generate_id(),
-        "title": "Mentorship with AFZ",
-        "description": "Exclusive mentorship program with Abrar Fahad Zaman, designed for advanced debaters seeking personalized coaching and elite-level training.",
-        "outline": "One-on-one mentorship sessions, personalized feedback, advanced strategy development, and preparation for international competitions.",
-        "course_type": "mentorship",
-        "archived": False,
-        "order_number": 3,
-        "created_at": datetime.now(timezone.utc).isoformat()
-    }
-    await db.courses.insert_one(course_doc)
+# =============== FIXTURES ===============
+
+# Load/export order; referenced collections come before the ones pointing at them.
+# "images" is left out: its documents describe blobs in the image store, which
+# fixtures don't carry, so content should reference images by URL instead.
+FIXTURE_COLLECTIONS = [
+    "users", "courses", "modules", "progress", "leadership", "announcements", "success_events",
+    "homepage_content", "coach_info", "alumni", "events", "membership_content", "system_setup"
+]
+# Fields holding the id of a document in another collection
+FIXTURE_REFERENCE_FIELDS = ("course_id", "module_id", "user_id")
+FIXTURE_TIMESTAMP_FIELDS = {
+    "homepage_content": "updated_at",
+    "coach_info": "updated_at",
+    "membership_content": "updated_at",
+}
+
+def _read_fixture_file(path: Path):
+    if path.suffix == ".ndjson":
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    else:
+        with open(path, encoding="utf-8") as f:
+            yield from json.load(f)
+
+async def load_fixtures(directory: Path, replace: List[str] = (), remap_ids: bool = False,
+                        batch_size: int = FIXTURE_BATCH_SIZE) -> dict:
+    """Load ``<collection>.json`` / ``<collection>.ndjson`` files from a directory.
+
+    Each collection is written with ordered ``insert_many`` batches. Collections
+    named in ``replace`` are emptied first. With ``remap_ids`` every ``id`` is
+    replaced by a fresh one and reference fields are rewritten to match, so the
+    same fixture can be loaded into many databases.
+    """
+    id_map = {}
+    loaded = {}
+    now = datetime.now(timezone.utc).isoformat()
+    for collection in FIXTURE_COLLECTIONS:
+        paths = [directory / f"{collection}.ndjson", directory / f"{collection}.json"]
+        path = next((p for p in paths if p.exists()), None)
+        if path is None:
+            continue
+        if collection in replace:
+            await db[collection].delete_many({})
+        
+        count = 0
+        batch = []
+        for doc in _read_fixture_file(path):
+            if remap_ids and "id" in doc:
+                id_map[doc["id"]] = doc["id"] = generate_id()
+            if remap_ids:
+                for field in FIXTURE_REFERENCE_FIELDS:
+                    if doc.get(field) in id_map:
+                        doc[field] = id_map[doc[field]]
+            doc.setdefault(FIXTURE_TIMESTAMP_FIELDS.get(collection, "created_at"), now)
+            if collection == "users" and "search_terms" not in doc:
+                doc["search_terms"] = user_search_terms(doc.get("full_name", ""), doc.get("email", ""))
+            batch.append(doc)
+            if len(batch) >= batch_size:
+                await db[collection].insert_many(batch, ordered=True)
+                count += len(batch)
+                batch = []
+        if batch:
+            await db[collection].insert_many(batch, ordered=True)
+            count += len(batch)
+        loaded[collection] = count
+    response_cache.clear()
+    return loaded
+
+async def export_fixtures(directory: Path, fmt: str = "ndjson", collections: Optional[List[str]] = None) -> dict:
+    """Write each collection to ``<collection>.<fmt>`` in a format ``load_fixtures`` reads."""
+    if fmt not in ("json", "ndjson"):
+        raise ValueError(f"Unknown fixture format: {fmt}")
+    directory.mkdir(parents=True, exist_ok=True)
+    exported = {}
+    for collection in collections or FIXTURE_COLLECTIONS:
+        count = 0
+        with open(directory / f"{collection}.{fmt}", "w", encoding="utf-8") as f:
+            if fmt == "json":
+                f.write("[")
+            async for doc in db[collection].find({}, {"_id": 0}):
+                line = json.dumps(doc, ensure_ascii=False, default=str)
+                if fmt == "json":
+                    f.write(("," if count else "") + "\n  " + line)
+                else:
+                    f.write(line + "\n")
+                count += 1
+            if fmt == "json":
+                f.write("\n]\n" if count else "]\n")
+        exported[collection] = count
+    return exported
 
 # =============== USER MANAGEMENT (ADMIN) ===============
 
-@api_router.get("/admin/users", response_model=List[UserResponse])
-async def get_all_users(
-    current_user: dict = Depends(require_admin),
+USER_SORT_FIELDS = ("created_at", "full_name", "email", "batch", "role", "status", "last_login")
+
+def user_filter_query(
     filter_status: Optional[str] = None,
-    filter_mentorship: Optional[bool] = None
-):
+    filter_mentorship: Optional[bool] = None,
+    filter_advanced: Optional[bool] = None,
+    search: Optional[str] = Query(None, max_length=100),
+    batch: Optional[str] = None,
+    role: Optional[str] = None,
+    last_login_from: Optional[datetime] = None,
+    last_login_to: Optional[datetime] = None
+) -> dict:
+    """Mongo query for the admin user table filters; shared with the export."""
     query = {"archived": False}
     if filter_status:
         query["status"] = filter_status
     if filter_mentorship is not None:
         query["mentorship_access"] = filter_mentorship
+    if filter_advanced is not None:
+        query["advanced_access"] = filter_advanced
+    if batch:
+        query["batch"] = batch
+    if role:
+        query["role"] = role
+    if search and search.split():
+        # Every word must prefix-match a name word or the email
+        query["$and"] = [{"search_terms": re.compile("^" + re.escape(word))} for word in search.lower().split()]
+    if last_login_from or last_login_to:
+        query["last_login"] = {}
+        if last_login_from:
+            query["last_login"]["$gte"] = progress_timestamp(last_login_from)
+        if last_login_to:
+            query["last_login"]["$lt"] = progress_timestamp(last_login_to)
+    return query
+
+@api_router.get("/admin/users", response_model=Union[List[UserResponse], CountedPage[UserResponse]])
+async def get_all_users(
+    current_user: dict = Depends(require_admin),
+    query: dict = Depends(user_filter_query),
+    sort_by: str = "created_at",
+    sort_order: str = Query("asc", pattern="^(asc|desc)$"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None
+):
+    if sort_by not in USER_SORT_FIELDS:
+        raise HTTPException(status_code=400, detail=f"sort_by must be one of: {', '.join(USER_SORT_FIELDS)}")
+    direction = 1 if sort_order == "asc" else -1
     
-    users = await db.users.find(query, {"_id": 0, "password_hash": 0}).to_list(1000)
-    return [UserResponse(**user) for user in users]
+    if limit or cursor:
+        (users, next_cursor), total = await asyncio.gather(
+            paginate(db.users, query, trusted_projection(UserResponse), sort_by, direction, limit, cursor),
+            db.users.count_documents(query)
+        )
+        rows = model_rows(users, UserResponse)
+        if FAST_RESPONSES:
+            return {"items": rows, "next_cursor": next_cursor, "total": total}
+        return CountedPage[UserResponse](items=rows, next_cursor=next_cursor, total=total)
+    
+    users = await db.users.find(query, trusted_projection(UserResponse)).sort([(sort_by, direction), ("id", direction)]).to_list(1000)
+    return model_rows(users, UserResponse)
 
 @api_router.patch("/admin/users/{user_id}/approve")
 async def approve_user(user_id: str, current_user: dict = Depends(require_admin)):
@@ -582,6 +1592,7 @@ async def approve_user(user_id: str, current_user: dict = Depends(require_admin)
         {"id": user_id},
         {"$set": {"status": "approved"}}
     )
+    user_cache.invalidate(user_id)
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail="User not found")
     return {"message": "User approved"}
@@ -592,6 +1603,7 @@ async def toggle_mentorship(user_id: str, grant: bool, current_user: dict = Depe
         {"id": user_id},
         {"$set": {"mentorship_access": grant}}
     )
+    user_cache.invalidate(user_id)
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail="User not found")
     return {"message": f"Mentorship access {'granted' if grant else 'revoked'}"}
@@ -602,6 +1614,7 @@ async def archive_user(user_id: str, current_user: dict = Depends(require_admin)
         {"id": user_id},
         {"$set": {"archived": True}}
     )
+    user_cache.invalidate(user_id)
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail="User not found")
     return {"message": "User archived"}
@@ -609,9 +1622,10 @@ async def archive_user(user_id: str, current_user: dict = Depends(require_admin)
 # =============== LEADERSHIP ===============
 
 @api_router.get("/leadership", response_model=List[LeadershipMember])
+@cached_public("leadership")
 async def get_leadership():
-    members = await db.leadership.find({"archived": False}, {"_id": 0}).sort("order_number", 1).to_list(1000)
-    return [LeadershipMember(**member) for member in members]
+    members = await db.leadership.find({"archived": False}, trusted_projection(LeadershipMember)).sort("order_number", 1).to_list(1000)
+    return model_rows(members, LeadershipMember)
 
 @api_router.post("/admin/leadership", response_model=LeadershipMember)
 async def create_leadership_member(member_data: LeadershipCreate, current_user: dict = Depends(require_admin)):
@@ -625,6 +1639,7 @@ async def create_leadership_member(member_data: LeadershipCreate, current_user:
         "created_at": datetime.now(timezone.utc).isoformat()
     }
     await db.leadership.insert_one(member_doc)
+    response_cache.bump("leadership")
     return LeadershipMember(**member_doc)
 
 @api_router.put("/admin/leadership/{member_id}", response_model=LeadershipMember)
@@ -638,6 +1653,7 @@ async def update_leadership_member(member_id: str, member_data: LeadershipCreate
             "order_number": member_data.order_number
         }}
     )
+    response_cache.bump("leadership")
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail="Member not found")
     
@@ -650,27 +1666,33 @@ async def archive_leadership_member(member_id: str, current_user: dict = Depends
         {"id": member_id},
         {"$set": {"archived": True}}
     )
+    response_cache.bump("leadership")
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail="Member not found")
     return {"message": "Member archived"}
 
 @api_router.post("/admin/leadership/reorder")
-async def reorder_leadership(order: List[dict], current_user: dict = Depends(require_admin)):
-    for item in order:
-        await db.leadership.update_one(
-            {"id": item["id"]},
-            {"$set": {"order_number": item["order_number"]}}
-        )
+async def reorder_leadership(order: List[ReorderItem], current_user: dict = Depends(require_admin)):
+    await reorder_ranked(db.leadership, order)
+    response_cache.bump("leadership")
     return {"message": "Order updated"}
 
+@api_router.post("/admin/leadership/{member_id}/move")
+async def move_leadership_member(member_id: str, move: MoveRequest, current_user: dict = Depends(require_admin)):
+    result = await move_ranked(db.leadership, member_id, move.after_id, [])
+    response_cache.bump("leadership")
+    return {"message": "Order updated", **result}
+
 # =============== COURSES ===============
 
 @api_router.get("/courses", response_model=List[Course])
+@cached_public("courses")
 async def get_courses():
-    courses = await db.courses.find({"archived": False}, {"_id": 0}).sort("order_number", 1).to_list(1000)
-    return [Course(**course) for course in courses]
+    courses = await db.courses.find({"archived": False}, trusted_projection(Course)).sort("order_number", 1).to_list(1000)
+    return model_rows(courses, Course)
 
 @api_router.get("/courses/{course_id}", response_model=Course)
+@cached_public("courses")
 async def get_course(course_id: str):
     course = await db.courses.find_one({"id": course_id, "archived": False}, {"_id": 0})
     if not course:
@@ -690,6 +1712,7 @@ async def create_course(course_data: CourseCreate, current_user: dict = Depends(
         "created_at": datetime.now(timezone.utc).isoformat()
     }
     await db.courses.insert_one(course_doc)
+    response_cache.bump("courses")
     return Course(**course_doc)
 
 @api_router.put("/admin/courses/{course_id}", response_model=Course)
@@ -704,6 +1727,7 @@ async def update_course(course_id: str, course_data: CourseCreate, current_user:
             "order_number": course_data.order_number
         }}
     )
+    response_cache.bump("courses")
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail="Course not found")
     
@@ -716,6 +1740,7 @@ async def archive_course(course_id: str, current_user: dict = Depends(require_ad
         {"id": course_id},
         {"$set": {"archived": True}}
     )
+    response_cache.bump("courses")
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail="Course not found")
     return {"message": "Course archived"}
@@ -723,13 +1748,42 @@ async def archive_course(course_id: str, current_user: dict = Depends(require_ad
 # =============== MODULES ===============
 
 @api_router.get("/courses/{course_id}/modules", response_model=List[Module])
+@cached_public("courses", "modules")
 async def get_course_modules(course_id: str):
     course = await db.courses.find_one({"id": course_id}, {"_id": 0})
     if not course:
         raise HTTPException(status_code=404, detail="Course not found")
     
-    modules = await db.modules.find({"course_id": course_id, "archived": False}, {"_id": 0}).sort("order_number", 1).to_list(1000)
-    return [Module(**module) for module in modules]
+    modules = await db.modules.find({"course_id": course_id, "archived": False}, trusted_projection(Module)).sort("order_number", 1).to_list(1000)
+    return model_rows(modules, Module)
+
+@api_router.get("/courses/{course_id}/detail", response_model=CourseDetail)
+async def get_course_detail(course_id: str, current_user: dict = Depends(get_current_user)):
+    # Course, modules and the caller's progress on this course's modules run concurrently
+    progress_pipeline = [
+        {"$match": {"user_id": current_user["id"]}},
+        {"$lookup": {"from": "modules", "localField": "module_id", "foreignField": "id", "as": "module"}},
+        {"$match": {"module.course_id": course_id, "module.archived": False}},
+        {"$project": {"_id": 0, "module": 0}}
+    ]
+    course, modules, progress = await asyncio.gather(
+        db.courses.find_one({"id": course_id, "archived": False}, {"_id": 0}),
+        db.modules.find({"course_id": course_id, "archived": False}, {"_id": 0}).sort("order_number", 1).to_list(None),
+        db.progress.aggregate(progress_pipeline).to_list(None)
+    )
+    if not course:
+        raise HTTPException(status_code=404, detail="Course not found")
+    
+    total_modules = len(modules)
+    completed_modules = len({p["module_id"] for p in progress if p.get("completed")})
+    return CourseDetail(
+        course=Course(**course),
+        modules=[Module(**module) for module in modules],
+        progress=[Progress(**p) for p in progress],
+        completed_modules=completed_modules,
+        total_modules=total_modules,
+        completion_percentage=round(completed_modules / total_modules * 100, 2) if total_modules else 0
+    )
 
 @api_router.post("/admin/modules", response_model=Module)
 async def create_module(module_data: ModuleCreate, current_user: dict = Depends(require_admin)):
@@ -745,6 +1799,7 @@ async def create_module(module_data: ModuleCreate, current_user: dict = Depends(
         "created_at": datetime.now(timezone.utc).isoformat()
     }
     await db.modules.insert_one(module_doc)
+    response_cache.bump("modules")
     return Module(**module_doc)
 
 @api_router.put("/admin/modules/{module_id}", response_model=Module)
@@ -759,6 +1814,7 @@ async def update_module(module_id: str, module_data: ModuleCreate, current_user:
             "order_number": module_data.order_number
         }}
     )
+    response_cache.bump("modules")
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail="Module not found")
     
@@ -771,64 +1827,162 @@ async def archive_module(module_id: str, current_user: dict = Depends(require_ad
         {"id": module_id},
         {"$set": {"archived": True}}
     )
+    response_cache.bump("modules")
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail="Module not found")
     return {"message": "Module archived"}
 
 @api_router.post("/admin/modules/reorder")
-async def reorder_modules(order: List[dict], current_user: dict = Depends(require_admin)):
-    for item in order:
-        await db.modules.update_one(
-            {"id": item["id"]},
-            {"$set": {"order_number": item["order_number"]}}
-        )
+async def reorder_modules(order: List[ReorderItem], current_user: dict = Depends(require_admin)):
+    await reorder_ranked(db.modules, order)
+    response_cache.bump("modules")
     return {"message": "Order updated"}
 
+@api_router.post("/admin/modules/{module_id}/move")
+async def move_module(module_id: str, move: MoveRequest, current_user: dict = Depends(require_admin)):
+    result = await move_ranked(db.modules, module_id, move.after_id, ["course_id"])
+    response_cache.bump("modules")
+    return {"message": "Order updated", **result}
+
 # =============== PROGRESS ===============
 
-@api_router.get("/progress", response_model=List[Progress])
-async def get_user_progress(current_user: dict = Depends(get_current_user)):
-    progress_list = await db.progress.find({"user_id": current_user["id"]}, {"_id": 0}).to_list(1000)
-    return [Progress(**p) for p in progress_list]
+@api_router.get("/progress", response_model=Union[List[Progress], Page[Progress]])
+async def get_user_progress(
+    current_user: dict = Depends(get_current_user),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None
+):
+    if limit or cursor:
+        progress_list, next_cursor = await paginate(db.progress, {"user_id": current_user["id"]}, trusted_projection(Progress), "id", 1, limit, cursor)
+        return page_of(model_rows(progress_list, Progress), Progress, next_cursor)
+    
+    progress_list = await db.progress.find({"user_id": current_user["id"]}, trusted_projection(Progress)).to_list(1000)
+    return model_rows(progress_list, Progress)
 
 @api_router.post("/progress", response_model=Progress)
 async def update_progress(progress_data: ProgressUpdate, current_user: dict = Depends(require_approved)):
-    # Check if progress exists
-    existing = await db.progress.find_one({
-        "user_id": current_user["id"],
-        "module_id": progress_data.module_id
-    }, {"_id": 0})
+    now = progress_timestamp()
+    # Single atomic upsert, relying on the unique (user_id, module_id) index
+    for attempt in range(2):
+        try:
+            progress = await db.progress.find_one_and_update(
+                {"user_id": current_user["id"], "module_id": progress_data.module_id},
+                {
+                    "$set": {
+                        "completed": progress_data.completed,
+                        "completed_at": now if progress_data.completed else None,
+                        "updated_at": now
+                    },
+                    "$setOnInsert": {"id": generate_id()}
+                },
+                projection={"_id": 0},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+            return Progress(**progress)
+        except DuplicateKeyError:
+            # A concurrent request inserted the row first; the retry updates it
+            if attempt:
+                raise
+
+@api_router.post("/progress/batch", response_model=List[ProgressBatchResult])
+async def sync_progress(items: List[ProgressBatchItem], current_user: dict = Depends(require_approved)):
+    if len(items) > MAX_PROGRESS_BATCH:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_PROGRESS_BATCH} items per batch")
     
-    if existing:
-        # Update existing
-        update_data = {
-            "completed": progress_data.completed,
-            "completed_at": datetime.now(timezone.utc).isoformat() if progress_data.completed else None
-        }
-        await db.progress.update_one(
-            {"id": existing["id"]},
-            {"$set": update_data}
-        )
-        existing.update(update_data)
-        return Progress(**existing)
-    else:
-        # Create new
-        progress_doc = {
-            "id": generate_id(),
-            "user_id": current_user["id"],
-            "module_id": progress_data.module_id,
-            "completed": progress_data.completed,
-            "completed_at": datetime.now(timezone.utc).isoformat() if progress_data.completed else None
-        }
-        await db.progress.insert_one(progress_doc)
-        return Progress(**progress_doc)
+    # Keep only the latest tick per module; earlier ones in the same batch lose.
+    # Client clocks running ahead are clamped so they cannot pin a row forever.
+    now = progress_timestamp()
+    statuses = ["stale"] * len(items)
+    latest = {}
+    for index, item in enumerate(items):
+        timestamp = min(progress_timestamp(item.updated_at), now)
+        if item.module_id not in latest or timestamp >= latest[item.module_id][1]:
+            latest[item.module_id] = (index, timestamp)
+    
+    operations = []
+    op_indexes = []
+    for module_id, (index, timestamp) in latest.items():
+        item = items[index]
+        # A stored row with a newer timestamp fails the filter, and the upsert
+        # then trips the unique index instead of overwriting it
+        operations.append(UpdateOne(
+            {
+                "user_id": current_user["id"],
+                "module_id": module_id,
+                "$or": [{"updated_at": {"$lt": timestamp}}, {"updated_at": None}]
+            },
+            {
+                "$set": {
+                    "completed": item.completed,
+                    "completed_at": timestamp if item.completed else None,
+                    "updated_at": timestamp
+                },
+                "$setOnInsert": {"id": generate_id()}
+            },
+            upsert=True
+        ))
+        op_indexes.append(index)
+        statuses[index] = "applied"
+    
+    # A duplicate key means the row exists: either it is newer, or a concurrent
+    # request inserted it after our filter ran. Like update_progress, retry
+    # once so the filter compares against the stored timestamp; a second
+    # duplicate key means the stored row is at least as new.
+    pending = list(range(len(operations)))
+    for attempt in range(2):
+        if not pending:
+            break
+        try:
+            await db.progress.bulk_write([operations[i] for i in pending], ordered=False)
+            break
+        except BulkWriteError as e:
+            retry = []
+            for error in e.details.get("writeErrors", []):
+                position = pending[error["index"]]
+                if error["code"] == 11000 and not attempt:
+                    retry.append(position)
+                else:
+                    statuses[op_indexes[position]] = "stale" if error["code"] == 11000 else "error"
+            pending = retry
+    
+    current = await db.progress.find(
+        {"user_id": current_user["id"], "module_id": {"$in": list(latest)}},
+        {"_id": 0}
+    ).to_list(None)
+    by_module = {p["module_id"]: Progress(**p) for p in current}
+    return [
+        ProgressBatchResult(module_id=item.module_id, status=statuses[index], progress=by_module.get(item.module_id))
+        for index, item in enumerate(items)
+    ]
 
 # =============== ANNOUNCEMENTS ===============
 
-@api_router.get("/announcements", response_model=List[Announcement])
-async def get_announcements():
-    announcements = await db.announcements.find({"archived": False}, {"_id": 0}).sort("created_at", -1).to_list(1000)
-    return [Announcement(**ann) for ann in announcements]
+@api_router.get("/announcements", response_model=Union[List[Announcement], Page[Announcement]])
+@cached_public("announcements")
+async def get_announcements(
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    view: Optional[str] = None,
+    fields: Optional[str] = None
+):
+    selected = select_fields(Announcement, "announcements", view, fields)
+    projection = view_projection(Announcement, selected, "created_at")
+    thumbnails = fields is None and view == "summary"
+    if limit or cursor:
+        announcements, next_cursor = await paginate(db.announcements, {"archived": False}, projection, "created_at", -1, limit, cursor)
+        return page_of(view_rows(announcements, Announcement, selected, thumbnails), Announcement, next_cursor)
+    
+    announcements = await db.announcements.find({"archived": False}, projection).sort("created_at", -1).to_list(1000)
+    return view_rows(announcements, Announcement, selected, thumbnails)
+
+@api_router.get("/announcements/{announcement_id}", response_model=Announcement)
+@cached_public("announcements")
+async def get_announcement(announcement_id: str):
+    doc = await db.announcements.find_one({"id": announcement_id, "archived": False}, trusted_projection(Announcement))
+    if not doc:
+        raise HTTPException(status_code=404, detail="Announcement not found")
+    return model_rows([doc], Announcement)[0]
 
 @api_router.post("/admin/announcements", response_model=Announcement)
 async def create_announcement(announcement_data: AnnouncementCreate, current_user: dict = Depends(require_admin)):
@@ -841,6 +1995,7 @@ async def create_announcement(announcement_data: AnnouncementCreate, current_use
         "created_at": datetime.now(timezone.utc).isoformat()
     }
     await db.announcements.insert_one(ann_doc)
+    response_cache.bump("announcements")
     return Announcement(**ann_doc)
 
 @api_router.put("/admin/announcements/{announcement_id}", response_model=Announcement)
@@ -853,6 +2008,7 @@ async def update_announcement(announcement_id: str, announcement_data: Announcem
             "image_url": announcement_data.image_url
         }}
     )
+    response_cache.bump("announcements")
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail="Announcement not found")
     
@@ -865,16 +2021,38 @@ async def archive_announcement(announcement_id: str, current_user: dict = Depend
         {"id": announcement_id},
         {"$set": {"archived": True}}
     )
+    response_cache.bump("announcements")
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail="Announcement not found")
     return {"message": "Announcement archived"}
 
 # =============== SUCCESS EVENTS ===============
 
-@api_router.get("/success-events", response_model=List[SuccessEvent])
-async def get_success_events():
-    events = await db.success_events.find({"archived": False}, {"_id": 0}).sort("date", -1).to_list(1000)
-    return [SuccessEvent(**event) for event in events]
+@api_router.get("/success-events", response_model=Union[List[SuccessEvent], Page[SuccessEvent]])
+@cached_public("success_events")
+async def get_success_events(
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    view: Optional[str] = None,
+    fields: Optional[str] = None
+):
+    selected = select_fields(SuccessEvent, "success_events", view, fields)
+    projection = view_projection(SuccessEvent, selected, "date")
+    thumbnails = fields is None and view == "summary"
+    if limit or cursor:
+        events, next_cursor = await paginate(db.success_events, {"archived": False}, projection, "date", -1, limit, cursor)
+        return page_of(view_rows(events, SuccessEvent, selected, thumbnails), SuccessEvent, next_cursor)
+    
+    events = await db.success_events.find({"archived": False}, projection).sort("date", -1).to_list(1000)
+    return view_rows(events, SuccessEvent, selected, thumbnails)
+
+@api_router.get("/success-events/{event_id}", response_model=SuccessEvent)
+@cached_public("success_events")
+async def get_success_event(event_id: str):
+    doc = await db.success_events.find_one({"id": event_id, "archived": False}, trusted_projection(SuccessEvent))
+    if not doc:
+        raise HTTPException(status_code=404, detail="Success event not found")
+    return model_rows([doc], SuccessEvent)[0]
 
 @api_router.post("/admin/success-events", response_model=SuccessEvent)
 async def create_success_event(event_data: SuccessEventCreate, current_user: dict = Depends(require_admin)):
@@ -888,6 +2066,7 @@ async def create_success_event(event_data: SuccessEventCreate, current_user: dic
         "created_at": datetime.now(timezone.utc).isoformat()
     }
     await db.success_events.insert_one(event_doc)
+    response_cache.bump("success_events")
     return SuccessEvent(**event_doc)
 
 @api_router.put("/admin/success-events/{event_id}", response_model=SuccessEvent)
@@ -901,6 +2080,7 @@ async def update_success_event(event_id: str, event_data: SuccessEventCreate, cu
             "date": event_data.date
         }}
     )
+    response_cache.bump("success_events")
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail="Event not found")
     
@@ -913,6 +2093,7 @@ async def archive_success_event(event_id: str, current_user: dict = Depends(requ
         {"id": event_id},
         {"$set": {"archived": True}}
     )
+    response_cache.bump("success_events")
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail="Event not found")
     return {"message": "Event archived"}
@@ -920,9 +2101,10 @@ async def archive_success_event(event_id: str, current_user: dict = Depends(requ
 # =============== HOMEPAGE CONTENT ===============
 
 @api_router.get("/homepage-content", response_model=List[HomepageContent])
+@cached_public("homepage_content")
 async def get_homepage_content():
-    content = await db.homepage_content.find({}, {"_id": 0}).to_list(1000)
-    return [HomepageContent(**item) for item in content]
+    content = await db.homepage_content.find({}, trusted_projection(HomepageContent)).to_list(1000)
+    return model_rows(content, HomepageContent)
 
 @api_router.put("/admin/homepage-content", response_model=HomepageContent)
 async def update_homepage_content(content_data: HomepageContentUpdate, current_user: dict = Depends(require_admin)):
@@ -935,12 +2117,14 @@ async def update_homepage_content(content_data: HomepageContentUpdate, current_u
         upsert=True
     )
     
+    response_cache.bump("homepage_content")
     content = await db.homepage_content.find_one({"section": content_data.section}, {"_id": 0})
     return HomepageContent(**content)
 
 # =============== COACH INFO ===============
 
 @api_router.get("/coach-info", response_model=CoachInfo)
+@cached_public("coach_info")
 async def get_coach_info():
     coach = await db.coach_info.find_one({}, {"_id": 0})
     if not coach:
@@ -958,54 +2142,93 @@ async def update_coach_info(coach_data: CoachInfoUpdate, current_user: dict = De
         "updated_at": datetime.now(timezone.utc).isoformat()
     }
     await db.coach_info.insert_one(coach_doc)
+    response_cache.bump("coach_info")
     return CoachInfo(**coach_doc)
 
 # =============== ANALYTICS ===============
 
-@api_router.get("/admin/analytics")
-async def get_analytics(current_user: dict = Depends(require_admin)):
+async def compute_course_stats(courses: List[dict]) -> List[dict]:
+    """Completion stats for the given courses in a fixed number of round-trips.
+
+    Progress rows are joined to their module server-side and folded down to
+    one row per (course, completed module count), so the work done in Python
+    is bounded by courses x modules rather than by the number of students.
+    """
+    course_ids = [course["id"] for course in courses]
+    modules = await db.modules.find(
+        {"course_id": {"$in": course_ids}, "archived": False},
+        {"_id": 0, "id": 1, "course_id": 1}
+    ).to_list(None)
+
+    total_modules = {}
+    for module in modules:
+        total_modules[module["course_id"]] = total_modules.get(module["course_id"], 0) + 1
+
+    pipeline = [
+        {"$match": {"module_id": {"$in": [m["id"] for m in modules]}}},
+        {"$lookup": {
+            "from": "modules",
+            "localField": "module_id",
+            "foreignField": "id",
+            "as": "module"
+        }},
+        {"$unwind": "$module"},
+        {"$match": {"module.archived": False, "module.course_id": {"$in": course_ids}}},
+        # One row per enrolled user and course with their completed module count
+        {"$group": {
+            "_id": {"course_id": "$module.course_id", "user_id": "$user_id"},
+            "completed_modules": {"$sum": {"$cond": [{"$eq": ["$completed", True]}, 1, 0]}}
+        }},
+        # Histogram of completed module counts per course
+        {"$group": {
+            "_id": {"course_id": "$_id.course_id", "completed_modules": "$completed_modules"},
+            "users": {"$sum": 1}
+        }}
+    ]
+
+    enrolled = {}
+    completed = {}
+    if modules:
+        async for row in db.progress.aggregate(pipeline):
+            course_id = row["_id"]["course_id"]
+            enrolled[course_id] = enrolled.get(course_id, 0) + row["users"]
+            if row["_id"]["completed_modules"] == total_modules[course_id]:
+                completed[course_id] = completed.get(course_id, 0) + row["users"]
+
+    course_stats = []
+    for course in courses:
+        if total_modules.get(course["id"], 0) == 0:
+            continue
+        enrolled_count = enrolled.get(course["id"], 0)
+        completed_count = completed.get(course["id"], 0)
+        completion_rate = (completed_count / enrolled_count * 100) if enrolled_count else 0
+        course_stats.append({
+            "course_id": course["id"],
+            "course_title": course["title"],
+            "enrolled": enrolled_count,
+            "completed": completed_count,
+            "completion_rate": round(completion_rate, 2)
+        })
+    return course_stats
+
+@api_router.get("/admin/analytics", dependencies=[Depends(require_admin), admit("analytics")])
+async def get_analytics():
     total_users = await db.users.count_documents({"archived": False})
     approved_users = await db.users.count_documents({"status": "approved", "archived": False})
     pending_users = await db.users.count_documents({"status": "pending", "archived": False})
     mentorship_users = await db.users.count_documents({"mentorship_access": True, "archived": False})
     
     # Active users (logged in within last 30 days)
-    thirty_days_ago = (datetime.now(timezone.utc) - timedelta(days=30)).isoformat()
+    thirty_days_ago = progress_timestamp(datetime.now(timezone.utc) - timedelta(days=30))
     active_users = await db.users.count_documents({
         "last_login": {"$gte": thirty_days_ago},
         "archived": False
     })
     
     # Course completion rates
-    courses = await db.courses.find({"archived": False}, {"_id": 0}).to_list(1000)
-    course_stats = []
-    for course in courses:
-        modules = await db.modules.find({"course_id": course["id"], "archived": False}).to_list(1000)
-        total_modules = len(modules)
-        
-        if total_modules > 0:
-            # Get users who completed all modules
-            completed_count = 0
-            enrolled_users = await db.progress.distinct("user_id", {"module_id": {"$in": [m["id"] for m in modules]}})
-            
-            for user_id in enrolled_users:
-                user_progress = await db.progress.count_documents({
-                    "user_id": user_id,
-                    "module_id": {"$in": [m["id"] for m in modules]},
-                    "completed": True
-                })
-                if user_progress == total_modules:
-                    completed_count += 1
-            
-            completion_rate = (completed_count / len(enrolled_users) * 100) if enrolled_users else 0
-            course_stats.append({
-                "course_id": course["id"],
-                "course_title": course["title"],
-                "enrolled": len(enrolled_users),
-                "completed": completed_count,
-                "completion_rate": round(completion_rate, 2)
-            })
-    
+    courses = await db.courses.find({"archived": False}, {"_id": 0, "id": 1, "title": 1}).to_list(None)
+    course_stats = await compute_course_stats(courses)
+
     return {
         "total_users": total_users,
         "approved_users": approved_users,
@@ -1015,26 +2238,485 @@ async def get_analytics(current_user: dict = Depends(require_admin)):
         "course_stats": course_stats
     }
 
-# =============== IMAGE UPLOAD ===============
+@api_router.get("/admin/cache-stats")
+async def get_cache_stats(current_user: dict = Depends(require_admin)):
+    return {"user_cache": user_cache.stats(), "response_cache": response_cache.stats(), "sync": cache_sync.stats()}
+
+@api_router.get("/admin/password-pool-stats")
+async def get_password_pool_stats(current_user: dict = Depends(require_admin)):
+    return password_pool.stats()
+
+@api_router.get("/admin/admission-stats")
+async def get_admission_stats(current_user: dict = Depends(require_admin)):
+    return {name: gate.stats() for name, gate in admission_gates.items()}
+
+# =============== EXPORTS ===============
+
+USER_EXPORT_COLUMNS = list(UserResponse.model_fields)
+PROGRESS_EXPORT_COLUMNS = list(Progress.model_fields)
+# Extra progress columns added by ?include=module / ?include=user
+PROGRESS_EXPORT_JOINS = {
+    "module": ("modules", "module_id", {"module_title": "title", "course_id": "course_id"}),
+    "user": ("users", "user_id", {"user_email": "email", "user_full_name": "full_name"}),
+}
+
+def csv_cell(value):
+    # Keep spreadsheet apps from evaluating user-entered text as a formula
+    if isinstance(value, str) and value[:1] in ("=", "+", "-", "@", "\t", "\r"):
+        return "'" + value
+    return value
+
+async def stream_rows(rows: AsyncIterator[dict], columns: List[str], fmt: str) -> AsyncIterator[bytes]:
+    """Encode rows as CSV (with a header) or NDJSON, yielding ~EXPORT_CHUNK_BYTES
+    at a time so memory stays flat however many rows the cursor returns."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if fmt == "csv":
+        writer.writerow(columns)
+    async for row in rows:
+        if fmt == "csv":
+            writer.writerow([csv_cell(row.get(column)) for column in columns])
+        else:
+            buffer.write(encode_json({column: row.get(column) for column in columns}).decode("utf-8") + "\n")
+        if buffer.tell() >= EXPORT_CHUNK_BYTES:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+async def release_after(chunks: AsyncIterator[bytes], release) -> AsyncIterator[bytes]:
+    try:
+        async for chunk in chunks:
+            yield chunk
+    finally:
+        release()
+
+async def export_response(rows: AsyncIterator[dict], columns: List[str], fmt: str, name: str) -> StreamingResponse:
+    gate = admission_gates["export"]
+    started = await gate.acquire()
+    released = False
+
+    def release():
+        # An export holds its slot until the stream ends. The generator never
+        # starts if the client disconnects first, so the background task (run
+        # after the response, disconnects included) releases it too.
+        nonlocal released
+        if not released:
+            released = True
+            gate.release(started)
+
+    media_type = "text/csv; charset=utf-8" if fmt == "csv" else "application/x-ndjson"
+    filename = f"{name}-{datetime.now(timezone.utc):%Y%m%d-%H%M%S}.{fmt}"
+    return StreamingResponse(
+        release_after(stream_rows(rows, columns, fmt), release),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"', "Cache-Control": "no-store"},
+        background=BackgroundTask(release)
+    )
 
-@api_router.post("/admin/upload-image")
-async def upload_image(file: UploadFile = File(...), current_user: dict = Depends(require_admin)):
-    # Read file content
-    content = await file.read()
+@api_router.get("/admin/export/users")
+async def export_users(
+    current_user: dict = Depends(require_admin),
+    query: dict = Depends(user_filter_query),
+    fmt: str = Query("csv", alias="format", pattern="^(csv|ndjson)$")
+):
+    rows = db.users.find(query, trusted_projection(UserResponse)).sort("created_at", 1).batch_size(EXPORT_BATCH_SIZE)
+    return await export_response(rows, USER_EXPORT_COLUMNS, fmt, "users")
+
+@api_router.get("/admin/export/progress")
+async def export_progress(
+    current_user: dict = Depends(require_admin),
+    course_id: Optional[str] = None,
+    user_id: Optional[str] = None,
+    include: List[str] = Query([]),
+    fmt: str = Query("csv", alias="format", pattern="^(csv|ndjson)$")
+):
+    unknown = [name for name in include if name not in PROGRESS_EXPORT_JOINS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown include: {', '.join(unknown)}")
     
-    # Convert to base64 for storage (simple approach for MVP)
-    base64_data = base64.b64encode(content).decode('utf-8')
-    file_extension = file.filename.split('.')[-1] if '.' in file.filename else 'jpg'
-    data_url = f"data:image/{file_extension};base64,{base64_data}"
+    match = {}
+    if user_id:
+        match["user_id"] = user_id
+    if course_id:
+        module_ids = await db.modules.distinct("id", {"course_id": course_id})
+        match["module_id"] = {"$in": module_ids}
     
-    return {"url": data_url}
+    # Joins run per document on the server against the unique id indexes
+    pipeline = [{"$match": match}]
+    columns = list(PROGRESS_EXPORT_COLUMNS)
+    for name in dict.fromkeys(include):
+        collection, local_field, fields = PROGRESS_EXPORT_JOINS[name]
+        pipeline += [
+            {"$lookup": {"from": collection, "localField": local_field, "foreignField": "id", "as": name}},
+            {"$addFields": {column: {"$arrayElemAt": [f"${name}.{field}", 0]} for column, field in fields.items()}},
+        ]
+        columns += list(fields)
+    pipeline.append({"$project": {"_id": 0, **{column: 1 for column in columns}}})
+    rows = db.progress.aggregate(pipeline, batchSize=EXPORT_BATCH_SIZE)
+    return await export_response(rows, columns, fmt, "progress")
+
+# =============== IMAGE STORE ===============
+
+# Collections and fields that hold uploaded image URLs
+IMAGE_URL_FIELDS = [
+    ("leadership", "photo_url"),
+    ("courses", "photo_url"),
+    ("alumni", "photo_url"),
+    ("events", "photo_url"),
+    ("membership_content", "photo_url"),
+    ("announcements", "image_url"),
+    ("success_events", "image_url"),
+    ("coach_info", "image_url"),
+]
+
+class FilesystemImageStore:
+    """Stores image bytes under ``root/<first two hex chars>/<sha256>``."""
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    def _path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+
+    async def save(self, chunks: AsyncIterator[bytes]):
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix=".upload-")
+        hasher = hashlib.sha256()
+        size = 0
+        try:
+            with os.fdopen(fd, "wb") as out:
+                async for chunk in chunks:
+                    hasher.update(chunk)
+                    size += len(chunk)
+                    await asyncio.to_thread(out.write, chunk)
+            digest = hasher.hexdigest()
+            path = self._path(digest)
+            path.parent.mkdir(exist_ok=True)
+            # Same digest means same bytes, so replacing an existing blob is harmless
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        return digest, size
+
+    async def iter_range(self, digest: str, start: int, end: int) -> AsyncIterator[bytes]:
+        with open(self._path(digest), "rb") as blob:
+            blob.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = await asyncio.to_thread(blob.read, min(IMAGE_CHUNK_BYTES, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+class GridFSImageStore:
+    """Stores image bytes in a GridFS bucket, one file per sha256 digest."""
+
+    def __init__(self, database):
+        self.database = database
+        self.bucket = AsyncIOMotorGridFSBucket(database, bucket_name=IMAGE_GRIDFS_BUCKET)
+
+    async def save(self, chunks: AsyncIterator[bytes]):
+        hasher = hashlib.sha256()
+        size = 0
+        stream = self.bucket.open_upload_stream(".pending", chunk_size_bytes=IMAGE_CHUNK_BYTES)
+        try:
+            async for chunk in chunks:
+                hasher.update(chunk)
+                size += len(chunk)
+                await stream.write(chunk)
+        except BaseException:
+            await stream.abort()
+            raise
+        await stream.close()
+
+        digest = hasher.hexdigest()
+        existing = await self.database[f"{IMAGE_GRIDFS_BUCKET}.files"].find_one({"filename": digest}, {"_id": 1})
+        if existing:
+            await self.bucket.delete(stream._id)
+        else:
+            await self.bucket.rename(stream._id, digest)
+        return digest, size
+
+    async def iter_range(self, digest: str, start: int, end: int) -> AsyncIterator[bytes]:
+        grid_out = await self.bucket.open_download_stream_by_name(digest)
+        grid_out.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = await grid_out.read(min(IMAGE_CHUNK_BYTES, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+_image_store = None
+
+def get_image_store():
+    global _image_store
+    if _image_store is None:
+        if IMAGE_STORE_BACKEND == "gridfs":
+            if STORAGE_ENGINE != "mongo":
+                raise ValueError("The gridfs image store requires STORAGE_ENGINE=mongo")
+            _image_store = GridFSImageStore(db)
+        elif IMAGE_STORE_BACKEND == "filesystem":
+            _image_store = FilesystemImageStore(IMAGE_STORE_DIR)
+        else:
+            raise ValueError(f"Unknown image store backend: {IMAGE_STORE_BACKEND}")
+    return _image_store
+
+def image_url(digest: str, request: Request) -> str:
+    # Stored in content documents, so absolute: the frontend may be served
+    # from another origin than the API
+    base_url = IMAGE_PUBLIC_BASE_URL or str(request.base_url)
+    return f"{base_url.rstrip('/')}{IMAGE_PATH}{digest}"
+
+def guess_image_type(extension: str) -> str:
+    return mimetypes.guess_type(f"image.{extension}")[0] or f"image/{extension}"
+
+def render_image_variants(data: bytes, widths: List[int], image_format: str, quality: int) -> List[dict]:
+    """Decode an image and encode a downscaled copy for each width.
+
+    Runs in the image worker pool. Widths at or above the source width are
+    skipped so images are never upscaled.
+    """
+    with Image.open(io.BytesIO(data)) as source:
+        if getattr(source, "is_animated", False):
+            return []
+        image = ImageOps.exif_transpose(source)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "A" in image.getbands() or "transparency" in image.info else "RGB")
+        variants = []
+        for width in widths:
+            if width >= image.width:
+                continue
+            height = max(1, round(image.height * width / image.width))
+            resized = image.resize((width, height), Image.Resampling.LANCZOS)
+            out = io.BytesIO()
+            options = {"quality": quality}
+            if image_format == "WEBP":
+                options["method"] = 4
+            elif image_format == "JPEG":
+                resized = resized.convert("RGB")
+                options["optimize"] = True
+            resized.save(out, format=image_format, **options)
+            variants.append({"width": width, "height": height, "data": out.getvalue()})
+        return variants
+
+async def _save_image(chunks: AsyncIterator[bytes], content_type: str, extra: Optional[dict] = None):
+    digest, size = await get_image_store().save(chunks)
+    meta = {
+        "id": digest,
+        "content_type": content_type,
+        "size": size,
+        "created_at": datetime.now(timezone.utc).isoformat()
+    }
+    meta.update(extra or {})
+    await db.images.update_one({"id": digest}, {"$setOnInsert": meta}, upsert=True)
+    return digest, size
+
+async def create_image_variants(digest: str, size: int):
+    """Render and store the configured width variants of a stored image."""
+    chunks = [chunk async for chunk in get_image_store().iter_range(digest, 0, size - 1)]
+    try:
+        rendered = await image_pool.run(
+            render_image_variants, b"".join(chunks), IMAGE_VARIANT_WIDTHS, IMAGE_VARIANT_FORMAT, IMAGE_VARIANT_QUALITY
+        )
+    except Exception as e:
+        logger.warning("Could not render variants for image %s: %s", digest, e)
+        rendered = []
+    
+    content_type = guess_image_type(IMAGE_VARIANT_FORMAT.lower())
+    variants = []
+    for variant in rendered:
+        variant_digest, variant_size = await _save_image(
+            _iter_bytes(variant["data"]), content_type, {"variant_of": digest, "width": variant["width"]}
+        )
+        variants.append({
+            "width": variant["width"],
+            "height": variant["height"],
+            "digest": variant_digest,
+            "content_type": content_type,
+            "size": variant_size
+        })
+    await db.images.update_one({"id": digest}, {"$set": {"variants": variants}})
+    return variants
+
+async def store_image(chunks: AsyncIterator[bytes], content_type: str) -> str:
+    digest, size = await _save_image(chunks, content_type)
+    existing = await db.images.find_one({"id": digest}, {"_id": 0, "variants": 1})
+    if "variants" not in existing and content_type != "image/svg+xml":
+        await create_image_variants(digest, size)
+    return digest
+
+def select_variant(meta: dict, width: int) -> Optional[dict]:
+    """Smallest stored variant at least ``width`` wide, or None for the original."""
+    for variant in sorted(meta.get("variants") or [], key=lambda v: v["width"]):
+        if variant["width"] >= width:
+            return variant
+    return None
+
+async def _iter_upload(file: UploadFile) -> AsyncIterator[bytes]:
+    total = 0
+    while True:
+        chunk = await file.read(IMAGE_CHUNK_BYTES)
+        if not chunk:
+            break
+        total += len(chunk)
+        if total > IMAGE_MAX_BYTES:
+            raise HTTPException(status_code=413, detail="Image too large")
+        yield chunk
+
+async def _iter_bytes(data: bytes) -> AsyncIterator[bytes]:
+    for offset in range(0, len(data), IMAGE_CHUNK_BYTES):
+        yield data[offset:offset + IMAGE_CHUNK_BYTES]
+
+def parse_byte_range(header: Optional[str], size: int):
+    """Return an inclusive (start, end) for a single ``bytes=`` range.
+
+    Returns None when the header is absent or not something we honour (the
+    full body is served instead) and raises 416 when it cannot be satisfied.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    start_text, _, end_text = header[len("bytes="):].strip().partition("-")
+    try:
+        if start_text == "":
+            suffix = int(end_text)
+            start, end = max(0, size - suffix), size - 1
+            if suffix == 0:
+                start = size
+        else:
+            start = int(start_text)
+            end = min(int(end_text), size - 1) if end_text else size - 1
+    except ValueError:
+        return None
+    if start >= size or start > end:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"}
+        )
+    return start, end
+
+@api_router.post("/admin/upload-image", dependencies=[Depends(require_admin), admit("image")])
+async def upload_image(request: Request, file: UploadFile = File(...)):
+    if file.content_type and file.content_type.startswith("image/"):
+        content_type = file.content_type
+    else:
+        file_extension = file.filename.split('.')[-1] if file.filename and '.' in file.filename else 'jpg'
+        content_type = guess_image_type(file_extension.lower())
+    
+    digest = await store_image(_iter_upload(file), content_type)
+    meta = await db.images.find_one({"id": digest}, {"_id": 0, "variants": 1})
+    url = image_url(digest, request)
+    return {
+        "url": url,
+        "variants": [
+            {"width": v["width"], "url": f"{url}?w={v['width']}"}
+            for v in meta.get("variants", [])
+        ]
+    }
+
+@api_router.get("/images/{digest}")
+async def get_image(digest: str, request: Request, w: Optional[int] = Query(None, ge=1)):
+    if len(digest) != 64 or any(c not in "0123456789abcdef" for c in digest):
+        raise HTTPException(status_code=404, detail="Image not found")
+    meta = await db.images.find_one({"id": digest}, {"_id": 0})
+    if not meta:
+        raise HTTPException(status_code=404, detail="Image not found")
+    
+    # Serve the smallest variant that covers the requested width
+    variant = select_variant(meta, w) if w else None
+    if variant:
+        digest = variant["digest"]
+        meta = variant
+    
+    headers = {
+        "ETag": f'"{digest}"',
+        "Cache-Control": "public, max-age=31536000, immutable",
+        "Accept-Ranges": "bytes",
+        "X-Content-Type-Options": "nosniff",
+        "Content-Security-Policy": "default-src 'none'; style-src 'unsafe-inline'; sandbox"
+    }
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (if_none_match.strip() == "*" or f'"{digest}"' in if_none_match):
+        return Response(status_code=304, headers=headers)
+    
+    size = meta["size"]
+    byte_range = parse_byte_range(request.headers.get("range"), size)
+    if byte_range is None:
+        start, end, status_code = 0, size - 1, 200
+    else:
+        start, end = byte_range
+        status_code = 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(max(0, end - start + 1))
+    
+    return StreamingResponse(
+        get_image_store().iter_range(digest, start, end),
+        status_code=status_code,
+        media_type=meta["content_type"],
+        headers=headers
+    )
+
+@api_router.post("/admin/images/migrate-inline", dependencies=[Depends(require_admin), admit("image")])
+async def migrate_inline_images(request: Request):
+    """Move base64 ``data:`` URLs out of content documents into the image store."""
+    migrated = {}
+    for collection, field in IMAGE_URL_FIELDS:
+        count = 0
+        cursor = db[collection].find({field: {"$regex": "^data:"}}, {"_id": 1, field: 1})
+        async for doc in cursor:
+            header, _, payload = doc[field].partition(",")
+            mime = header[len("data:"):].split(";")[0]
+            if mime.startswith("image/"):
+                content_type = guess_image_type(mime[len("image/"):])
+            else:
+                content_type = mime or "image/jpeg"
+            try:
+                data = base64.b64decode(payload)
+            except ValueError:
+                logger.warning("Skipping undecodable inline image in %s.%s (%s)", collection, field, doc["_id"])
+                continue
+            digest = await store_image(_iter_bytes(data), content_type)
+            await db[collection].update_one({"_id": doc["_id"]}, {"$set": {field: image_url(digest, request)}})
+            count += 1
+        if count:
+            response_cache.bump(collection)
+        migrated[f"{collection}.{field}"] = count
+    return {"message": "Inline images migrated", "migrated": migrated}
 
 # =============== ALUMNI ROUTES ===============
 
-@api_router.get("/alumni", response_model=List[Alumni])
-async def get_alumni():
-    alumni_list = await db.alumni.find({"archived": False}, {"_id": 0}).sort("order_number", 1).to_list(1000)
-    return [Alumni(**alum) for alum in alumni_list]
+@api_router.get("/alumni", response_model=Union[List[Alumni], Page[Alumni]])
+@cached_public("alumni")
+async def get_alumni(
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    view: Optional[str] = None,
+    fields: Optional[str] = None
+):
+    selected = select_fields(Alumni, "alumni", view, fields)
+    projection = view_projection(Alumni, selected, "order_number")
+    thumbnails = fields is None and view == "summary"
+    if limit or cursor:
+        alumni_list, next_cursor = await paginate(db.alumni, {"archived": False}, projection, "order_number", 1, limit, cursor)
+        return page_of(view_rows(alumni_list, Alumni, selected, thumbnails), Alumni, next_cursor)
+    
+    alumni_list = await db.alumni.find({"archived": False}, projection).sort("order_number", 1).to_list(1000)
+    return view_rows(alumni_list, Alumni, selected, thumbnails)
+
+@api_router.get("/alumni/{alumni_id}", response_model=Alumni)
+@cached_public("alumni")
+async def get_alumni_member(alumni_id: str):
+    doc = await db.alumni.find_one({"id": alumni_id, "archived": False}, trusted_projection(Alumni))
+    if not doc:
+        raise HTTPException(status_code=404, detail="Alumni not found")
+    return model_rows([doc], Alumni)[0]
 
 @api_router.post("/admin/alumni", response_model=Alumni)
 async def create_alumni(alumni_data: AlumniCreate, current_user: dict = Depends(require_admin)):
@@ -1050,6 +2732,7 @@ async def create_alumni(alumni_data: AlumniCreate, current_user: dict = Depends(
         "created_at": datetime.now(timezone.utc).isoformat()
     }
     await db.alumni.insert_one(alumni_doc)
+    response_cache.bump("alumni")
     return Alumni(**alumni_doc)
 
 @api_router.put("/admin/alumni/{alumni_id}", response_model=Alumni)
@@ -1065,6 +2748,7 @@ async def update_alumni(alumni_id: str, alumni_data: AlumniCreate, current_user:
             "order_number": alumni_data.order_number
         }}
     )
+    response_cache.bump("alumni")
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail="Alumni not found")
     
@@ -1077,16 +2761,38 @@ async def archive_alumni(alumni_id: str, current_user: dict = Depends(require_ad
         {"id": alumni_id},
         {"$set": {"archived": True}}
     )
+    response_cache.bump("alumni")
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail="Alumni not found")
     return {"message": "Alumni archived"}
 
 # =============== EVENTS ROUTES ===============
 
-@api_router.get("/events", response_model=List[Event])
-async def get_events():
-    events = await db.events.find({"archived": False}, {"_id": 0}).sort("date", -1).to_list(1000)
-    return [Event(**event) for event in events]
+@api_router.get("/events", response_model=Union[List[Event], Page[Event]])
+@cached_public("events")
+async def get_events(
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    view: Optional[str] = None,
+    fields: Optional[str] = None
+):
+    selected = select_fields(Event, "events", view, fields)
+    projection = view_projection(Event, selected, "date")
+    thumbnails = fields is None and view == "summary"
+    if limit or cursor:
+        events, next_cursor = await paginate(db.events, {"archived": False}, projection, "date", -1, limit, cursor)
+        return page_of(view_rows(events, Event, selected, thumbnails), Event, next_cursor)
+    
+    events = await db.events.find({"archived": False}, projection).sort("date", -1).to_list(1000)
+    return view_rows(events, Event, selected, thumbnails)
+
+@api_router.get("/events/{event_id}", response_model=Event)
+@cached_public("events")
+async def get_event(event_id: str):
+    doc = await db.events.find_one({"id": event_id, "archived": False}, trusted_projection(Event))
+    if not doc:
+        raise HTTPException(status_code=404, detail="Event not found")
+    return model_rows([doc], Event)[0]
 
 @api_router.post("/admin/events", response_model=Event)
 async def create_event(event_data: EventCreate, current_user: dict = Depends(require_admin)):
@@ -1102,6 +2808,7 @@ async def create_event(event_data: EventCreate, current_user: dict = Depends(req
         "created_at": datetime.now(timezone.utc).isoformat()
     }
     await db.events.insert_one(event_doc)
+    response_cache.bump("events")
     return Event(**event_doc)
 
 @api_router.put("/admin/events/{event_id}", response_model=Event)
@@ -1117,6 +2824,7 @@ async def update_event(event_id: str, event_data: EventCreate, current_user: dic
             "details": event_data.details
         }}
     )
+    response_cache.bump("events")
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail="Event not found")
     
@@ -1129,6 +2837,7 @@ async def archive_event(event_id: str, current_user: dict = Depends(require_admi
         {"id": event_id},
         {"$set": {"archived": True}}
     )
+    response_cache.bump("events")
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail="Event not found")
     return {"message": "Event archived"}
@@ -1136,6 +2845,7 @@ async def archive_event(event_id: str, current_user: dict = Depends(require_admi
 # =============== MEMBERSHIP ROUTES ===============
 
 @api_router.get("/membership-content", response_model=MembershipContent)
+@cached_public("membership_content")
 async def get_membership_content():
     content = await db.membership_content.find_one({}, {"_id": 0})
     if not content:
@@ -1158,8 +2868,42 @@ async def update_membership_content(content_data: MembershipContentUpdate, curre
         "updated_at": datetime.now(timezone.utc).isoformat()
     }
     await db.membership_content.insert_one(content_doc)
+    response_cache.bump("membership_content")
     return MembershipContent(**content_doc)
 
+# =============== HOME BUNDLE ===============
+
+@api_router.get("/home", response_model=HomeBundle)
+@cached_public(
+    "homepage_content", "coach_info", "leadership", "announcements",
+    "success_events", "events", "alumni", "system_setup"
+)
+async def get_home():
+    """Everything the public homepage renders, fetched concurrently in one request."""
+    active = {"archived": False}
+    (homepage_content, coach, leadership, announcements,
+     success_events, events, alumni, setup) = await asyncio.gather(
+        db.homepage_content.find({}, trusted_projection(HomepageContent)).to_list(1000),
+        db.coach_info.find_one({}, trusted_projection(CoachInfo)),
+        db.leadership.find(active, trusted_projection(LeadershipMember)).sort("order_number", 1).to_list(1000),
+        db.announcements.find(active, trusted_projection(Announcement)).sort("created_at", -1).to_list(1000),
+        db.success_events.find(active, trusted_projection(SuccessEvent)).sort("date", -1).to_list(1000),
+        db.events.find(active, trusted_projection(Event)).sort("date", -1).to_list(1000),
+        db.alumni.find(active, trusted_projection(Alumni)).sort("order_number", 1).to_list(1000),
+        db.system_setup.find_one({}, {"_id": 0})
+    )
+    bundle = {
+        "homepage_content": model_rows(homepage_content, HomepageContent),
+        "coach_info": model_rows([coach], CoachInfo)[0] if coach else None,
+        "leadership": model_rows(leadership, LeadershipMember),
+        "announcements": model_rows(announcements, Announcement),
+        "success_events": model_rows(success_events, SuccessEvent),
+        "events": model_rows(events, Event),
+        "alumni": model_rows(alumni, Alumni),
+        "setup": {"is_setup_complete": bool(setup and setup.get("is_setup_complete"))}
+    }
+    return bundle if FAST_RESPONSES else HomeBundle(**bundle)
+
 # =============== USER MANAGEMENT UPDATES ===============
 
 @api_router.patch("/admin/users/{user_id}/advanced")
@@ -1168,10 +2912,253 @@ async def toggle_advanced_access(user_id: str, grant: bool, current_user: dict =
         {"id": user_id},
         {"$set": {"advanced_access": grant}}
     )
+    user_cache.invalidate(user_id)
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail="User not found")
     return {"message": f"Advanced course access {'granted' if grant else 'revoked'}"}
 
+# =============== INDEXES ===============
+
+ACTIVE = {"archived": False}
+
+# Every query shape in this module, per collection. Listings that only ever
+# read non-archived rows get partial indexes so archived rows cost nothing.
+INDEXES = {
+    "users": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+        IndexModel([("created_at", ASCENDING), ("id", ASCENDING)], name="active_created_at",
+                   partialFilterExpression=ACTIVE),
+        IndexModel([("last_login", ASCENDING), ("id", ASCENDING)], name="active_last_login",
+                   partialFilterExpression=ACTIVE),
+        # Admin user table: prefix search, common filters and sortable columns
+        IndexModel([("search_terms", ASCENDING)], name="active_search_terms", partialFilterExpression=ACTIVE),
+        IndexModel([("status", ASCENDING), ("created_at", ASCENDING), ("id", ASCENDING)],
+                   name="active_status_created_at", partialFilterExpression=ACTIVE),
+        IndexModel([("batch", ASCENDING), ("created_at", ASCENDING), ("id", ASCENDING)],
+                   name="active_batch_created_at", partialFilterExpression=ACTIVE),
+        IndexModel([("full_name", ASCENDING), ("id", ASCENDING)], name="active_full_name",
+                   partialFilterExpression=ACTIVE),
+    ],
+    "courses": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("order_number", ASCENDING)], name="active_order", partialFilterExpression=ACTIVE),
+    ],
+    "modules": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("course_id", ASCENDING), ("order_number", ASCENDING)], name="active_course_order",
+                   partialFilterExpression=ACTIVE),
+    ],
+    "progress": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("user_id", ASCENDING), ("module_id", ASCENDING)], name="user_module", unique=True),
+        IndexModel([("module_id", ASCENDING), ("user_id", ASCENDING)], name="module_user"),
+    ],
+    "leadership": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("order_number", ASCENDING)], name="active_order", partialFilterExpression=ACTIVE),
+    ],
+    "announcements": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("created_at", DESCENDING), ("id", DESCENDING)], name="active_created_at",
+                   partialFilterExpression=ACTIVE),
+    ],
+    "success_events": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("date", DESCENDING), ("id", DESCENDING)], name="active_date", partialFilterExpression=ACTIVE),
+    ],
+    "alumni": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("order_number", ASCENDING), ("id", ASCENDING)], name="active_order",
+                   partialFilterExpression=ACTIVE),
+    ],
+    "events": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("date", DESCENDING), ("id", DESCENDING)], name="active_date", partialFilterExpression=ACTIVE),
+    ],
+    "homepage_content": [
+        IndexModel([("section", ASCENDING)], name="section_unique", unique=True),
+    ],
+    "images": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+    ],
+}
+
+# IndexOptionsConflict / IndexKeySpecsConflict: same name or keys, different options
+INDEX_CONFLICT_CODES = (85, 86)
+
+async def ensure_indexes():
+    """Create every index in ``INDEXES``; safe to run on every startup.
+
+    An index whose definition changed is dropped and rebuilt. Failures (for
+    example a unique index over existing duplicates) are logged and skipped
+    so a bad index never keeps the API from starting.
+    """
+    for collection, models in INDEXES.items():
+        for model in models:
+            name = model.document["name"]
+            try:
+                await db[collection].create_indexes([model])
+            except OperationFailure as e:
+                if e.code not in INDEX_CONFLICT_CODES:
+                    logger.error("Could not create index %s.%s: %s", collection, name, e)
+                    continue
+                logger.info("Rebuilding index %s.%s with its new definition", collection, name)
+                try:
+                    existing = await db[collection].index_information()
+                    key = list(model.document["key"].items())
+                    for existing_name, info in existing.items():
+                        if existing_name == name or (existing_name != "_id_" and info["key"] == key):
+                            await db[collection].drop_index(existing_name)
+                    await db[collection].create_indexes([model])
+                except OperationFailure as e:
+                    logger.error("Could not rebuild index %s.%s: %s", collection, name, e)
+
+async def dedupe_progress():
+    """Collapse duplicate (user_id, module_id) progress rows, keeping the
+    completed one, so the unique index can be built over older data."""
+    pipeline = [
+        {"$sort": {"completed": -1, "completed_at": -1}},
+        {"$group": {
+            "_id": {"user_id": "$user_id", "module_id": "$module_id"},
+            "ids": {"$push": "$_id"},
+            "count": {"$sum": 1}
+        }},
+        {"$match": {"count": {"$gt": 1}}}
+    ]
+    removed = 0
+    async for group in db.progress.aggregate(pipeline, allowDiskUse=True):
+        result = await db.progress.delete_many({"_id": {"$in": group["ids"][1:]}})
+        removed += result.deleted_count
+    if removed:
+        logger.info("Removed %d duplicate progress rows", removed)
+
+async def backfill_user_search_terms():
+    """Add ``search_terms`` to users created before the admin search existed."""
+    requests = []
+    async for user in db.users.find({"search_terms": {"$exists": False}}, {"_id": 1, "full_name": 1, "email": 1}):
+        terms = user_search_terms(user.get("full_name", ""), user.get("email", ""))
+        requests.append(UpdateOne({"_id": user["_id"]}, {"$set": {"search_terms": terms}}))
+        if len(requests) >= FIXTURE_BATCH_SIZE:
+            await db.users.bulk_write(requests, ordered=False)
+            requests = []
+    if requests:
+        await db.users.bulk_write(requests, ordered=False)
+
+@api_router.get("/admin/indexes")
+async def get_index_stats(current_user: dict = Depends(require_admin)):
+    report = {}
+    for collection in INDEXES:
+        sizes = {}
+        async for stats in db[collection].aggregate([{"$collStats": {"storageStats": {}}}]):
+            sizes = stats.get("storageStats", {}).get("indexSizes", {})
+        usage = {}
+        async for stats in db[collection].aggregate([{"$indexStats": {}}]):
+            usage[stats["name"]] = {
+                "accesses": stats["accesses"]["ops"],
+                "since": stats["accesses"]["since"].isoformat()
+            }
+        report[collection] = [
+            {
+                "name": name,
+                "size_bytes": sizes.get(name, 0),
+                "accesses": usage.get(name, {}).get("accesses", 0),
+                "since": usage.get(name, {}).get("since")
+            }
+            for name in sorted(set(sizes) | set(usage))
+        ]
+    return report
+
+# =============== METRICS ===============
+
+class MetricsMiddleware:
+    """Count and time each request by method, route template and status.
+
+    Plain ASGI rather than BaseHTTPMiddleware so streamed responses are
+    timed until their last chunk. Requests that match no route share one
+    label to keep cardinality bounded.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        status_code = 500
+        
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            route = scope.get("route")
+            labels = (scope["method"], route.path if route is not None else "unmatched", str(status_code))
+            HTTP_REQUESTS.labels(*labels).inc()
+            HTTP_REQUEST_DURATION.labels(*labels).observe(time.perf_counter() - start)
+
+REQUEST_ID_PATTERN = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+class TracingMiddleware:
+    """Give each request an ID (reusing a sane incoming X-Request-ID), collect
+    its Mongo commands and log a structured record if it is slow."""
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        incoming = dict(scope["headers"]).get(b"x-request-id", b"").decode("latin-1")
+        trace = RequestTrace(incoming if REQUEST_ID_PATTERN.match(incoming) else generate_id())
+        status_code = 500
+        
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [(b"x-request-id", trace.request_id.encode())]
+            await send(message)
+        
+        token = current_trace.set(trace)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_trace.reset(token)
+            duration_ms = (time.perf_counter() - start) * 1000
+            if duration_ms >= SLOW_REQUEST_MS:
+                route = scope.get("route")
+                logger.warning("Slow request %s", json.dumps({
+                    "request_id": trace.request_id,
+                    "method": scope["method"],
+                    "route": route.path if route is not None else None,
+                    "path": scope["path"],
+                    "status": status_code,
+                    "duration_ms": round(duration_ms, 3),
+                    "mongo": trace.summary()
+                }))
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    if METRICS_TOKEN and request.headers.get("authorization") != f"Bearer {METRICS_TOKEN}":
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(content=generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+
 # =============== MAIN APP ===============
 
 app.include_router(api_router)
@@ -1183,6 +3170,9 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+if TRACE_REQUESTS:
+    app.add_middleware(TracingMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 logging.basicConfig(
     level=logging.INFO,
@@ -1190,6 +3180,18 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def startup_indexes():
+    existing = await db.progress.index_information()
+    if not existing.get("user_module", {}).get("unique"):
+        await dedupe_progress()
+    await backfill_user_search_terms()
+    await ensure_indexes()
+    await cache_sync.start()
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    await cache_sync.stop()
     client.close()
+    password_pool.shutdown()
+    image_pool.shutdown()
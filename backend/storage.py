@@ -0,0 +1,851 @@
+"""In-process storage engine behind the ``db.*`` calls in server.py.
+
+``MemoryClient`` stands in for ``AsyncIOMotorClient`` when
+``STORAGE_ENGINE=memory``. It implements only what server.py,
+generate_data.py, manage_fixtures.py and the benchmarks call: find/find_one,
+inserts, update_one and find_one_and_update with upsert, delete_many,
+bulk_write of UpdateOne, count_documents, distinct, aggregate, and index
+management. The operators it understands are listed in the tables below,
+with Mongo's semantics for missing fields, nulls, arrays and type
+bracketing; anything else raises NotImplementedError.
+tests/test_storage.py fails when the backend uses an operator missing from
+these tables (or the tables list one it no longer uses), so a new query is
+caught by the test suite rather than by the first request that hits it.
+
+Indexes created through ``create_indexes`` (the ``INDEXES`` registry at
+startup) are real: unique keys raise DuplicateKeyError, and equality or
+``$in`` on an index's leading field narrows the candidates before the full
+filter runs. Partial indexes are only used when the query implies their
+filter. Documents are copied on the way in and out, like a round trip
+through BSON, so handlers can mutate what they read.
+
+Data lives for the life of the process. Use it for tests, local
+development and profiling handler and serialization overhead without a
+Mongo server; it is not durable and not shared between workers.
+"""
+import re
+from datetime import datetime, timezone
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
+from pymongo.operations import UpdateOne
+from pymongo.results import BulkWriteResult, DeleteResult, InsertManyResult, InsertOneResult, UpdateResult
+
+QUERY_OPERATORS = frozenset({"$and", "$or", "$ne", "$in", "$gt", "$gte", "$lt", "$exists", "$regex"})
+UPDATE_OPERATORS = frozenset({"$set", "$setOnInsert", "$inc", "$push"})
+PUSH_MODIFIERS = frozenset({"$each", "$slice"})
+STAGES = frozenset({
+    "$match", "$lookup", "$unwind", "$group", "$addFields", "$project", "$sort", "$collStats", "$indexStats"
+})
+ACCUMULATORS = frozenset({"$sum", "$push"})
+EXPRESSION_OPERATORS = frozenset({"$cond", "$eq", "$arrayElemAt"})
+SUPPORTED_OPERATORS = (QUERY_OPERATORS | UPDATE_OPERATORS | PUSH_MODIFIERS | STAGES | ACCUMULATORS
+                       | EXPRESSION_OPERATORS)
+
+_MISSING = object()
+
+
+def _unsupported(kind, name):
+    raise NotImplementedError(f"{kind} {name} is not supported by the memory engine")
+
+
+def _clone(value):
+    if isinstance(value, dict):
+        return {k: _clone(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_clone(v) for v in value]
+    return value
+
+
+def _resolve(doc, parts):
+    """Values at a dotted path, descending into arrays like Mongo does."""
+    if not parts:
+        return [doc]
+    if isinstance(doc, dict):
+        if parts[0] not in doc:
+            return [_MISSING]
+        return _resolve(doc[parts[0]], parts[1:])
+    if isinstance(doc, list):
+        values = []
+        for item in doc:
+            if isinstance(item, (dict, list)):
+                values.extend(v for v in _resolve(item, parts) if v is not _MISSING)
+        return values or [_MISSING]
+    return [_MISSING]
+
+
+def _get(doc, path):
+    value = doc
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return _MISSING
+        value = value.get(part, _MISSING)
+        if value is _MISSING:
+            return _MISSING
+    return value
+
+
+def _set(doc, path, value):
+    parts = path.split(".")
+    for part in parts[:-1]:
+        doc = doc.setdefault(part, {})
+    doc[parts[-1]] = value
+
+
+def _unset(doc, path):
+    parts = path.split(".")
+    for part in parts[:-1]:
+        doc = doc.get(part)
+        if not isinstance(doc, dict):
+            return
+    doc.pop(parts[-1], None)
+
+
+def _type_rank(value):
+    # Mongo's cross-type sort order
+    if value is None or value is _MISSING:
+        return 1
+    if isinstance(value, bool):
+        return 8
+    if isinstance(value, (int, float)):
+        return 2
+    if isinstance(value, str):
+        return 3
+    if isinstance(value, dict):
+        return 4
+    if isinstance(value, list):
+        return 5
+    if isinstance(value, ObjectId):
+        return 7
+    return 9
+
+
+def sort_key(value):
+    rank = _type_rank(value)
+    if rank == 1:
+        return (rank, 0)
+    if rank in (4, 5):
+        return (rank, repr(value))
+    return (rank, value)
+
+
+def _comparable(a, b):
+    rank = _type_rank(a)
+    return rank == _type_rank(b) and rank not in (1, 4, 5)
+
+
+def _equals(candidate, expected):
+    if expected is None:
+        return candidate is None or candidate is _MISSING
+    if candidate is _MISSING:
+        return False
+    if isinstance(candidate, list) and not isinstance(expected, list):
+        return any(_equals(item, expected) for item in candidate)
+    if isinstance(candidate, bool) != isinstance(expected, bool):
+        return False
+    return candidate == expected
+
+
+def _match_regex(value, pattern):
+    if isinstance(value, list):
+        return any(_match_regex(item, pattern) for item in value)
+    return isinstance(value, str) and pattern.search(value) is not None
+
+
+def _hashable(value):
+    if isinstance(value, dict):
+        return ("__dict__", tuple((k, _hashable(v)) for k, v in value.items()))
+    if isinstance(value, list):
+        return ("__list__", tuple(_hashable(v) for v in value))
+    if isinstance(value, bool):
+        return ("__bool__", value)
+    return value
+
+
+class _InList(list):
+    """``$in`` operand that also holds its scalars as a set, so a large list
+    costs one lookup per value instead of a scan."""
+
+    def __init__(self, items):
+        super().__init__(items)
+        self.plain = all(isinstance(item, (str, int, float)) for item in items)
+        self.scalars = {_hashable(item) for item in items} if self.plain else set()
+
+
+def _in(values, arg):
+    if isinstance(arg, _InList) and arg.plain:
+        for value in values:
+            for item in (value if isinstance(value, list) else [value]):
+                if isinstance(item, (str, int, float)) and _hashable(item) in arg.scalars:
+                    return True
+        return False
+    return any(_equals(v, a) for v in values for a in arg)
+
+
+def prepare(query):
+    """Copy of ``query`` with its ``$in`` lists indexed for matching."""
+    if isinstance(query, list):
+        return [prepare(item) for item in query]
+    if not isinstance(query, dict):
+        return query
+    return {key: _InList(value) if key == "$in" and isinstance(value, (list, tuple)) else prepare(value)
+            for key, value in query.items()}
+
+
+def _match_operator(values, op, arg):
+    if op == "$ne":
+        return not any(_equals(v, arg) for v in values)
+    if op == "$in":
+        return _in(values, arg)
+    if op in ("$gt", "$gte", "$lt"):
+        for value in values:
+            for item in (value if isinstance(value, list) else [value]):
+                if not _comparable(item, arg):
+                    continue
+                if (op == "$gt" and item > arg) or (op == "$gte" and item >= arg) or (op == "$lt" and item < arg):
+                    return True
+        return False
+    if op == "$exists":
+        return any(v is not _MISSING for v in values) == bool(arg)
+    if op == "$regex":
+        pattern = arg if isinstance(arg, re.Pattern) else re.compile(arg)
+        return any(_match_regex(v, pattern) for v in values)
+    _unsupported("Query operator", op)
+
+
+def _match_condition(values, condition):
+    if isinstance(condition, re.Pattern):
+        return any(_match_regex(v, condition) for v in values)
+    if isinstance(condition, dict) and condition and all(k.startswith("$") for k in condition):
+        return all(_match_operator(values, op, arg) for op, arg in condition.items())
+    return any(_equals(v, condition) for v in values)
+
+
+def matches(doc, query) -> bool:
+    for key, condition in query.items():
+        if key == "$and":
+            if not all(matches(doc, sub) for sub in condition):
+                return False
+        elif key == "$or":
+            if not any(matches(doc, sub) for sub in condition):
+                return False
+        elif key.startswith("$"):
+            _unsupported("Query operator", key)
+        elif not _match_condition(_resolve(doc, key.split(".")), condition):
+            return False
+    return True
+
+
+def project(doc, projection):
+    if not projection:
+        return _clone(doc)
+    include_id = projection.get("_id", 1)
+    fields = {k: v for k, v in projection.items() if k != "_id"}
+    if any(v for v in fields.values()):
+        result = {}
+        if include_id and "_id" in doc:
+            result["_id"] = doc["_id"]
+        for path, flag in fields.items():
+            if not flag:
+                continue
+            value = _get(doc, path)
+            if value is not _MISSING:
+                _set(result, path, _clone(value))
+        return result
+    result = _clone(doc)
+    if not include_id:
+        result.pop("_id", None)
+    for path in fields:
+        _unset(result, path)
+    return result
+
+
+def _sort_spec(key_or_list, direction=None):
+    if isinstance(key_or_list, str):
+        return [(key_or_list, direction if direction is not None else 1)]
+    return list(key_or_list.items()) if isinstance(key_or_list, dict) else list(key_or_list)
+
+
+def sort_docs(docs, spec):
+    for field, direction in reversed(spec):
+        docs.sort(key=lambda d: sort_key(_get(d, field)), reverse=direction == -1)
+    return docs
+
+
+def _field_value(doc, path):
+    # Indexes store a missing field as null
+    value = _get(doc, path)
+    return None if value is _MISSING else value
+
+
+def _index_values(doc, field):
+    value = _field_value(doc, field)
+    if isinstance(value, list):
+        return [_hashable(v) for v in value] or [None]
+    return [_hashable(value)]
+
+
+class MemoryIndex:
+    def __init__(self, name, keys, unique=False, partial=None):
+        self.name = name
+        self.keys = keys
+        self.unique = unique
+        self.partial = partial
+        self.entries = {}   # leading-field value -> set of row ids
+        self.unique_keys = {}   # full key tuple -> row id
+        self.accesses = 0
+
+    def info(self):
+        info = {"key": list(self.keys), "v": 2}
+        if self.unique:
+            info["unique"] = True
+        if self.partial is not None:
+            info["partialFilterExpression"] = self.partial
+        return info
+
+    def covers(self, doc):
+        return self.partial is None or matches(doc, self.partial)
+
+    def full_key(self, doc):
+        return tuple(_hashable(_field_value(doc, field)) for field, _ in self.keys)
+
+    def add(self, row_id, doc):
+        if not self.covers(doc):
+            return
+        for value in _index_values(doc, self.keys[0][0]):
+            self.entries.setdefault(value, set()).add(row_id)
+        if self.unique:
+            self.unique_keys[self.full_key(doc)] = row_id
+
+    def remove(self, row_id, doc):
+        if not self.covers(doc):
+            return
+        for value in _index_values(doc, self.keys[0][0]):
+            rows = self.entries.get(value)
+            if rows is not None:
+                rows.discard(row_id)
+                if not rows:
+                    del self.entries[value]
+        if self.unique and self.unique_keys.get(self.full_key(doc)) == row_id:
+            del self.unique_keys[self.full_key(doc)]
+
+    def conflict(self, doc, row_id=None):
+        if not self.unique or not self.covers(doc):
+            return None
+        existing = self.unique_keys.get(self.full_key(doc))
+        return existing if existing is not None and existing != row_id else None
+
+
+class MemoryCursor:
+    """Lazily evaluated result set with Motor's cursor chaining."""
+
+    def __init__(self, producer, projection=None):
+        self._producer = producer
+        self._projection = projection
+        self._sort = []
+        self._limit = 0
+        self._results = None
+
+    def sort(self, key_or_list, direction=None):
+        self._sort = _sort_spec(key_or_list, direction)
+        return self
+
+    def limit(self, count):
+        self._limit = count
+        return self
+
+    def batch_size(self, size):
+        return self
+
+    def _evaluate(self):
+        if self._results is None:
+            docs = self._producer()
+            if self._sort:
+                docs = sort_docs(list(docs), self._sort)
+            if self._limit:
+                docs = docs[:self._limit]
+            self._results = [project(doc, self._projection) for doc in docs]
+        return self._results
+
+    async def to_list(self, length=None):
+        results = self._evaluate()
+        return results[:length] if length else list(results)
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self._evaluate():
+            yield doc
+
+
+class MemoryCollection:
+    def __init__(self, database, name):
+        self.database = database
+        self.name = name
+        self._rows = {}   # row id -> stored document, in insertion order
+        self._next_row = 0
+        self._by_object_id = {}
+        self._indexes = {}
+
+    # --- reads ---
+
+    def _candidates(self, query):
+        """Row ids worth testing against ``query``, using an index if one applies."""
+        if "_id" in query and not isinstance(query["_id"], dict):
+            row = self._by_object_id.get(query["_id"])
+            return [row] if row is not None else []
+        for index in self._indexes.values():
+            field = index.keys[0][0]
+            if field not in query:
+                continue
+            if index.partial is not None and not all(query.get(k) == v for k, v in index.partial.items()):
+                continue
+            condition = query[field]
+            if isinstance(condition, dict) and set(condition) == {"$in"}:
+                values = condition["$in"]
+            elif not isinstance(condition, (dict, re.Pattern, list)) and condition is not None:
+                values = [condition]
+            else:
+                continue
+            index.accesses += 1
+            rows = set()
+            for value in values:
+                rows |= index.entries.get(_hashable(value), set())
+            return sorted(rows)
+        return list(self._rows)
+
+    def _matching(self, query):
+        query = prepare(query or {})
+        return [row for row in self._candidates(query) if matches(self._rows[row], query)]
+
+    def find(self, filter=None, projection=None, **kwargs):
+        return MemoryCursor(lambda: [self._rows[row] for row in self._matching(filter)], projection)
+
+    async def find_one(self, filter=None, projection=None, sort=None, **kwargs):
+        cursor = self.find(filter, projection)
+        if sort:
+            cursor.sort(sort)
+        results = await cursor.limit(1).to_list(1)
+        return results[0] if results else None
+
+    async def count_documents(self, filter, **kwargs):
+        return len(self._matching(filter))
+
+    async def distinct(self, key, filter=None, **kwargs):
+        values = []
+        seen = set()
+        for row in self._matching(filter):
+            for value in _resolve(self._rows[row], key.split(".")):
+                for item in (value if isinstance(value, list) else [value]):
+                    if item is _MISSING or _hashable(item) in seen:
+                        continue
+                    seen.add(_hashable(item))
+                    values.append(_clone(item))
+        return values
+
+    def aggregate(self, pipeline, **kwargs):
+        return MemoryCursor(lambda: run_pipeline(self, pipeline))
+
+    # --- writes ---
+
+    def _check_unique(self, doc, row_id=None):
+        for index in self._indexes.values():
+            if index.conflict(doc, row_id) is not None:
+                key = {field: _field_value(doc, field) for field, _ in index.keys}
+                raise DuplicateKeyError(
+                    f"E11000 duplicate key error collection: {self.database.name}.{self.name} "
+                    f"index: {index.name} dup key: {key}",
+                    11000, {"code": 11000, "keyValue": key}
+                )
+        if doc["_id"] in self._by_object_id and self._by_object_id[doc["_id"]] != row_id:
+            raise DuplicateKeyError(
+                f"E11000 duplicate key error collection: {self.database.name}.{self.name} index: _id_",
+                11000, {"code": 11000, "keyValue": {"_id": doc["_id"]}}
+            )
+
+    def _insert(self, document):
+        if "_id" not in document:
+            document["_id"] = ObjectId()
+        doc = _clone(document)
+        self._check_unique(doc)
+        row_id = self._next_row
+        self._next_row += 1
+        self._rows[row_id] = doc
+        self._by_object_id[doc["_id"]] = row_id
+        for index in self._indexes.values():
+            index.add(row_id, doc)
+        return doc["_id"]
+
+    def _replace(self, row_id, new_doc):
+        old_doc = self._rows[row_id]
+        self._check_unique(new_doc, row_id)
+        for index in self._indexes.values():
+            index.remove(row_id, old_doc)
+        self._rows[row_id] = new_doc
+        for index in self._indexes.values():
+            index.add(row_id, new_doc)
+
+    def _delete(self, row_id):
+        doc = self._rows.pop(row_id)
+        self._by_object_id.pop(doc["_id"], None)
+        for index in self._indexes.values():
+            index.remove(row_id, doc)
+
+    async def insert_one(self, document, **kwargs):
+        return InsertOneResult(self._insert(document), True)
+
+    async def insert_many(self, documents, ordered=True, **kwargs):
+        inserted, errors = [], []
+        for position, document in enumerate(documents):
+            try:
+                inserted.append(self._insert(document))
+            except DuplicateKeyError as e:
+                errors.append({"index": position, "code": 11000, "errmsg": str(e), "op": document})
+                if ordered:
+                    break
+        if errors:
+            raise BulkWriteError(_bulk_details(errors, inserted=len(inserted)))
+        return InsertManyResult(inserted, True)
+
+    def _update_one(self, filter, update, upsert):
+        """Apply ``update`` to the first match; returns (row id, document before).
+
+        Row id is None when nothing matched and ``upsert`` is off; the
+        document before is None when the row was upserted."""
+        rows = self._matching(filter)
+        if rows:
+            before = self._rows[rows[0]]
+            new_doc = apply_update(before, update, inserting=False)
+            if new_doc != before:
+                self._replace(rows[0], new_doc)
+            return rows[0], before
+        if not upsert:
+            return None, None
+        upserted_id = self._insert(apply_update(upsert_seed(filter), update, inserting=True))
+        return self._by_object_id[upserted_id], None
+
+    async def update_one(self, filter, update, upsert=False, **kwargs):
+        row_id, before = self._update_one(filter, update, upsert)
+        if row_id is None:
+            return UpdateResult({"n": 0, "nModified": 0}, True)
+        if before is None:
+            return UpdateResult({"n": 1, "nModified": 0, "upserted": self._rows[row_id]["_id"]}, True)
+        return UpdateResult({"n": 1, "nModified": int(self._rows[row_id] is not before)}, True)
+
+    async def find_one_and_update(self, filter, update, projection=None, upsert=False,
+                                  return_document=ReturnDocument.BEFORE, **kwargs):
+        row_id, before = self._update_one(filter, update, upsert)
+        if row_id is None:
+            return None
+        if return_document == ReturnDocument.AFTER:
+            return project(self._rows[row_id], projection)
+        return project(before, projection) if before is not None else None
+
+    async def delete_many(self, filter, **kwargs):
+        rows = self._matching(filter)
+        for row_id in rows:
+            self._delete(row_id)
+        return DeleteResult({"n": len(rows)}, True)
+
+    async def bulk_write(self, requests, ordered=True, **kwargs):
+        counts = {"matched": 0, "modified": 0}
+        upserted, errors = [], []
+        for position, request in enumerate(requests):
+            if not isinstance(request, UpdateOne):
+                _unsupported("Bulk operation", type(request).__name__)
+            try:
+                result = await self.update_one(request._filter, request._doc, upsert=request._upsert)
+            except DuplicateKeyError as e:
+                errors.append({"index": position, "code": 11000, "errmsg": str(e), "op": request})
+                if ordered:
+                    break
+                continue
+            counts["matched"] += result.matched_count
+            counts["modified"] += result.modified_count
+            if result.upserted_id is not None:
+                upserted.append({"index": position, "_id": result.upserted_id})
+        if errors:
+            raise BulkWriteError(_bulk_details(errors, upserted=upserted, **counts))
+        return BulkWriteResult(_bulk_details([], upserted=upserted, **counts), True)
+
+    # --- indexes ---
+
+    async def create_indexes(self, indexes, **kwargs):
+        names = []
+        for model in indexes:
+            spec = model.document
+            keys = list(spec["key"].items())
+            name = spec["name"]
+            unique = spec.get("unique", False)
+            partial = spec.get("partialFilterExpression")
+            existing = self._indexes.get(name)
+            if existing is not None:
+                if (existing.keys, existing.unique, existing.partial) != (keys, unique, partial):
+                    raise OperationFailure(f"An existing index has the same name as the requested index: {name}", 86)
+                names.append(name)
+                continue
+            for other in self._indexes.values():
+                if other.keys == keys and (other.unique, other.partial) != (unique, partial):
+                    raise OperationFailure(f"Index already exists with a different name or options: {other.name}", 85)
+            index = MemoryIndex(name, keys, unique, partial)
+            for row_id, doc in self._rows.items():
+                if index.conflict(doc) is not None:
+                    raise OperationFailure(f"E11000 duplicate key error collection: {self.name} index: {name}", 11000)
+                index.add(row_id, doc)
+            self._indexes[name] = index
+            names.append(name)
+        return names
+
+    async def index_information(self):
+        information = {"_id_": {"key": [("_id", 1)], "v": 2}}
+        information.update({name: index.info() for name, index in self._indexes.items()})
+        return information
+
+    async def drop_index(self, name):
+        if name not in self._indexes:
+            raise OperationFailure(f"index not found with name [{name}]", 27)
+        del self._indexes[name]
+
+    async def drop(self):
+        self.database._collections.pop(self.name, None)
+
+
+def _bulk_details(errors, inserted=0, matched=0, modified=0, upserted=()):
+    return {
+        "writeErrors": errors, "writeConcernErrors": [], "nInserted": inserted, "nUpserted": len(upserted),
+        "nMatched": matched, "nModified": modified, "nRemoved": 0, "upserted": list(upserted)
+    }
+
+
+def upsert_seed(filter):
+    """Equality fields of an upsert filter, which Mongo copies into the new document."""
+    document = {}
+    for key, condition in (filter or {}).items():
+        if key.startswith("$") or isinstance(condition, re.Pattern):
+            continue
+        if not (isinstance(condition, dict) and any(k.startswith("$") for k in condition)):
+            _set(document, key, _clone(condition))
+    return document
+
+
+def apply_update(doc, update, inserting):
+    new_doc = _clone(doc)
+    for op, fields in update.items():
+        if op == "$set" or (op == "$setOnInsert" and inserting):
+            for path, value in fields.items():
+                _set(new_doc, path, _clone(value))
+        elif op == "$setOnInsert":
+            continue
+        elif op == "$inc":
+            for path, amount in fields.items():
+                current = _get(new_doc, path)
+                _set(new_doc, path, (0 if current is _MISSING or current is None else current) + amount)
+        elif op == "$push":
+            for path, value in fields.items():
+                current = _get(new_doc, path)
+                items = list(current) if isinstance(current, list) else []
+                if not (isinstance(value, dict) and set(value) <= PUSH_MODIFIERS and "$each" in value):
+                    _unsupported("$push form", value)
+                items.extend(_clone(value["$each"]))
+                if "$slice" in value:
+                    limit = value["$slice"]
+                    items = items[limit:] if limit < 0 else items[:limit]
+                _set(new_doc, path, items)
+        else:
+            _unsupported("Update operator", op)
+    return new_doc
+
+
+# --- aggregation ---
+
+def _field_path(value, parts):
+    # "$a.b" over an array of documents yields the array of their b values
+    for position, part in enumerate(parts):
+        if isinstance(value, list):
+            return [item for item in (_field_path(v, parts[position:]) for v in value if isinstance(v, dict))
+                    if item is not _MISSING]
+        if not isinstance(value, dict) or part not in value:
+            return _MISSING
+        value = value[part]
+    return value
+
+
+def evaluate(expression, doc):
+    if isinstance(expression, str) and expression.startswith("$"):
+        value = _field_path(doc, expression[1:].split("."))
+        return None if value is _MISSING else value
+    if isinstance(expression, list):
+        return [evaluate(item, doc) for item in expression]
+    if not isinstance(expression, dict):
+        return expression
+    if len(expression) == 1 and next(iter(expression)).startswith("$"):
+        (op, arg), = expression.items()
+        return _evaluate_operator(op, arg, doc)
+    return {key: evaluate(value, doc) for key, value in expression.items()}
+
+
+def _evaluate_operator(op, arg, doc):
+    if op == "$cond":
+        condition, then, otherwise = arg
+        return evaluate(then if _truthy(evaluate(condition, doc)) else otherwise, doc)
+    if op == "$eq":
+        a, b = evaluate(arg, doc)
+        return a == b and isinstance(a, bool) == isinstance(b, bool)
+    if op == "$arrayElemAt":
+        array, index = evaluate(arg, doc)
+        if not isinstance(array, list) or not -len(array) <= index < len(array):
+            return None
+        return array[index]
+    _unsupported("Expression operator", op)
+
+
+def _truthy(value):
+    return value not in (None, False, 0) and value is not _MISSING
+
+
+def _group(docs, spec):
+    groups = {}
+    for doc in docs:
+        key = evaluate(spec["_id"], doc)
+        group = groups.setdefault(_hashable(key), {"_id": key})
+        for field, accumulator in spec.items():
+            if field == "_id":
+                continue
+            (op, arg), = accumulator.items()
+            value = evaluate(arg, doc)
+            if op == "$sum":
+                numeric = isinstance(value, (int, float)) and not isinstance(value, bool)
+                group[field] = group.get(field, 0) + (value if numeric else 0)
+            elif op == "$push":
+                group.setdefault(field, []).append(value)
+            else:
+                _unsupported("Accumulator", op)
+    return list(groups.values())
+
+
+def _unwind(docs, path):
+    # Documents whose field is missing, null or an empty array are dropped
+    field = path[1:]
+    unwound = []
+    for doc in docs:
+        value = _get(doc, field)
+        if isinstance(value, list):
+            for item in value:
+                copy = dict(doc)
+                _set(copy, field, item)
+                unwound.append(copy)
+        elif value is not _MISSING and value is not None:
+            unwound.append(doc)
+    return unwound
+
+
+def _lookup(database, docs, spec):
+    # Hash join: foreign rows by every value of foreignField, missing as null
+    foreign = database[spec["from"]]
+    by_value = {}
+    for row_id, foreign_doc in foreign._rows.items():
+        for value in _resolve(foreign_doc, spec["foreignField"].split(".")):
+            for item in (value if isinstance(value, list) else [value]):
+                by_value.setdefault(_hashable(None if item is _MISSING else item), []).append(row_id)
+    joined = []
+    for doc in docs:
+        local = _field_value(doc, spec["localField"])
+        rows = set()
+        for value in (local if isinstance(local, list) else [local]):
+            rows.update(by_value.get(_hashable(value), ()))
+        doc = dict(doc)
+        doc[spec["as"]] = [foreign._rows[row] for row in sorted(rows)]
+        joined.append(doc)
+    return joined
+
+
+def run_pipeline(collection, pipeline):
+    database = collection.database
+    docs = None
+    for stage in pipeline:
+        (name, spec), = stage.items()
+        if name == "$match":
+            if docs is None:
+                docs = [collection._rows[row] for row in collection._matching(spec)]
+            else:
+                spec = prepare(spec)
+                docs = [doc for doc in docs if matches(doc, spec)]
+            continue
+        if docs is None:
+            docs = list(collection._rows.values())
+        if name == "$collStats":
+            docs = [{"ns": f"{database.name}.{collection.name}", "storageStats": {
+                "count": len(collection._rows),
+                "indexSizes": {index_name: 0 for index_name in ["_id_", *collection._indexes]}
+            }}]
+        elif name == "$indexStats":
+            docs = [{"name": index.name, "key": dict(index.keys), "accesses": {"ops": index.accesses, "since": database.client.started}}
+                    for index in collection._indexes.values()]
+        elif name == "$project":
+            docs = [project(doc, spec) for doc in docs]
+        elif name == "$addFields":
+            updated = []
+            for doc in docs:
+                doc = dict(doc)
+                for field, expression in spec.items():
+                    _set(doc, field, evaluate(expression, doc))
+                updated.append(doc)
+            docs = updated
+        elif name == "$lookup":
+            if set(spec) != {"from", "localField", "foreignField", "as"}:
+                _unsupported("$lookup form", sorted(spec))
+            docs = _lookup(database, docs, spec)
+        elif name == "$unwind":
+            if not isinstance(spec, str):
+                _unsupported("$unwind form", spec)
+            docs = _unwind(docs, spec)
+        elif name == "$group":
+            docs = _group(docs, spec)
+        elif name == "$sort":
+            docs = sort_docs(list(docs), _sort_spec(spec))
+        else:
+            _unsupported("Aggregation stage", name)
+    return [_clone(doc) for doc in (docs if docs is not None else collection._rows.values())]
+
+
+class MemoryDatabase:
+    def __init__(self, client, name):
+        self.client = client
+        self.name = name
+        self._collections = {}
+
+    def __getitem__(self, name) -> MemoryCollection:
+        if name not in self._collections:
+            self._collections[name] = MemoryCollection(self, name)
+        return self._collections[name]
+
+    def __getattr__(self, name) -> MemoryCollection:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+
+class MemoryClient:
+    """``AsyncIOMotorClient`` stand-in holding every database in process memory."""
+
+    def __init__(self, *args, **kwargs):
+        self.started = datetime.now(timezone.utc)
+        self._databases = {}
+
+    def __getitem__(self, name) -> MemoryDatabase:
+        if name not in self._databases:
+            self._databases[name] = MemoryDatabase(self, name)
+        return self._databases[name]
+
+    def __getattr__(self, name) -> MemoryDatabase:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+    async def drop_database(self, name):
+        self._databases.pop(name if isinstance(name, str) else name.name, None)
+
+    def close(self):
+        pass
@@ -0,0 +1,85 @@
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+
+# Tests run against the in-memory storage engine; no Mongo server needed
+os.environ["STORAGE_ENGINE"] = "memory"
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "test")
+os.environ["CACHE_SYNC_INTERVAL_SECONDS"] = "0"
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+import server  # noqa: E402
+from storage import MemoryClient  # noqa: E402
+
+
+@pytest.fixture
+def anyio_backend():
+    # Async tests (pytestmark = pytest.mark.anyio) run on asyncio only
+    return "asyncio"
+
+
+@pytest.fixture
+async def db():
+    server.client = MemoryClient()
+    server.db = server.client[os.environ["DB_NAME"]]
+    server.user_cache.clear()
+    server.response_cache.clear()
+    await server.ensure_indexes()
+    return server.db
+
+
+@pytest.fixture
+async def client(db):
+    """HTTP client driving ``server.app`` in-process."""
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+        yield http
+
+
+@pytest.fixture
+async def admin_headers(db):
+    user_id = server.generate_id()
+    await db.users.insert_one({
+        "id": user_id, "full_name": "Admin User", "email": "admin@example.com", "password_hash": "",
+        "role": "admin", "status": "approved", "mentorship_access": True, "advanced_access": True,
+        "batch": None, "last_login": "2026-01-01T00:00:00+00:00", "archived": False,
+        "created_at": "2026-01-01T00:00:00+00:00"
+    })
+    return {"Authorization": f"Bearer {server.create_access_token({'sub': user_id})}"}
+
+
+@pytest.fixture
+def call_disconnecting():
+    """Drive ``server.app`` with a client that goes away after ``body_chunks``
+    response body messages (0: before the response starts)."""
+    async def call(path, headers, query_string=b"", body_chunks=0):
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+            "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "", "query_string": query_string,
+            "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+            "server": ("test", 80), "client": ("client", 1234),
+        }
+        sent = []
+        gone = asyncio.Event()
+        if not body_chunks:
+            gone.set()
+
+        async def receive():
+            await gone.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            sent.append(message)
+            if sum(m["type"] == "http.response.body" for m in sent) >= body_chunks:
+                gone.set()
+            # A real server yields while writing; the disconnect cancels it here
+            await asyncio.sleep(0.01)
+
+        await server.app(scope, receive, send)
+        return sent
+    return call
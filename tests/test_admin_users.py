@@ -0,0 +1,101 @@
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+# (full name, email, status, role, batch, mentorship, advanced, last login)
+PEOPLE = [
+    ("Alice Smith", "alice@example.com", "approved", "student", "47", True, False, "2026-03-01T10:00:00.000000+00:00"),
+    ("Alina Rahman", "alina@example.com", "pending", "student", "48", False, False, None),
+    ("Bob Alison", "bob@example.com", "approved", "student", None, False, True, "2026-02-01T10:00:00.000000+00:00"),
+    ("Carol Jones", "carol@sample.org", "approved", "admin", "47", True, True, "2026-04-01T10:00:00.000000+00:00"),
+    ("Dan Brown", "dan@example.com", "pending", "student", "48", False, False, "2026-01-15T10:00:00.000000+00:00"),
+    ("Eve Smithers", "eve@example.com", "approved", "student", "46", False, False, None),
+]
+
+
+@pytest.fixture
+async def users(db, admin_headers):
+    docs = [{
+        "id": f"u{i}", "full_name": name, "email": email, "password_hash": "", "status": status, "role": role,
+        "batch": batch, "mentorship_access": mentorship, "advanced_access": advanced, "last_login": last_login,
+        "archived": False, "created_at": f"2026-01-0{i + 1}T00:00:00+00:00",
+        "search_terms": server.user_search_terms(name, email)
+    } for i, (name, email, status, role, batch, mentorship, advanced, last_login) in enumerate(PEOPLE)]
+    archived = dict(docs[0], id="gone", email="alice.old@example.com", archived=True)
+    await db.users.insert_many(docs + [archived])
+    return admin_headers
+
+
+async def list_ids(client, headers, **params):
+    response = await client.get("/api/admin/users", params=params, headers=headers)
+    assert response.status_code == 200
+    return sorted(user["id"] for user in response.json())
+
+
+@pytest.mark.parametrize("search, expected", [
+    ("ali", ["u0", "u1", "u2"]),        # name words and emails, not mid-word ("Smith")
+    ("ALI smi", ["u0"]),                 # every word must match, case-insensitively
+    ("smith", ["u0", "u5"]),
+    ("bob@", ["u2"]),
+    ("carol@sample", ["u3"]),
+    ("ice", []),
+    ("a.*", []),                         # regex characters are literal
+])
+async def test_search_prefix_matches_name_words_and_email(client, users, search, expected):
+    assert await list_ids(client, users, search=search) == expected
+
+
+@pytest.mark.parametrize("params, expected", [
+    ({"filter_status": "pending"}, ["u1", "u4"]),
+    ({"filter_mentorship": True}, ["u0", "u3"]),
+    ({"filter_advanced": True, "filter_status": "approved"}, ["u2", "u3"]),
+    ({"batch": "48"}, ["u1", "u4"]),
+    ({"role": "admin", "search": "carol"}, ["u3"]),
+    ({"last_login_from": "2026-02-01T10:00:00Z"}, ["u0", "u2", "u3"]),
+    ({"last_login_from": "2026-02-01T00:00:00Z", "last_login_to": "2026-04-01T10:00:00Z"}, ["u0", "u2"]),
+])
+async def test_filters(client, users, params, expected):
+    ids = await list_ids(client, users, **params)
+    assert [i for i in ids if i.startswith("u")] == expected
+
+
+def expected_order(docs, sort_by, direction):
+    # Mongo order: nulls first ascending, ties broken by id
+    keyed = sorted(((doc.get(sort_by) is not None, doc.get(sort_by) or "", doc["id"]) for doc in docs),
+                   reverse=direction == "desc")
+    return [doc_id for _, _, doc_id in keyed]
+
+
+@pytest.mark.parametrize("direction", ["asc", "desc"])
+@pytest.mark.parametrize("sort_by", server.USER_SORT_FIELDS)
+async def test_sort_and_paginate_with_total(db, client, users, sort_by, direction):
+    docs = await db.users.find({"archived": False}, {"_id": 0}).to_list(None)
+    expected = expected_order(docs, sort_by, direction)
+
+    response = await client.get("/api/admin/users", params={"sort_by": sort_by, "sort_order": direction}, headers=users)
+    assert [user["id"] for user in response.json()] == expected
+
+    seen, cursor = [], None
+    while True:
+        params = {"sort_by": sort_by, "sort_order": direction, "limit": 3, **({"cursor": cursor} if cursor else {})}
+        page = (await client.get("/api/admin/users", params=params, headers=users)).json()
+        assert page["total"] == len(expected)
+        seen += [user["id"] for user in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == expected
+
+
+async def test_total_counts_filtered_rows(client, users):
+    params = {"filter_status": "approved", "limit": 1}
+    page = (await client.get("/api/admin/users", params=params, headers=users)).json()
+    # Four approved people plus the admin making the request
+    assert page["total"] == 5 and len(page["items"]) == 1
+
+
+async def test_unknown_sort_column_is_rejected(client, users):
+    response = await client.get("/api/admin/users", params={"sort_by": "password_hash"}, headers=users)
+    assert response.status_code == 400
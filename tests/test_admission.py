@@ -0,0 +1,39 @@
+import asyncio
+
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_export_slot_released_when_client_disconnects_before_first_chunk(db, admin_headers, call_disconnecting):
+    gate = server.admission_gates["export"]
+    for _ in range(gate.limit + gate.queue + 1):
+        await call_disconnecting("/api/admin/export/users", admin_headers)
+        assert gate.in_flight == 0
+    assert gate.rejected == 0
+    sent = await call_disconnecting("/api/admin/export/users", admin_headers)
+    assert not any(m.get("status") == 503 for m in sent)
+
+
+async def test_gate_queues_then_rejects_and_releases():
+    gate = server.AdmissionGate("test", limit=1, queue=1, timeout_seconds=0.05)
+    first = await gate.acquire()
+    waiter = asyncio.ensure_future(gate.acquire())
+    await asyncio.sleep(0)
+    assert gate.waiting == 1
+    with pytest.raises(server.HTTPException) as rejected:
+        await gate.acquire()
+    assert rejected.value.status_code == 503 and int(rejected.value.headers["Retry-After"]) >= 1
+    gate.release(first)
+    gate.release(await waiter)
+    assert (gate.in_flight, gate.waiting, gate.completed, gate.rejected) == (0, 0, 2, 1)
+
+    # A queued request that outlives the timeout is rejected too
+    held = await gate.acquire()
+    with pytest.raises(server.HTTPException) as timed_out:
+        await gate.acquire()
+    assert timed_out.value.status_code == 503
+    gate.release(held)
+    assert (gate.in_flight, gate.waiting, gate.rejected) == (0, 0, 2)
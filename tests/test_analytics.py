@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import generate_data
+import server
+
+pytestmark = pytest.mark.anyio
+
+OLD = "2026-01-01T00:00:00+00:00"
+
+
+def user(user_id, status="approved", archived=False, mentorship=False, last_login=OLD):
+    return {
+        "id": user_id, "full_name": user_id, "email": f"{user_id}@example.com", "password_hash": "", "role": "student",
+        "status": status, "mentorship_access": mentorship, "advanced_access": False, "batch": None,
+        "last_login": last_login, "archived": archived, "created_at": OLD
+    }
+
+
+def progress(user_id, module_id, completed):
+    return {"id": f"{user_id}-{module_id}", "user_id": user_id, "module_id": module_id, "completed": completed}
+
+
+async def legacy_course_stats(db):
+    """The per-course, per-user loop compute_course_stats replaced."""
+    stats = []
+    for course in await db.courses.find({"archived": False}, {"_id": 0}).to_list(1000):
+        module_ids = [m["id"] for m in await db.modules.find({"course_id": course["id"], "archived": False}).to_list(1000)]
+        if not module_ids:
+            continue
+        enrolled = await db.progress.distinct("user_id", {"module_id": {"$in": module_ids}})
+        completed = 0
+        for user_id in enrolled:
+            done = await db.progress.count_documents({"user_id": user_id, "module_id": {"$in": module_ids}, "completed": True})
+            completed += done == len(module_ids)
+        stats.append({
+            "course_id": course["id"], "course_title": course["title"], "enrolled": len(enrolled), "completed": completed,
+            "completion_rate": round(completed / len(enrolled) * 100, 2) if enrolled else 0
+        })
+    return stats
+
+
+async def test_analytics_counts(db, client, admin_headers):
+    recent = (datetime.now(timezone.utc) - timedelta(days=1)).isoformat()
+    await db.users.insert_many([
+        user("u1", mentorship=True, last_login=recent), user("u2"), user("u3", status="pending"),
+        user("u4", archived=True), user("u5"),
+    ])
+    await db.courses.insert_many([
+        {"id": cid, "title": cid, "archived": archived, "order_number": n}
+        for n, (cid, archived) in enumerate([("cA", False), ("cB", False), ("cC", True), ("cD", False)])
+    ])
+    await db.modules.insert_many([
+        {"id": mid, "course_id": cid, "archived": archived, "order_number": 1}
+        for mid, cid, archived in [("a1", "cA", False), ("a2", "cA", False), ("a3", "cA", True), ("b1", "cB", False),
+                                   ("c1", "cC", False)]
+    ])
+    await db.progress.insert_many([
+        progress("u1", "a1", True), progress("u1", "a2", True), progress("u1", "a3", False), progress("u1", "c1", True),
+        progress("u2", "a1", True), progress("u2", "a2", False), progress("u2", "b1", True),
+        progress("u3", "a3", True),  # only an archived module: not enrolled
+        progress("u4", "a1", True),  # archived users still count, as before
+    ])
+
+    response = await client.get("/api/admin/analytics", headers=admin_headers)
+    assert response.status_code == 200
+    assert response.json() == {
+        "total_users": 5, "approved_users": 4, "pending_users": 1, "active_users": 1, "mentorship_users": 2,
+        "course_stats": [
+            {"course_id": "cA", "course_title": "cA", "enrolled": 3, "completed": 1, "completion_rate": 33.33},
+            {"course_id": "cB", "course_title": "cB", "enrolled": 1, "completed": 1, "completion_rate": 100.0},
+        ]
+    }
+    assert response.json()["course_stats"] == await legacy_course_stats(db)
+
+
+async def test_course_stats_match_legacy_loop_on_generated_data(db):
+    await generate_data.generate(db, 200, 5, seed=3, min_modules=2, max_modules=5, courses_per_user=2,
+                                 archived_ratio=0.2, bcrypt_rounds=4)
+    courses = await db.courses.find({"archived": False}, {"_id": 0, "id": 1, "title": 1}).to_list(None)
+    stats = await server.compute_course_stats(courses)
+    assert any(row["completed"] for row in stats) and any(row["completed"] < row["enrolled"] for row in stats)
+    assert stats == await legacy_course_stats(db)
@@ -0,0 +1,42 @@
+import asyncio
+import time
+
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_shutdown_stops_cache_sync_after_writes(db, client, monkeypatch):
+    monkeypatch.setattr(server.cache_sync, "interval_seconds", 0.05)
+    await server.startup_indexes()
+    response = await client.post("/api/setup/initialize", json={
+        "full_name": "Admin User", "email": "admin@example.com", "password": "password123"
+    })
+    assert response.status_code == 200
+
+    # A hung sync task would only be abandoned when this times out
+    started = time.monotonic()
+    await asyncio.wait_for(server.shutdown_db_client(), 5)
+    assert time.monotonic() - started < 1
+    assert not server.cache_sync.stats()["enabled"]
+    names = {doc["_id"] for doc in await db.cache_versions.find({}).to_list(None)}
+    assert {"*", "system_setup"} <= names
+
+
+async def test_cli_writes_reach_running_workers(db):
+    worker_sync = server.CacheSync(0.01, 8)
+    worker_cache = server.ResponseCache(16, worker_sync)
+    await worker_sync.start()
+    versions = worker_cache.snapshot(["courses"])
+    worker_cache.put("/api/courses?", versions, b"[]")
+
+    # A CLI process never starts its sync task but still publishes
+    cli_sync = server.CacheSync(1, 8)
+    server.ResponseCache(16, cli_sync).clear()
+    await cli_sync.flush()
+
+    await asyncio.sleep(0.1)
+    await worker_sync.stop()
+    assert worker_cache.get("/api/courses?", ["courses"]) is None
@@ -0,0 +1,89 @@
+import csv
+import io
+import json
+
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+STAMP = "2026-01-01T00:00:00.000000+00:00"
+
+
+@pytest.fixture
+async def data(db, admin_headers):
+    await db.users.insert_many([{
+        "id": f"u{i}", "full_name": name, "email": f"user{i}@example.com", "password_hash": "SECRET-HASH",
+        "role": "student", "status": status, "mentorship_access": False, "advanced_access": False, "batch": "47",
+        "last_login": None, "archived": False, "created_at": f"2026-01-0{i + 1}T00:00:00.000000+00:00"
+    } for i, (name, status) in enumerate([("Ann Lee", "approved"), ("=HYPERLINK(1)", "pending")])])
+    await db.modules.insert_one({"id": "m1", "course_id": "c1", "title": "Intro", "order_number": 1, "archived": False})
+    await db.progress.insert_many([
+        {"id": "p1", "user_id": "u0", "module_id": "m1", "completed": True, "completed_at": STAMP, "updated_at": STAMP},
+        {"id": "p2", "user_id": "u1", "module_id": "m1", "completed": False, "completed_at": None, "updated_at": STAMP},
+    ])
+    return admin_headers
+
+
+async def export(client, headers, path, **params):
+    response = await client.get(path, params=params, headers=headers)
+    assert response.status_code == 200
+    assert "attachment" in response.headers["Content-Disposition"]
+    return response
+
+
+async def test_users_csv_columns_and_no_password_hash(client, data):
+    response = await export(client, data, "/api/admin/export/users")
+    assert response.headers["Content-Type"].startswith("text/csv")
+    assert "SECRET-HASH" not in response.text and "password_hash" not in response.text
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows[0] == server.USER_EXPORT_COLUMNS
+    by_name = {row[rows[0].index("full_name")]: row for row in rows[1:]}
+    # The admin from admin_headers plus the two seeded users
+    assert len(rows) == 4 and "Ann Lee" in by_name
+    assert "'=HYPERLINK(1)" in by_name
+
+
+async def test_users_ndjson_applies_table_filters(client, data):
+    response = await export(client, data, "/api/admin/export/users", format="ndjson", filter_status="pending")
+    assert response.headers["Content-Type"].startswith("application/x-ndjson")
+    assert "SECRET-HASH" not in response.text
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["id"] for row in rows] == ["u1"]
+    assert list(rows[0]) == server.USER_EXPORT_COLUMNS
+
+
+async def test_progress_export_with_joins(client, data):
+    response = await export(client, data, "/api/admin/export/progress", format="ndjson", include=["module", "user"])
+    rows = sorted((json.loads(line) for line in response.text.splitlines()), key=lambda row: row["id"])
+    assert list(rows[0]) == server.PROGRESS_EXPORT_COLUMNS + ["module_title", "course_id", "user_email", "user_full_name"]
+    assert rows[0]["module_title"] == "Intro" and rows[0]["user_email"] == "user0@example.com"
+    assert "SECRET-HASH" not in response.text
+
+    response = await export(client, data, "/api/admin/export/progress", user_id="u1")
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows[0] == server.PROGRESS_EXPORT_COLUMNS and len(rows) == 2
+
+
+async def test_unknown_progress_join_is_rejected(client, data):
+    response = await client.get("/api/admin/export/progress", params={"include": "password"}, headers=data)
+    assert response.status_code == 400
+
+
+async def test_export_slot_released_when_client_disconnects_mid_stream(db, data, call_disconnecting, monkeypatch):
+    await db.users.insert_many([{"id": f"bulk{i}", "full_name": f"User {i}", "email": f"bulk{i}@example.com",
+                                 "archived": False, "created_at": STAMP} for i in range(50)])
+    monkeypatch.setattr(server, "EXPORT_CHUNK_BYTES", 256)
+    gate = server.admission_gates["export"]
+
+    full = await call_disconnecting("/api/admin/export/users", data, body_chunks=1000)
+    chunks = [m for m in full if m["type"] == "http.response.body" and m.get("body")]
+    assert len(chunks) > 3 and gate.in_flight == 0
+
+    for _ in range(gate.limit + gate.queue + 1):
+        sent = await call_disconnecting("/api/admin/export/users", data, body_chunks=2)
+        assert sent[0]["status"] == 200
+        assert len([m for m in sent if m["type"] == "http.response.body"]) < len(chunks)
+        assert gate.in_flight == 0
+    assert gate.rejected == 0
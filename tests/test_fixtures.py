@@ -0,0 +1,14 @@
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_export_skips_image_metadata(db, tmp_path):
+    await db.images.insert_one({"id": "f" * 64, "size": 1, "content_type": "image/png"})
+    await db.events.insert_one({"id": "e1", "name": "Event", "date": "2026-01-01", "archived": False})
+
+    exported = await server.export_fixtures(tmp_path)
+    assert "images" not in exported and not (tmp_path / "images.ndjson").exists()
+    assert exported["events"] == 1
@@ -0,0 +1,29 @@
+import asyncio
+
+import pytest
+from pymongo.errors import BulkWriteError
+
+import generate_data
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+async def generate(db):
+    return await generate_data.generate(db, 20, 2, seed=1, min_modules=2, max_modules=3, batch_size=5, workers=2,
+                                        bcrypt_rounds=4)
+
+
+async def test_same_seed_generates_same_counts(db):
+    counts = await generate(db)
+    assert counts["users"] == 20 and counts["courses"] == 2
+    assert await db.users.count_documents({}) == 20
+    assert await db.progress.count_documents({}) == counts["progress"]
+
+
+async def test_writer_failure_is_raised_instead_of_hanging(db):
+    await generate(db)
+    await server.ensure_indexes()
+    # Every id and email is already taken, so the first insert_many fails
+    with pytest.raises(BulkWriteError):
+        await asyncio.wait_for(generate(db), 10)
@@ -0,0 +1,43 @@
+import base64
+
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+SVG = b'<svg xmlns="http://www.w3.org/2000/svg" width="1" height="1"/>'
+DATA_URL = "data:image/svg+xml;base64," + base64.b64encode(SVG).decode("ascii")
+
+
+@pytest.fixture
+def image_store(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(server, "IMAGE_STORE_DIR", tmp_path)
+    monkeypatch.setattr(server, "_image_store", None)
+
+
+async def test_migrated_image_urls_are_absolute(db, client, image_store, admin_headers, monkeypatch):
+    monkeypatch.setattr(server, "IMAGE_PUBLIC_BASE_URL", "")
+    await db.announcements.insert_one({"id": "a1", "title": "A", "content": "", "image_url": DATA_URL, "archived": False})
+
+    response = await client.post("http://api.example.com/api/admin/images/migrate-inline", headers=admin_headers)
+    assert response.status_code == 200
+    doc = await db.announcements.find_one({"id": "a1"})
+    assert doc["image_url"].startswith("http://api.example.com/api/images/")
+    assert server.thumbnail_url(doc["image_url"]) == f"{doc['image_url']}?w={server.IMAGE_VARIANT_WIDTHS[0]}"
+
+
+async def test_public_base_url_overrides_request_origin(db, client, image_store, admin_headers, monkeypatch):
+    monkeypatch.setattr(server, "IMAGE_PUBLIC_BASE_URL", "https://cdn.example.com/")
+    await db.alumni.insert_one({"id": "al1", "name": "A", "photo_url": DATA_URL, "order_number": 1, "archived": False})
+
+    response = await client.post("/api/admin/images/migrate-inline", headers=admin_headers)
+    assert response.status_code == 200
+    doc = await db.alumni.find_one({"id": "al1"})
+    assert doc["photo_url"].startswith("https://cdn.example.com/api/images/")
+
+
+@pytest.mark.parametrize("width", ["0", "-5", "wide"])
+async def test_invalid_variant_width_is_rejected(client, width):
+    response = await client.get(f"/api/images/{'0' * 64}", params={"w": width})
+    assert response.status_code == 422
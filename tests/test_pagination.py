@@ -0,0 +1,62 @@
+import base64
+import json
+
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def events(db):
+    docs = [
+        {"id": f"e{i}", "name": f"Event {i}", "date": f"2026-0{i}-01", "details": "", "archived": False,
+         "created_at": "2026-01-01T00:00:00+00:00"}
+        for i in range(1, 6)
+    ]
+    await db.events.insert_many(docs)
+    return docs
+
+
+def raw_cursor(value, last_id):
+    raw = json.dumps([value, last_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+async def test_cursor_round_trip(client, events):
+    first = (await client.get("/api/events", params={"limit": 2})).json()
+    second = (await client.get("/api/events", params={"limit": 2, "cursor": first["next_cursor"]})).json()
+    assert [e["id"] for e in first["items"] + second["items"]] == ["e5", "e4", "e3", "e2"]
+
+
+@pytest.mark.parametrize("value, last_id", [({"$regex": "^2026"}, "zzz"), ({"$exists": True}, "zzz"), ("2026", {"$gt": ""})])
+async def test_operator_cursors_are_rejected(client, events, value, last_id):
+    payload = raw_cursor(value, last_id)
+    for cursor in (payload, f"{payload}.{server.cursor_signature(payload)}"):
+        server.response_cache.clear()
+        response = await client.get("/api/events", params={"limit": 2, "cursor": cursor})
+        assert response.status_code == 400
+
+
+async def test_unsigned_cursor_is_rejected(client, events):
+    response = await client.get("/api/events", params={"limit": 2, "cursor": raw_cursor("2026-03-01", "e3")})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("direction", [1, -1])
+async def test_paginate_walks_null_sort_keys(db, direction):
+    dates = [None, "2026-02-01", None, "2026-01-01", "2026-02-01", None]
+    await db.events.insert_many([
+        {"id": f"e{i}", "name": f"Event {i}", "date": date, "archived": False} for i, date in enumerate(dates)
+    ])
+    # Mongo order: nulls before every value ascending, ties broken by id
+    expected = sorted(((date is not None, date or "", f"e{i}") for i, date in enumerate(dates)), reverse=direction == -1)
+
+    seen, cursor = [], None
+    while True:
+        page, cursor = await server.paginate(db.events, {}, {"_id": 0}, "date", direction, 2, cursor)
+        seen += [doc["id"] for doc in page]
+        if cursor is None:
+            break
+    assert seen == [doc_id for _, _, doc_id in expected]
@@ -0,0 +1,38 @@
+import asyncio
+
+import pytest
+from pymongo.errors import DuplicateKeyError
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_concurrent_toggles_leave_one_row(db, client, admin_headers):
+    toggles = [
+        client.post("/api/progress", json={"module_id": "m1", "completed": i % 2 == 0}, headers=admin_headers)
+        for i in range(10)
+    ]
+    responses = await asyncio.gather(*toggles)
+    assert all(response.status_code == 200 for response in responses)
+    assert len({response.json()["id"] for response in responses}) == 1
+    assert await db.progress.count_documents({"module_id": "m1"}) == 1
+
+
+async def test_upsert_retries_after_losing_the_insert_race(db, client, admin_headers, monkeypatch):
+    user = await db.users.find_one({"email": "admin@example.com"})
+    find_one_and_update = db.progress.find_one_and_update
+    calls = []
+
+    async def racing_find_one_and_update(*args, **kwargs):
+        calls.append(1)
+        if len(calls) == 1:
+            # Another request's upsert inserted the row first
+            await db.progress.insert_one({"id": "p1", "user_id": user["id"], "module_id": "m1", "completed": False})
+            raise DuplicateKeyError("E11000 duplicate key error")
+        return await find_one_and_update(*args, **kwargs)
+
+    monkeypatch.setattr(db.progress, "find_one_and_update", racing_find_one_and_update)
+    response = await client.post("/api/progress", json={"module_id": "m1", "completed": True}, headers=admin_headers)
+    assert response.status_code == 200
+    assert len(calls) == 2
+    assert response.json()["id"] == "p1" and response.json()["completed"] is True
+    assert await db.progress.count_documents({"module_id": "m1"}) == 1
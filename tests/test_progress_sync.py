@@ -0,0 +1,59 @@
+import pytest
+from pymongo.errors import BulkWriteError
+
+pytestmark = pytest.mark.anyio
+
+
+async def sync(client, headers, items):
+    response = await client.post("/api/progress/batch", json=items, headers=headers)
+    assert response.status_code == 200
+    return response.json()
+
+
+async def test_latest_tick_in_a_batch_wins(client, admin_headers):
+    results = await sync(client, admin_headers, [
+        {"module_id": "m1", "completed": True, "updated_at": "2026-01-01T10:00:00Z"},
+        {"module_id": "m1", "completed": False, "updated_at": "2026-01-01T09:00:00Z"},
+        {"module_id": "m2", "completed": True, "updated_at": "2026-01-01T09:00:00Z"},
+    ])
+    assert [r["status"] for r in results] == ["applied", "stale", "applied"]
+    assert results[1]["progress"]["completed"] is True
+
+
+async def test_older_tick_than_stored_row_is_stale(db, client, admin_headers):
+    user = await db.users.find_one({"email": "admin@example.com"})
+    await db.progress.insert_one({
+        "id": "p1", "user_id": user["id"], "module_id": "m1", "completed": True,
+        "completed_at": "2026-01-02T00:00:00.000000+00:00", "updated_at": "2026-01-02T00:00:00.000000+00:00"
+    })
+    results = await sync(client, admin_headers, [
+        {"module_id": "m1", "completed": False, "updated_at": "2026-01-01T00:00:00Z"},
+        {"module_id": "m2", "completed": True, "updated_at": "2026-01-01T00:00:00Z"},
+    ])
+    assert [r["status"] for r in results] == ["stale", "applied"]
+    assert results[0]["progress"]["completed"] is True
+    assert await db.progress.count_documents({"user_id": user["id"]}) == 2
+
+
+async def test_tick_losing_the_insert_race_is_compared_again(db, client, admin_headers, monkeypatch):
+    user = await db.users.find_one({"email": "admin@example.com"})
+    bulk_write = db.progress.bulk_write
+    calls = []
+
+    async def racing_bulk_write(operations, **kwargs):
+        calls.append(len(operations))
+        if len(calls) == 1:
+            # Another request's upsert inserted an older tick first
+            await db.progress.insert_one({
+                "id": "p1", "user_id": user["id"], "module_id": "m1", "completed": False,
+                "completed_at": None, "updated_at": "2026-01-01T00:00:00.000000+00:00"
+            })
+            raise BulkWriteError({"writeErrors": [{"index": 0, "code": 11000, "errmsg": "E11000 duplicate key error"}]})
+        return await bulk_write(operations, **kwargs)
+
+    monkeypatch.setattr(db.progress, "bulk_write", racing_bulk_write)
+    results = await sync(client, admin_headers, [{"module_id": "m1", "completed": True, "updated_at": "2026-01-02T00:00:00Z"}])
+    assert calls == [1, 1]
+    assert [r["status"] for r in results] == ["applied"]
+    assert results[0]["progress"]["completed"] is True
+    assert await db.progress.count_documents({"user_id": user["id"]}) == 1
@@ -0,0 +1,33 @@
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+async def seed_modules(db, ranks):
+    await db.modules.insert_many([
+        {"id": module_id, "course_id": "c1", "title": module_id, "order_number": rank, "archived": False}
+        for module_id, rank in ranks.items()
+    ])
+
+
+async def order(db):
+    docs = await db.modules.find({"course_id": "c1"}, {"_id": 0}).sort("order_number", 1).to_list(None)
+    return [(doc["id"], doc["order_number"]) for doc in docs]
+
+
+async def test_move_writes_midpoint_between_neighbours(db):
+    step = server.RANK_STEP
+    await seed_modules(db, {"a": step, "b": 2 * step, "c": 3 * step})
+    assert await server.move_ranked(db.modules, "c", "a", ["course_id"]) == {"order_number": step * 3 // 2, "rebalanced": False}
+    # To the front: halfway between 0 and the new first item, "c"
+    assert await server.move_ranked(db.modules, "a", None, ["course_id"]) == {"order_number": step * 3 // 4, "rebalanced": False}
+    assert await order(db) == [("a", step * 3 // 4), ("c", step * 3 // 2), ("b", 2 * step)]
+
+
+async def test_move_rebalances_when_ranks_are_adjacent(db):
+    step = server.RANK_STEP
+    await seed_modules(db, {"a": 1, "b": 2, "c": 3})
+    assert await server.move_ranked(db.modules, "c", "a", ["course_id"]) == {"order_number": 2 * step, "rebalanced": True}
+    assert await order(db) == [("a", step), ("c", 2 * step), ("b", 3 * step)]
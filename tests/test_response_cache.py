@@ -0,0 +1,90 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+STAMP = "2026-01-01T00:00:00+00:00"
+
+
+@pytest.fixture
+async def content(db):
+    await db.courses.insert_one({
+        "id": "c1", "title": "Course", "description": "", "outline": "", "course_type": "beginner",
+        "order_number": 1, "archived": False, "created_at": STAMP
+    })
+    await db.modules.insert_one({"id": "m1", "course_id": "c1", "title": "Module", "order_number": 1, "archived": False,
+                                 "created_at": STAMP})
+    await db.announcements.insert_one({"id": "a1", "title": "News", "content": "", "archived": False, "created_at": STAMP})
+    await db.coach_info.insert_one({"name": "Coach", "bio": "", "achievements": "", "updated_at": STAMP})
+
+
+COURSE = {"title": "New", "description": "", "outline": "", "course_type": "beginner", "order_number": 2}
+
+# (admin write, public routes whose body it changes)
+WRITES = [
+    (("post", "/api/admin/leadership", {"name": "Chair", "position": "President", "order_number": 1}),
+     ["/api/leadership", "/api/home"]),
+    (("post", "/api/admin/courses", COURSE), ["/api/courses"]),
+    (("put", "/api/admin/courses/c1", {**COURSE, "title": "Renamed"}), ["/api/courses", "/api/courses/c1"]),
+    (("patch", "/api/admin/courses/c1/archive", None), ["/api/courses"]),
+    (("post", "/api/admin/modules", {"course_id": "c1", "title": "Second", "order_number": 2}),
+     ["/api/courses/c1/modules"]),
+    (("put", "/api/admin/modules/m1", {"course_id": "c1", "title": "Renamed", "order_number": 1}),
+     ["/api/courses/c1/modules"]),
+    (("patch", "/api/admin/modules/m1/archive", None), ["/api/courses/c1/modules"]),
+    (("post", "/api/admin/announcements", {"title": "More news", "content": ""}), ["/api/announcements", "/api/home"]),
+    (("patch", "/api/admin/announcements/a1/archive", None), ["/api/announcements", "/api/home"]),
+    (("post", "/api/admin/success-events", {"title": "Win", "description": "", "date": "2026-01-01"}),
+     ["/api/success-events", "/api/home"]),
+    (("put", "/api/admin/homepage-content", {"section": "hero", "content": "Welcome"}),
+     ["/api/homepage-content", "/api/home"]),
+    (("put", "/api/admin/coach-info", {"name": "New Coach", "bio": "", "achievements": ""}),
+     ["/api/coach-info", "/api/home"]),
+    (("post", "/api/admin/alumni", {"name": "Alum", "designation": "", "batch": "40", "current_occupation": "",
+                                    "order_number": 1}), ["/api/alumni", "/api/home"]),
+    (("post", "/api/admin/events", {"name": "Workshop", "date": "2026-01-01", "details": ""}),
+     ["/api/events", "/api/home"]),
+    (("put", "/api/admin/membership-content", {"description": "Join", "form_link": "https://example.com"}),
+     ["/api/membership-content"]),
+]
+
+
+async def test_if_none_match_returns_304(client, content):
+    first = await client.get("/api/courses")
+    etag = first.headers["ETag"]
+    for value in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+        response = await client.get("/api/courses", headers={"If-None-Match": value})
+        assert response.status_code == 304 and response.content == b""
+        assert response.headers["ETag"] == etag
+    assert (await client.get("/api/courses", headers={"If-None-Match": '"other"'})).status_code == 200
+
+
+@pytest.mark.parametrize("write, routes", WRITES, ids=[f"{m} {p}" for (m, p, _), _ in WRITES])
+async def test_admin_writes_change_dependent_routes(client, content, admin_headers, write, routes):
+    before = {}
+    for path in routes:
+        response = await client.get(path)
+        assert response.status_code == 200
+        before[path] = response
+        # Served from the cache until something changes
+        assert (await client.get(path, headers={"If-None-Match": response.headers["ETag"]})).status_code == 304
+
+    method, path, body = write
+    response = await client.request(method, path, json=body, headers=admin_headers)
+    assert response.status_code == 200
+
+    for path in routes:
+        after = await client.get(path, headers={"If-None-Match": before[path].headers["ETag"]})
+        assert after.status_code == 200
+        assert after.headers["ETag"] != before[path].headers["ETag"]
+        assert after.content != before[path].content
+
+
+async def test_setup_changes_home(client, db):
+    before = await client.get("/api/home")
+    assert before.json()["setup"]["is_setup_complete"] is False
+    response = await client.post("/api/setup/initialize", json={
+        "full_name": "Admin User", "email": "admin@example.com", "password": "password123"
+    })
+    assert response.status_code == 200
+    after = await client.get("/api/home", headers={"If-None-Match": before.headers["ETag"]})
+    assert after.status_code == 200 and after.json()["setup"]["is_setup_complete"] is True
@@ -0,0 +1,170 @@
+import ast
+import re
+from pathlib import Path
+
+import pytest
+from pymongo import IndexModel, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+import storage
+
+pytestmark = pytest.mark.anyio
+
+BACKEND = Path(__file__).resolve().parent.parent / "backend"
+OPERATOR = re.compile(r"\$[a-zA-Z]+")
+
+
+def backend_operators():
+    """``"$name"`` literals in the backend, other than field paths (dict
+    values and list items such as ``"$user_id"``)."""
+    operators = set()
+    for path in [*BACKEND.glob("*.py"), *BACKEND.glob("benchmarks/*.py")]:
+        if path.name == "storage.py":
+            continue
+        tree = ast.parse(path.read_text())
+        operands = set()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Dict):
+                operands.update(id(value) for value in node.values)
+            elif isinstance(node, (ast.List, ast.Tuple)):
+                operands.update(id(item) for item in node.elts)
+        for node in ast.walk(tree):
+            if (isinstance(node, ast.Constant) and isinstance(node.value, str)
+                    and OPERATOR.fullmatch(node.value) and id(node) not in operands):
+                operators.add(node.value)
+    return operators
+
+
+def test_engine_covers_exactly_the_backends_operators():
+    used = backend_operators()
+    assert used - storage.SUPPORTED_OPERATORS == set(), "used by the backend, missing from the memory engine"
+    assert storage.SUPPORTED_OPERATORS - used == set(), "supported by the memory engine, no longer used"
+
+
+@pytest.fixture
+def collection():
+    return storage.MemoryClient()["test"]["items"]
+
+
+async def ids(cursor):
+    return [doc["id"] for doc in await cursor.to_list(None)]
+
+
+async def test_query_operators(collection):
+    await collection.insert_many([
+        {"id": 1, "n": 5, "name": "alpha", "tags": ["a", "b"], "flag": True},
+        {"id": 2, "n": "5", "name": "beta", "tags": [], "flag": None},
+        {"id": 3, "n": 10, "tags": ["b"]},
+    ])
+    # Equality descends into arrays; null matches missing
+    assert await ids(collection.find({"tags": "b"})) == [1, 3]
+    assert await ids(collection.find({"flag": None})) == [2, 3]
+    assert await ids(collection.find({"flag": {"$ne": True}})) == [2, 3]
+    assert await ids(collection.find({"n": {"$in": [5, 10]}})) == [1, 3]
+    # Comparisons only match values of the same type
+    assert await ids(collection.find({"n": {"$gt": 4}})) == [1, 3]
+    assert await ids(collection.find({"n": {"$gte": 5, "$lt": 10}})) == [1]
+    assert await ids(collection.find({"name": {"$exists": False}})) == [3]
+    assert await ids(collection.find({"name": {"$regex": "^al"}})) == [1]
+    assert await ids(collection.find({"name": re.compile("^b")})) == [2]
+    assert await ids(collection.find({"$or": [{"n": 10}, {"name": "beta"}], "$and": [{"id": {"$ne": 2}}]})) == [3]
+
+
+async def test_unsupported_operators_raise(collection):
+    await collection.insert_one({"id": 1, "n": 1})
+    with pytest.raises(NotImplementedError):
+        await collection.find({"n": {"$lte": 1}}).to_list(None)
+    with pytest.raises(NotImplementedError):
+        await collection.find({"$nor": [{"n": 1}]}).to_list(None)
+    with pytest.raises(NotImplementedError):
+        await collection.update_one({"id": 1}, {"$unset": {"n": ""}})
+    with pytest.raises(NotImplementedError):
+        await collection.aggregate([{"$limit": 1}]).to_list(None)
+    with pytest.raises(NotImplementedError):
+        await collection.aggregate([{"$group": {"_id": None, "n": {"$max": "$n"}}}]).to_list(None)
+
+
+async def test_unique_and_partial_indexes(collection):
+    await collection.create_indexes([
+        IndexModel([("id", 1)], name="id_unique", unique=True),
+        IndexModel([("order", 1)], name="active_order", partialFilterExpression={"archived": False}),
+    ])
+    await collection.insert_one({"id": 1, "order": 2, "archived": False})
+    await collection.insert_one({"id": 2, "order": 2, "archived": True})
+    with pytest.raises(DuplicateKeyError):
+        await collection.insert_one({"id": 1})
+    with pytest.raises(DuplicateKeyError):
+        await collection.update_one({"id": 2}, {"$set": {"id": 1}})
+
+    assert await ids(collection.find({"order": 2, "archived": False})) == [1]
+    assert await ids(collection.find({"order": 2})) == [1, 2]
+    stats = await collection.aggregate([{"$indexStats": {}}]).to_list(None)
+    assert {s["name"]: s["accesses"]["ops"] for s in stats}["active_order"] == 1
+
+
+async def test_updates_and_upserts(collection):
+    result = await collection.update_one(
+        {"user_id": "u", "n": {"$gt": 0}}, {"$set": {"a": 1}, "$setOnInsert": {"created": True}}, upsert=True
+    )
+    assert result.upserted_id is not None
+    doc = await collection.find_one({"user_id": "u"}, {"_id": 0})
+    assert doc == {"user_id": "u", "a": 1, "created": True}
+
+    await collection.update_one({"user_id": "u"}, {"$setOnInsert": {"created": False}, "$inc": {"count": 2}})
+    after = await collection.find_one_and_update(
+        {"user_id": "u"}, {"$push": {"recent": {"$each": [1, 2, 3], "$slice": -2}}, "$inc": {"count": 1}},
+        projection={"_id": 0}, return_document=ReturnDocument.AFTER
+    )
+    assert after == {"user_id": "u", "a": 1, "created": True, "count": 3, "recent": [2, 3]}
+    assert await collection.find_one_and_update({"user_id": "v"}, {"$set": {"a": 1}}) is None
+
+
+async def test_bulk_write_reports_duplicates_after_the_rest(collection):
+    await collection.create_indexes([IndexModel([("user_id", 1), ("module_id", 1)], name="user_module", unique=True)])
+    await collection.insert_one({"id": "taken", "user_id": "u", "module_id": "m1"})
+    operations = [
+        UpdateOne({"id": "new", "user_id": "u", "module_id": "m1"}, {"$set": {"completed": True}}, upsert=True),
+        UpdateOne({"user_id": "u", "module_id": "m2"}, {"$set": {"completed": True}}, upsert=True),
+    ]
+    with pytest.raises(BulkWriteError) as raised:
+        await collection.bulk_write(operations, ordered=False)
+    details = raised.value.details
+    assert [e["index"] for e in details["writeErrors"]] == [0]
+    assert [u["index"] for u in details["upserted"]] == [1]
+    assert await collection.count_documents({"user_id": "u"}) == 2
+
+
+async def test_pipeline_stages():
+    db = storage.MemoryClient()["test"]
+    await db.modules.insert_many([
+        {"id": "m1", "course_id": "c1", "title": "One"},
+        {"id": "m2", "course_id": "c1", "title": "Two"},
+    ])
+    await db.progress.insert_many([
+        {"user_id": "u1", "module_id": "m1", "completed": True},
+        {"user_id": "u1", "module_id": "m2", "completed": False},
+        {"user_id": "u2", "module_id": "m2", "completed": True},
+        {"user_id": "u2", "module_id": "gone", "completed": True},
+    ])
+    rows = await db.progress.aggregate([
+        {"$lookup": {"from": "modules", "localField": "module_id", "foreignField": "id", "as": "module"}},
+        {"$unwind": "$module"},
+        {"$group": {
+            "_id": {"course_id": "$module.course_id", "user_id": "$user_id"},
+            "completed": {"$sum": {"$cond": [{"$eq": ["$completed", True]}, 1, 0]}},
+            "modules": {"$push": "$module_id"},
+        }},
+        {"$sort": {"_id.user_id": -1}},
+    ]).to_list(None)
+    assert rows == [
+        {"_id": {"course_id": "c1", "user_id": "u2"}, "completed": 1, "modules": ["m2"]},
+        {"_id": {"course_id": "c1", "user_id": "u1"}, "completed": 1, "modules": ["m1", "m2"]},
+    ]
+
+    rows = await db.progress.aggregate([
+        {"$match": {"user_id": "u2"}},
+        {"$lookup": {"from": "modules", "localField": "module_id", "foreignField": "id", "as": "module"}},
+        {"$addFields": {"title": {"$arrayElemAt": ["$module.title", 0]}}},
+        {"$project": {"_id": 0, "module_id": 1, "title": 1}},
+    ]).to_list(None)
+    assert rows == [{"module_id": "m2", "title": "Two"}, {"module_id": "gone", "title": None}]
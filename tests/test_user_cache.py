@@ -0,0 +1,76 @@
+import pytest
+from passlib.hash import bcrypt
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def student(db):
+    user_id = server.generate_id()
+    await db.users.insert_one({
+        "id": user_id, "full_name": "Student User", "email": "student@example.com",
+        "password_hash": bcrypt.using(rounds=4).hash("password123"), "role": "student", "status": "pending",
+        "mentorship_access": False, "advanced_access": False, "batch": "47", "last_login": None,
+        "archived": False, "created_at": "2026-01-01T00:00:00+00:00"
+    })
+    return user_id, {"Authorization": f"Bearer {server.create_access_token({'sub': user_id})}"}
+
+
+async def test_approval_reaches_cached_user(client, admin_headers, student):
+    user_id, headers = student
+    assert (await client.post("/api/progress/batch", json=[], headers=headers)).status_code == 403
+    assert server.user_cache.get(user_id)["status"] == "pending"
+
+    assert (await client.patch(f"/api/admin/users/{user_id}/approve", headers=admin_headers)).status_code == 200
+    assert (await client.post("/api/progress/batch", json=[], headers=headers)).status_code == 200
+
+
+async def test_archived_user_is_rejected_despite_cache(client, admin_headers, student):
+    user_id, headers = student
+    assert (await client.get("/api/auth/me", headers=headers)).status_code == 200
+    assert server.user_cache.get(user_id) is not None
+
+    assert (await client.patch(f"/api/admin/users/{user_id}/archive", headers=admin_headers)).status_code == 200
+    assert (await client.get("/api/auth/me", headers=headers)).status_code == 401
+    login = {"email": "student@example.com", "password": "password123"}
+    assert (await client.post("/api/auth/login", json=login)).status_code == 401
+
+
+@pytest.mark.parametrize("route, field", [("mentorship", "mentorship_access"), ("advanced", "advanced_access")])
+async def test_access_grants_reach_cached_user(client, admin_headers, student, route, field):
+    user_id, headers = student
+    assert (await client.get("/api/auth/me", headers=headers)).json()[field] is False
+
+    response = await client.patch(f"/api/admin/users/{user_id}/{route}", params={"grant": True}, headers=admin_headers)
+    assert response.status_code == 200
+    assert (await client.get("/api/auth/me", headers=headers)).json()[field] is True
+
+
+async def test_login_refreshes_cached_user(client, student):
+    user_id, headers = student
+    assert (await client.get("/api/auth/me", headers=headers)).json()["last_login"] is None
+
+    login = {"email": "student@example.com", "password": "password123"}
+    assert (await client.post("/api/auth/login", json=login)).status_code == 200
+    assert (await client.get("/api/auth/me", headers=headers)).json()["last_login"] is not None
+
+
+def test_other_users_invalidations_do_not_block_caching():
+    cache = server.UserCache(60, 2, server.CacheSync(0, 8))
+    generation = cache.generation
+    cache.evict("other")
+    cache.put("u1", {"id": "u1"}, generation)
+    assert cache.get("u1") == {"id": "u1"}
+
+    # A doc read before its own user's invalidation is refused
+    generation = cache.generation
+    cache.evict("u2")
+    cache.put("u2", {"id": "u2"}, generation)
+    assert cache.get("u2") is None
+
+    # Once the record of that invalidation is dropped, refusal stays conservative
+    cache.evict("x", "y")
+    cache.put("u2", {"id": "u2"}, generation)
+    assert cache.get("u2") is None